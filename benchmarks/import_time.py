@@ -0,0 +1,130 @@
+"""Times importing the package and its entry points in fresh interpreters.
+
+Run with ``python -m benchmarks.import_time`` from the repository root. Each
+import is timed in a new process, since later imports in the same process are
+cached. The run fails if an import loads a library it should defer, or takes
+longer than its budget, so that it can guard against regressions. Results are
+written as JSON, one record per import.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
+
+HEAVY_MODULES = ("pandas", "scipy", "pulp", "numpy", "pydantic")
+
+# the libraries each import must not load, and its budget in seconds, which is
+# generous enough for slow machines but well below loading pandas and scipy
+IMPORTS = {
+    "roastmaster": (HEAVY_MODULES, 0.2),
+    "roastmaster.__main__": (HEAVY_MODULES, 0.3),
+    "roastmaster.session": (("pandas", "scipy"), 0.8),
+}
+
+# prints the import time and which heavy modules were loaded
+SCRIPT = """\
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def time_import(module: str) -> tuple[float, list[str]]:
+    """Imports a module in a new interpreter.
+
+    Args:
+        module (str): The module name.
+
+    Returns:
+        tuple[float, list[str]]: The import time in seconds, and the heavy
+            modules it loaded.
+    """
+    output = subprocess.run(  # nosec
+        [sys.executable, "-c", SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    elapsed, loaded = json.loads(output)
+    return elapsed, loaded
+
+
+def run(module: str, repeats: int) -> dict:
+    """Times one import several times.
+
+    Args:
+        module (str): The module name.
+        repeats (int): The number of fresh interpreters to time it in.
+
+    Returns:
+        dict: The median and minimum import times and the heavy modules loaded.
+    """
+    times = []
+    for _ in range(repeats):
+        elapsed, loaded = time_import(module)
+        times.append(elapsed)
+    return {
+        "module": module,
+        "median_time": statistics.median(times),
+        "min_time": min(times),
+        "loaded": loaded,
+    }
+
+
+def main() -> None:
+    """Runs the benchmarks, printing a summary and saving the records."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results/import_time.json"),
+        help="The JSON file to write.",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="The number of times to import each."
+    )
+    args = parser.parse_args()
+
+    records = []
+    failures = []
+    print("module                  median_s  min_s  loaded")
+    for module, (deferred, budget) in IMPORTS.items():
+        record = run(module, args.repeats)
+        records.append(record)
+        print(
+            f"{module:22s}  {record['median_time']:8.3f}  "
+            f"{record['min_time']:5.3f}  {', '.join(record['loaded']) or '-'}"
+        )
+        loaded = sorted(set(record["loaded"]) & set(deferred))
+        if loaded:
+            failures.append(f"{module} loads {', '.join(loaded)}")
+        if record["min_time"] > budget:
+            failures.append(
+                f"{module} takes {record['min_time']:.3f}s, over its {budget}s budget"
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "repeats": args.repeats,
+                "records": records,
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved {len(records)} records to {args.output}.")
+    if failures:
+        sys.exit("Import regressions: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Generated benchmark instances."""
+from itertools import cycle
+from itertools import islice
+
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+
+
+# presets in the order they are added to a menu, so small menus are typical
+PRESETS = (
+    "turkey",
+    "roast_potatoes",
+    "carrots",
+    "parsnips",
+    "yorkshire_puddings",
+    "stuffing",
+    "pigs_in_blankets",
+    "sprouts",
+    "nut_roast",
+    "chicken",
+)
+
+
+def make_menu(num_dishes: int) -> list[Dish]:
+    """Makes a menu by cycling through the presets.
+
+    Repeated presets are renamed, e.g. "carrots_2", since dish names must be
+    unique within a session.
+
+    Args:
+        num_dishes (int): The number of dishes.
+
+    Returns:
+        list[Dish]: The menu.
+    """
+    menu = []
+    counts: dict[str, int] = {}
+    for name in islice(cycle(PRESETS), num_dishes):
+        counts[name] = counts.get(name, 0) + 1
+        dish = Dish.get_preset(name)
+        if counts[name] > 1:
+            dish = dish.model_copy(update={"name": f"{name}_{counts[name]}"})
+        menu.append(dish)
+    return menu
+
+
+def make_system(
+    total_time: float = 180, time_increment: float = 5, num_shelves: float = 2
+) -> System:
+    """Makes a system configuration with a standard oven.
+
+    Args:
+        total_time (float, optional): The total time. Defaults to 180.
+        time_increment (float, optional): The time increment. Defaults to 5.
+        num_shelves (float, optional): The number of shelves. Defaults to 2.
+
+    Returns:
+        System: The system configuration.
+    """
+    return System(
+        total_time=total_time,
+        time_increment=time_increment,
+        oven=Oven(name="oven", num_shelves=num_shelves),
+    )
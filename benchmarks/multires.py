@@ -0,0 +1,53 @@
+"""Compares coarse-to-fine solves with solving the fine model directly.
+
+Run with ``python -m benchmarks.multires`` from the repository root.
+"""
+
+import time
+
+from benchmarks.instances import make_menu
+from benchmarks.instances import make_system
+from roastmaster.multires import solve_coarse_to_fine
+from roastmaster.session import Session
+
+
+def run(num_dishes: int, time_increment: float, coarse: bool) -> dict:
+    """Solves one instance with the matrix builder.
+
+    Args:
+        num_dishes (int): The number of dishes.
+        time_increment (float): The fine time increment.
+        coarse (bool): Whether to solve coarse-to-fine.
+
+    Returns:
+        dict: The total time and objective value.
+    """
+    system = make_system(total_time=240, time_increment=time_increment)
+    dishes = make_menu(num_dishes)
+    start = time.perf_counter()
+    if coarse:
+        session = solve_coarse_to_fine(system, dishes, builder="matrix")
+    else:
+        session = Session(system, dishes, builder="matrix")
+        session.solve()
+    return {
+        "time": time.perf_counter() - start,
+        "objective": session.get_objective_value(),
+    }
+
+
+def main() -> None:
+    """Prints fine and coarse-to-fine times and objectives."""
+    print("dishes  dt  mode    time_s  objective")
+    for num_dishes, time_increment in ((6, 5), (10, 5), (4, 1), (6, 1)):
+        for coarse in (False, True):
+            res = run(num_dishes, time_increment, coarse)
+            print(
+                f"{num_dishes:6d}  {time_increment:2d}  "
+                f"{'coarse' if coarse else 'fine':6s}  {res['time']:6.2f}  "
+                f"{res['objective']:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
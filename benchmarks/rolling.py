@@ -0,0 +1,53 @@
+"""Compares rolling-horizon solves with solving the whole session at once.
+
+Run with ``python -m benchmarks.rolling`` from the repository root.
+"""
+
+import time
+
+import pulp
+
+from benchmarks.instances import make_menu
+from benchmarks.instances import make_system
+from roastmaster.rolling import RollingHorizon
+
+
+def run(total_time: float, num_dishes: int, num_shelves: float) -> dict:
+    """Solves one instance with a rolling horizon and as a whole.
+
+    Args:
+        total_time (float): The total time.
+        num_dishes (int): The number of dishes.
+        num_shelves (float): The number of oven shelves.
+
+    Returns:
+        dict: The rolling and full times and objectives, and the gap.
+    """
+    rolling = RollingHorizon(
+        make_system(total_time, num_shelves=num_shelves), make_menu(num_dishes)
+    )
+    start = time.perf_counter()
+    rolling.solve(solver=pulp.PULP_CBC_CMD(msg=False))
+    rolling_time = time.perf_counter() - start
+    comparison = rolling.compare_with_full(
+        solver=pulp.PULP_CBC_CMD(msg=False, timeLimit=300)
+    )
+    return {"rolling_time": rolling_time, **comparison}
+
+
+def main() -> None:
+    """Prints rolling and full solve times and objectives for longer sessions."""
+    print("total  dishes  rolling_s  full_s  objective  full_objective  gap")
+    for total_time, num_dishes, num_shelves in ((240, 6, 3), (300, 8, 3), (360, 10, 4)):
+        res = run(total_time, num_dishes, num_shelves)
+        gap = "-" if res["gap"] is None else f"{res['gap']:.1%}"
+        full = res["full_objective"]
+        print(
+            f"{total_time:5d}  {num_dishes:6d}  {res['rolling_time']:9.2f}  "
+            f"{res['full_time']:6.2f}  {res['objective']:9.1f}  "
+            f"{float('nan') if full is None else full:14.1f}  {gap}"
+        )
+
+
+if __name__ == "__main__":
+    main()
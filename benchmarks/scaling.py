@@ -0,0 +1,173 @@
+"""Times building, solving and extracting results as instances grow.
+
+Run with ``python -m benchmarks.scaling`` from the repository root. Results are
+written as JSON, one record per instance and builder, so that runs can be
+compared to catch regressions.
+"""
+
+import argparse
+import json
+import platform
+import time
+from pathlib import Path
+
+import pulp
+
+from benchmarks.instances import make_menu
+from benchmarks.instances import make_system
+from roastmaster.errors import InfeasibleError
+from roastmaster.errors import SolverError
+from roastmaster.session import Session
+
+
+# each axis is scaled on its own from the base instance; the turkey preset
+# needs at least 160 minutes and 1.5 shelves, and cooking times are multiples of 5
+BASE = {"num_dishes": 4, "total_time": 180, "time_increment": 5, "num_shelves": 2}
+AXES = {
+    "num_dishes": (2, 4, 6, 8, 10, 12),
+    "total_time": (180, 240, 300, 360),
+    "time_increment": (5, 2.5, 1),
+    "num_shelves": (2, 3, 4, 6),
+}
+QUICK_BASE = {**BASE, "num_dishes": 2}
+QUICK_AXES = {"num_dishes": (2, 3), "total_time": (240,), "num_shelves": (3,)}
+
+
+def get_instances(quick: bool = False) -> list[dict]:
+    """Returns the instance parameters, without duplicates.
+
+    Args:
+        quick (bool, optional): Whether to return only a few small instances.
+            Defaults to False.
+
+    Returns:
+        list[dict]: The keyword arguments for each instance.
+    """
+    base, axes = (QUICK_BASE, QUICK_AXES) if quick else (BASE, AXES)
+    instances = []
+    for axis, values in axes.items():
+        for value in values:
+            instance = {**base, axis: value}
+            if instance not in instances:
+                instances.append(instance)
+    return instances
+
+
+def run(
+    builder: str,
+    num_dishes: int,
+    total_time: float,
+    time_increment: float,
+    num_shelves: float,
+    time_limit: float,
+) -> dict:
+    """Builds, solves and extracts the results of one instance.
+
+    Args:
+        builder (str): The Session builder.
+        num_dishes (int): The number of dishes, repeating presets as needed.
+        total_time (float): The total time.
+        time_increment (float): The time increment.
+        num_shelves (float): The number of oven shelves.
+        time_limit (float): The solver time limit in seconds.
+
+    Returns:
+        dict: The times of each step, the session stats and the objective value.
+    """
+    system = make_system(total_time, time_increment, num_shelves)
+    record: dict = {
+        "builder": builder,
+        "num_dishes": num_dishes,
+        "total_time": total_time,
+        "time_increment": time_increment,
+        "num_shelves": num_shelves,
+    }
+    start = time.perf_counter()
+    try:
+        session = Session(system, make_menu(num_dishes), builder=builder)
+    except InfeasibleError as e:
+        # rejected by the pre-checks, without building a model
+        record["init_time"] = time.perf_counter() - start
+        record["solve_time"] = 0.0
+        record["objective"] = None
+        record["error"] = str(e)
+        return record
+    record["init_time"] = time.perf_counter() - start
+    # the matrix builder always uses HiGHS
+    solver = None if builder == "matrix" else pulp.PULP_CBC_CMD(msg=False)
+    start = time.perf_counter()
+    try:
+        if solver is None:
+            session.solve(time_limit=time_limit)
+        else:
+            solver.timeLimit = time_limit
+            session.solve(solver=solver)
+    except SolverError:
+        record["solve_time"] = time.perf_counter() - start
+        record["objective"] = None
+    else:
+        record["solve_time"] = time.perf_counter() - start
+        record["objective"] = session.get_objective_value()
+        start = time.perf_counter()
+        session.get_results()
+        record["results_time"] = time.perf_counter() - start
+    record["stats"] = session.stats.to_dict()
+    return record
+
+
+def main() -> None:
+    """Runs the benchmarks, printing a summary and saving the records."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results/scaling.json"),
+        help="The JSON file to write.",
+    )
+    parser.add_argument(
+        "--builders",
+        nargs="+",
+        default=["expression", "state", "matrix"],
+        help="The Session builders to compare.",
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=60, help="The solve time limit."
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Only run a few small instances."
+    )
+    args = parser.parse_args()
+
+    records = []
+    print("builder     dishes  total    dt  shelves  init_s  solve_s  results_s  obj")
+    for instance in get_instances(args.quick):
+        for builder in args.builders:
+            record = run(builder, time_limit=args.time_limit, **instance)
+            records.append(record)
+            objective = record["objective"]
+            print(
+                f"{builder:10s}  {record['num_dishes']:6d}  "
+                f"{record['total_time']:5.0f}  {record['time_increment']:4g}  "
+                f"{record['num_shelves']:7.0f}  {record['init_time']:6.2f}  "
+                f"{record['solve_time']:7.2f}  "
+                f"{record.get('results_time', float('nan')):9.3f}  "
+                f"{'-' if objective is None else f'{objective:.1f}'}"
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "pulp": pulp.__version__,
+                "time_limit": args.time_limit,
+                "records": records,
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved {len(records)} records to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
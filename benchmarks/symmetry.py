@@ -0,0 +1,59 @@
+"""Compares solve times with and without symmetry breaking as dishes repeat.
+
+Run with ``python -m benchmarks.symmetry`` from the repository root.
+"""
+
+import time
+
+import pulp
+
+from benchmarks.instances import make_system
+from roastmaster.models import Dish
+from roastmaster.session import Session
+
+
+def run(num_copies: int, symmetry_breaking: bool) -> dict:
+    """Solves a menu of a chicken and several identical trays of carrots.
+
+    Args:
+        num_copies (int): The number of trays of carrots.
+        symmetry_breaking (bool): Whether to order the identical dishes.
+
+    Returns:
+        dict: The solve time, status and objective value.
+    """
+    carrots = Dish.get_preset("carrots")
+    dishes = [Dish.get_preset("chicken")] + [
+        carrots.model_copy(update={"name": f"carrots_{i + 1}"})
+        for i in range(num_copies)
+    ]
+    session = Session(
+        make_system(total_time=120),
+        dishes,
+        builder="state",
+        symmetry_breaking=symmetry_breaking,
+    )
+    start = time.perf_counter()
+    session.solve(solver=pulp.PULP_CBC_CMD(msg=False, timeLimit=120))
+    return {
+        "solve_time": time.perf_counter() - start,
+        "status": session.status,
+        "objective": session.get_objective_value(),
+    }
+
+
+def main() -> None:
+    """Prints solve times for increasing numbers of identical dishes."""
+    print("copies  symmetry_breaking  solve_s  status    objective")
+    for num_copies in (3, 5, 7, 9):
+        for symmetry_breaking in (False, True):
+            res = run(num_copies, symmetry_breaking)
+            print(
+                f"{num_copies:6d}  {str(symmetry_breaking):17s}  "
+                f"{res['solve_time']:7.2f}  {res['status']:8s}  "
+                f"{res['objective']:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Times building models from compiled templates against building them afresh.
+
+Run with ``python -m benchmarks.templates`` from the repository root. For each
+menu shape, a template is compiled, saved and loaded once, and then the model is
+built repeatedly for menus of that shape: through the "expression" builder, the
+"matrix" builder, and the "matrix" builder filling in the loaded template.
+Results are written as JSON, one record per shape.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pulp
+
+from benchmarks.instances import make_menu
+from benchmarks.instances import make_system
+from roastmaster.session import Session
+from roastmaster.template import ModelTemplate
+
+
+SHAPES = [
+    {"num_dishes": num_dishes, "total_time": total_time}
+    for num_dishes in (4, 8, 12)
+    for total_time in (180, 300)
+]
+QUICK_SHAPES = [{"num_dishes": 4, "total_time": 180}]
+
+
+def time_builds(build: Callable[[], object], repeats: int) -> float:
+    """Returns the median time of a build.
+
+    Args:
+        build (Callable[[], object]): Builds a model.
+        repeats (int): The number of builds.
+
+    Returns:
+        float: The median build time in seconds.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run(num_dishes: int, total_time: float, repeats: int) -> dict:
+    """Compiles a template for one shape and times building models.
+
+    Args:
+        num_dishes (int): The number of dishes, repeating presets as needed.
+        total_time (float): The total time.
+        repeats (int): The number of builds to take the median of.
+
+    Returns:
+        dict: The template compile, save and load times, and the median build
+            time of each builder.
+    """
+    system = make_system(total_time, num_shelves=num_dishes)
+    menu = make_menu(num_dishes)
+    record: dict = {"num_dishes": num_dishes, "total_time": total_time}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "template"
+        start = time.perf_counter()
+        template = ModelTemplate.compile(system, num_dishes)
+        record["compile_time"] = time.perf_counter() - start
+        start = time.perf_counter()
+        template.save(path)
+        record["save_time"] = time.perf_counter() - start
+        start = time.perf_counter()
+        template = ModelTemplate.load(path)
+        record["load_time"] = time.perf_counter() - start
+    record["expression_time"] = time_builds(lambda: Session(system, menu), repeats)
+    record["matrix_time"] = time_builds(
+        lambda: Session(system, menu, builder="matrix"), repeats
+    )
+    record["template_time"] = time_builds(
+        lambda: Session(system, menu, builder="matrix", template=template), repeats
+    )
+    return record
+
+
+def main() -> None:
+    """Runs the benchmarks, printing a summary and saving the records."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results/templates.json"),
+        help="The JSON file to write.",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=10, help="The number of builds to time."
+    )
+    parser.add_argument("--quick", action="store_true", help="Only run a small shape.")
+    args = parser.parse_args()
+
+    records = []
+    print("dishes  total  load_s  expression_s  matrix_s  template_s")
+    for shape in QUICK_SHAPES if args.quick else SHAPES:
+        record = run(repeats=args.repeats, **shape)
+        records.append(record)
+        print(
+            f"{record['num_dishes']:6d}  {record['total_time']:5.0f}  "
+            f"{record['load_time']:6.3f}  {record['expression_time']:12.4f}  "
+            f"{record['matrix_time']:8.4f}  {record['template_time']:10.4f}"
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "pulp": pulp.__version__,
+                "repeats": args.repeats,
+                "records": records,
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved {len(records)} records to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Compares exact cooking times with a cooking-time tolerance on preset menus.
+
+Run with ``python -m benchmarks.tolerance`` from the repository root. Each menu
+is solved with every dish's tolerance set to each of the given values, and the
+feasibility rate and solve times are summarised per tolerance. Results are
+written as JSON, one record per instance and tolerance.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+import pulp
+
+from benchmarks.instances import make_menu
+from benchmarks.instances import make_system
+from roastmaster.errors import InfeasibleError
+from roastmaster.errors import SolverError
+from roastmaster.session import Session
+
+
+# coarse increments put the preset cooking times plus warm-up off the grid
+INSTANCES = [
+    {"num_dishes": num_dishes, "time_increment": time_increment}
+    for num_dishes in (3, 5, 7)
+    for time_increment in (5, 10, 15, 20)
+]
+QUICK_INSTANCES = [
+    {"num_dishes": 3, "time_increment": time_increment} for time_increment in (5, 15)
+]
+TOTAL_TIME = 240
+NUM_SHELVES = 3
+
+
+def run(
+    num_dishes: int, time_increment: float, tolerance: int, time_limit: float
+) -> dict:
+    """Solves one preset menu with every dish given the same tolerance.
+
+    Args:
+        num_dishes (int): The number of dishes, repeating presets as needed.
+        time_increment (float): The time increment.
+        tolerance (int): Each dish's cooking time tolerance in minutes.
+        time_limit (float): The solver time limit in seconds.
+
+    Returns:
+        dict: The outcome, solve time and objective value.
+    """
+    system = make_system(TOTAL_TIME, time_increment, NUM_SHELVES)
+    menu = [
+        dish.model_copy(update={"cooking_time_tolerance_mins": tolerance})
+        for dish in make_menu(num_dishes)
+    ]
+    record: dict = {
+        "num_dishes": num_dishes,
+        "time_increment": time_increment,
+        "tolerance": tolerance,
+        "solve_time": 0.0,
+        "objective": None,
+    }
+    try:
+        session = Session(system, menu)
+    except InfeasibleError as e:
+        record["status"] = e.reason
+        return record
+    solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+    start = time.perf_counter()
+    try:
+        session.solve(solver=solver)
+    except SolverError:
+        pass
+    else:
+        record["objective"] = session.get_objective_value()
+    record["solve_time"] = time.perf_counter() - start
+    record["status"] = session.status
+    return record
+
+
+def summarise(records: list[dict], tolerance: int) -> dict:
+    """Summarises the records for one tolerance.
+
+    Args:
+        records (list[dict]): All the records.
+        tolerance (int): The tolerance to summarise.
+
+    Returns:
+        dict: The feasibility rate, optimality rate and solve times of the
+            feasible instances.
+    """
+    records = [record for record in records if record["tolerance"] == tolerance]
+    solved = [record for record in records if record["objective"] is not None]
+    solve_times = [record["solve_time"] for record in solved]
+    return {
+        "tolerance": tolerance,
+        "instances": len(records),
+        "feasible_rate": len(solved) / len(records),
+        "optimal_rate": sum(record["status"] == "optimal" for record in records)
+        / len(records),
+        "mean_solve_time": statistics.fmean(solve_times) if solve_times else None,
+        "max_solve_time": max(solve_times, default=None),
+    }
+
+
+def main() -> None:
+    """Runs the benchmarks, printing a summary and saving the records."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results/tolerance.json"),
+        help="The JSON file to write.",
+    )
+    parser.add_argument(
+        "--tolerances",
+        nargs="+",
+        type=int,
+        default=[0, 5],
+        help="The cooking time tolerances to compare, in minutes.",
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=60, help="The solve time limit."
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Only run a few small instances."
+    )
+    args = parser.parse_args()
+
+    records = []
+    print("dishes    dt  tol  status            solve_s  obj")
+    for instance in QUICK_INSTANCES if args.quick else INSTANCES:
+        for tolerance in args.tolerances:
+            record = run(tolerance=tolerance, time_limit=args.time_limit, **instance)
+            records.append(record)
+            objective = record["objective"]
+            print(
+                f"{record['num_dishes']:6d}  {record['time_increment']:4g}  "
+                f"{tolerance:3d}  {record['status']:16s}  "
+                f"{record['solve_time']:7.2f}  "
+                f"{'-' if objective is None else f'{objective:.1f}'}"
+            )
+    summaries = [summarise(records, tolerance) for tolerance in args.tolerances]
+    for summary in summaries:
+        mean = summary["mean_solve_time"]
+        print(
+            f"tolerance {summary['tolerance']}: "
+            f"{summary['feasible_rate']:.0%} feasible, "
+            f"{summary['optimal_rate']:.0%} optimal, mean solve "
+            f"{'-' if mean is None else f'{mean:.2f}'} s"
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "pulp": pulp.__version__,
+                "time_limit": args.time_limit,
+                "summaries": summaries,
+                "records": records,
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved {len(records)} records to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compares cold and heuristic warm-started CBC solves.
+
+Run with ``python -m benchmarks.warm_start`` from the repository root.
+"""
+
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import pulp
+
+from benchmarks.instances import make_menu
+from benchmarks.instances import make_system
+from roastmaster.session import Session
+
+
+# CBC log lines reporting a new incumbent
+INCUMBENT = re.compile(r"(MIPStart provided solution|Integer solution of)")
+SECONDS = re.compile(r"\(([\d.]+) seconds\)")
+
+
+def first_incumbent_time(log: str) -> float | None:
+    """Returns the time at which CBC found its first incumbent.
+
+    Args:
+        log (str): The CBC log.
+
+    Returns:
+        float | None: The time in seconds, 0 for a MIP start, or None if no
+            incumbent was found.
+    """
+    for line in log.splitlines():
+        if INCUMBENT.search(line):
+            seconds = SECONDS.search(line)
+            return float(seconds.group(1)) if seconds else 0.0
+    return None
+
+
+def run(num_dishes: int, num_shelves: float, warm_start: bool) -> dict:
+    """Solves one instance.
+
+    Args:
+        num_dishes (int): The number of dishes.
+        num_shelves (float): The number of oven shelves.
+        warm_start (bool): Whether to warm-start the solver.
+
+    Returns:
+        dict: The solve time, time to first incumbent and objective value.
+    """
+    session = Session(make_system(num_shelves=num_shelves), make_menu(num_dishes))
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "cbc.log"
+        solver = pulp.PULP_CBC_CMD(
+            msg=False, logPath=str(log_path), warmStart=warm_start
+        )
+        start = time.perf_counter()
+        session.solve(solver=solver, warm_start=warm_start)
+        solve_time = time.perf_counter() - start
+        log = log_path.read_text()
+    return {
+        "solve_time": solve_time,
+        "first_incumbent": first_incumbent_time(log),
+        "objective": session.get_objective_value(),
+    }
+
+
+def main() -> None:
+    """Prints cold and warm solve times for menus of increasing size."""
+    print("dishes  shelves  mode  solve_s  first_incumbent_s  objective")
+    for num_dishes, num_shelves in ((4, 2), (6, 3), (8, 3), (10, 4)):
+        for warm_start in (False, True):
+            res = run(num_dishes, num_shelves, warm_start)
+            print(
+                f"{num_dishes:6d}  {num_shelves:7.0f}  "
+                f"{'warm' if warm_start else 'cold':4s}  {res['solve_time']:7.2f}  "
+                f"{res['first_incumbent']:17.2f}  {res['objective']:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
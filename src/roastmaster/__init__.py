@@ -1,6 +1,56 @@
 """Roastmaster."""
-from roastmaster.models import Dish
-from roastmaster.models import Hob
-from roastmaster.models import Oven
-from roastmaster.models import System
-from roastmaster.session import Session
+from importlib import import_module
+from typing import TYPE_CHECKING
+from typing import Any
+
+
+if TYPE_CHECKING:
+    from roastmaster.heuristic import GreedyScheduler
+    from roastmaster.models import Dish
+    from roastmaster.models import Hob
+    from roastmaster.models import Oven
+    from roastmaster.models import System
+    from roastmaster.session import Session
+
+__all__ = ["Dish", "GreedyScheduler", "Hob", "Oven", "Session", "System"]
+
+# the module of each public name, imported on first access so that importing
+# the package, e.g. for the command-line interface, does not load the solver
+# and numerical libraries
+_LAZY_IMPORTS = {
+    "Dish": "roastmaster.models",
+    "GreedyScheduler": "roastmaster.heuristic",
+    "Hob": "roastmaster.models",
+    "Oven": "roastmaster.models",
+    "Session": "roastmaster.session",
+    "System": "roastmaster.models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Imports a public name on first access.
+
+    Args:
+        name (str): The attribute name.
+
+    Returns:
+        Any: The attribute.
+
+    Raises:
+        AttributeError: If the package has no such attribute.
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    # cache it, so later lookups do not come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Lists the package's attributes, including those not yet imported.
+
+    Returns:
+        list[str]: The attribute names.
+    """
+    return sorted({*globals(), *__all__})
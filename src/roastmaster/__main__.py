@@ -1,12 +1,255 @@
 """Command-line interface."""
+import itertools
+import json
+import os
+from collections.abc import Iterator
+from typing import Any
+from typing import TextIO
+
 import click
 
 
-@click.command()
+def _check_templates(
+    ctx: click.Context, param: click.Parameter, value: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Checks that each template was saved, before any worker loads it.
+
+    Args:
+        ctx (click.Context): The click context.
+        param (click.Parameter): The option.
+        value (tuple[str, ...]): The template paths, with or without a suffix.
+
+    Returns:
+        tuple[str, ...]: The template paths.
+
+    Raises:
+        BadParameter: If a template's files do not exist.
+    """
+    for path in value:
+        if not all(
+            os.path.isfile(os.path.splitext(path)[0] + suffix)
+            for suffix in (".mps", ".json")
+        ):
+            raise click.BadParameter(f"No template saved at {path}.")
+    return value
+
+
+@click.group(invoke_without_command=True)
 @click.version_option()
 def main() -> None:
     """Roastmaster."""
 
 
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="The host.")
+@click.option("--port", default=8000, show_default=True, help="The port.")
+@click.option(
+    "--workers",
+    type=int,
+    help="The number of solver processes. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--max-queue",
+    type=int,
+    help="The most problems waiting for a worker before requests are rejected. "
+    "Defaults to twice the number of workers.",
+)
+@click.option(
+    "--template",
+    "templates",
+    multiple=True,
+    callback=_check_templates,
+    help="A model template saved by the template command, for the matrix builder "
+    "to fill in. May be repeated.",
+)
+@click.option("--verbose", is_flag=True, help="Log each request.")
+def serve(
+    host: str,
+    port: int,
+    workers: int | None,
+    max_queue: int | None,
+    templates: tuple[str, ...],
+    verbose: bool,
+) -> None:
+    """Serve a local scheduling service over HTTP.
+
+    POST a problem to /solve as a JSON object with a "system" and a list of
+    "dishes", and optionally a "builder", "solver", "time_limit" or "gap_rel".
+    GET /metrics for the queue depth and latencies.
+    """
+    # imported here, so that the command-line interface starts quickly
+    from roastmaster.server import SchedulingServer
+    from roastmaster.server import SchedulingService
+
+    service = SchedulingService(workers, max_queue, templates)
+    server = SchedulingServer((host, port), service, verbose=verbose)
+    click.echo(
+        f"Serving on http://{host}:{server.server_port} with "
+        f"{service.workers} workers."
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+@main.command()
+@click.argument("input_file", type=click.File("r"), default="-")
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="The file to write the schedules to.  [default: stdout]",
+)
+@click.option(
+    "--workers",
+    type=int,
+    help="The number of solver processes. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--ordered",
+    is_flag=True,
+    help="Write the schedules in input order, rather than as each finishes.",
+)
+@click.option(
+    "--builder",
+    type=click.Choice(["expression", "state", "matrix", "event"]),
+    default="expression",
+    show_default=True,
+    help="The model builder, unless a problem sets its own.",
+)
+@click.option("--solver", help="The solver, unless a problem sets its own.")
+@click.option(
+    "--time-limit",
+    type=float,
+    help="The solve time limit in seconds, unless a problem sets its own.",
+)
+@click.option(
+    "--template",
+    "templates",
+    multiple=True,
+    callback=_check_templates,
+    help="A model template saved by the template command, for the matrix builder "
+    "to fill in. May be repeated.",
+)
+def solve(
+    input_file: TextIO,
+    output: TextIO,
+    workers: int | None,
+    ordered: bool,
+    builder: str,
+    solver: str | None,
+    time_limit: float | None,
+    templates: tuple[str, ...],
+) -> None:
+    """Solve problems read as JSON lines, writing each schedule as a JSON line.
+
+    Each line of INPUT_FILE (default stdin) is a JSON object with a "system"
+    and a list of "dishes", and optionally a "builder", "solver", "time_limit"
+    or "gap_rel". Each output line has the input "line" number and either the
+    "status", "objective_value" and "results", or an "error". Invalid lines are
+    reported as they are read. Problems are read as workers become free, so
+    memory use does not grow with the input.
+    """
+    # imported here, so that the command-line interface starts quickly
+    from roastmaster.batch import iter_solve_many
+    from roastmaster.batch import parse_problem
+
+    # the line number of each problem in flight, by its position in the batch
+    line_numbers: dict[int, int] = {}
+    positions = itertools.count()
+
+    def write(record: dict[str, Any]) -> None:
+        """Writes one output line.
+
+        Args:
+            record (dict[str, Any]): The output record.
+        """
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    def read_problems() -> Iterator[tuple]:
+        """Reads the valid problems, reporting any invalid lines.
+
+        Yields:
+            tuple: Each problem's system, dishes and options.
+        """
+        for line_number, line in enumerate(input_file, 1):
+            if not line.strip():
+                continue
+            try:
+                problem = parse_problem(json.loads(line))
+            except ValueError as e:  # includes invalid JSON and pydantic errors
+                write({"line": line_number, "error": f"{type(e).__name__}: {e}"})
+                continue
+            line_numbers[next(positions)] = line_number
+            yield problem
+
+    solve_kwargs = {"solver": solver, "time_limit": time_limit}
+    for outcome in iter_solve_many(
+        read_problems(),
+        workers=workers,
+        ordered=ordered,
+        builder=builder,
+        templates=templates,
+        **{key: value for key, value in solve_kwargs.items() if value is not None},
+    ):
+        record: dict[str, Any] = {"line": line_numbers.pop(outcome.index)}
+        # results are only missing if not ok, which mypy cannot tell from ok
+        if outcome.ok and outcome.results is not None:
+            record["status"] = outcome.status
+            record["objective_value"] = outcome.objective_value
+            record["results"] = outcome.results.to_dict()
+        else:
+            record["error"] = outcome.error
+        write(record)
+
+
+@main.command()
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--dishes", type=int, required=True, help="The number of dishes.")
+@click.option("--total-time", type=float, required=True, help="The total time.")
+@click.option(
+    "--time-increment", type=float, default=5, show_default=True, help="The timestep."
+)
+@click.option(
+    "--warm-up-time",
+    type=float,
+    default=10,
+    show_default=True,
+    help="The oven warm-up time.",
+)
+def template(
+    output: str,
+    dishes: int,
+    total_time: float,
+    time_increment: float,
+    warm_up_time: float,
+) -> None:
+    """Compile a model template for the matrix builder.
+
+    The template suits any problem with the given number of dishes, total time,
+    time increment and warm-up time, whatever its dishes and number of shelves.
+    It is saved as OUTPUT with ".mps" and ".json" suffixes, for the --template
+    option of the solve and serve commands.
+    """
+    # imported here, so that the command-line interface starts quickly
+    from roastmaster.models import Oven
+    from roastmaster.models import System
+    from roastmaster.template import ModelTemplate
+
+    system = System(
+        total_time=total_time,
+        time_increment=time_increment,
+        oven=Oven(name="oven", warm_up_time=warm_up_time),
+    )
+    ModelTemplate.compile(system, dishes).save(output)
+    click.echo(f"Saved the template to {output}.")
+
+
 if __name__ == "__main__":
     main(prog_name="roastmaster")  # pragma: no cover
@@ -0,0 +1,337 @@
+"""aio.py."""
+import asyncio
+import multiprocessing
+import os
+import pickle  # nosec
+import signal
+import struct
+import weakref
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+import pulp
+
+from roastmaster.errors import SolverError
+
+
+if TYPE_CHECKING:
+    from roastmaster.matrix import MatrixModel
+
+# the size of the pickled outcome, sent before it
+_HEADER = struct.Struct("!Q")
+
+
+def _run_child(sender: Connection, func: Callable[..., Any], args: tuple) -> None:
+    """Runs a solve in a child process and sends back its outcome.
+
+    The child leads its own process group, so that the solver subprocesses it
+    starts can be signalled with it. It ignores interrupts itself, leaving the
+    solver to stop and report its best solution.
+
+    Args:
+        sender (Connection): The pipe to send the outcome through.
+        func (Callable[..., Any]): The solve function.
+        args (tuple): The solve function's arguments.
+    """
+    os.setpgrp()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        message = ("result", func(*args))
+    except Exception as e:  # reported to the parent, which raises it
+        message = ("error", f"{type(e).__name__}: {e}")
+    data = pickle.dumps(message)
+    with open(sender.fileno(), "wb", closefd=False) as pipe:
+        pipe.write(_HEADER.pack(len(data)) + data)
+    sender.close()
+
+
+def solve_pulp_model(
+    model: pulp.LpProblem, solver: pulp.LpSolver
+) -> tuple[int, int, dict[str, float | None]]:
+    """Solves a pulp model, returning what is needed to copy the solution back.
+
+    Args:
+        model (pulp.LpProblem): The model.
+        solver (pulp.LpSolver): The configured solver.
+
+    Returns:
+        tuple[int, int, dict[str, float | None]]: The pulp status, the pulp
+            solution status and the variables' values by name.
+    """
+    model.solve(solver)
+    values = {var.name: var.varValue for var in model.variables()}
+    return model.status, model.sol_status, values
+
+
+def solve_matrix_model(
+    matrix: "MatrixModel", time_limit: float | None, gap_rel: float | None
+) -> tuple[str, np.ndarray | None, float | None]:
+    """Solves a sparse array model, returning its solution.
+
+    Args:
+        matrix (MatrixModel): The model.
+        time_limit (float | None): The maximum solve time in seconds.
+        gap_rel (float | None): The relative MIP gap at which to stop.
+
+    Returns:
+        tuple[str, np.ndarray | None, float | None]: The solution status, the
+            solution and the objective value, or None for both if there is no
+            solution.
+    """
+    status = matrix.solve(time_limit=time_limit, gap_rel=gap_rel)
+    if status not in ("optimal", "feasible"):
+        return status, None, None
+    return status, matrix.solution, matrix.objective_value
+
+
+def _receive(receiver: Connection) -> asyncio.Future:
+    """Reads a child's outcome once it is sent, without blocking the event loop.
+
+    The outcome is read as it arrives, so that a large one sent in several
+    parts does not hold up the event loop until the last part.
+
+    Args:
+        receiver (Connection): The pipe the outcome is sent through.
+
+    Returns:
+        asyncio.Future: The outcome, or None if the child died without one.
+    """
+    loop = asyncio.get_running_loop()
+    received = loop.create_future()
+    buffer = bytearray()
+
+    def on_readable() -> None:
+        """Reads what has arrived, finishing once the whole outcome has."""
+        chunk = os.read(receiver.fileno(), 1 << 16)
+        buffer.extend(chunk)
+        message = None
+        if len(buffer) >= _HEADER.size:
+            end = _HEADER.size + _HEADER.unpack_from(buffer)[0]
+            if len(buffer) >= end:
+                message = pickle.loads(buffer[_HEADER.size : end])  # nosec
+        # the pipe closes without a whole outcome if the child dies
+        if message is not None or not chunk:
+            loop.remove_reader(receiver.fileno())
+            if not received.done():
+                received.set_result(message)
+
+    loop.add_reader(receiver.fileno(), on_readable)
+    return received
+
+
+def _get_remaining(deadline: float | None) -> float | None:
+    """Returns the seconds left until a deadline on the running event loop.
+
+    Args:
+        deadline (float | None): The event loop time, or None for no deadline.
+
+    Returns:
+        float | None: The seconds left, at least 0, or None for no deadline.
+    """
+    if deadline is None:
+        return None
+    return max(deadline - asyncio.get_running_loop().time(), 0)
+
+
+def _signal_group(process: multiprocessing.Process, sig: int) -> None:
+    """Sends a signal to a child process and the solvers it started.
+
+    Args:
+        process (multiprocessing.Process): The child process.
+        sig (int): The signal.
+    """
+    if process.pid is None:
+        # the child was never started
+        return
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        # the child has not yet started its own group, so has no solver
+        if sig == signal.SIGKILL:
+            process.kill()
+
+
+class SolveExecutor:
+    """Runs solves in child processes without blocking the event loop.
+
+    At most max_workers solves run at once, and further solves wait their turn.
+    Each solve runs in a new child process, so that it can be stopped: when its
+    deadline passes or the awaiting task is cancelled, the solver is interrupted
+    and given the grace period to report its best solution so far, and then the
+    child and its solver are killed. A solve still waiting for a free worker at
+    its deadline is not started. Only POSIX systems are supported.
+
+    Attributes:
+        max_workers (int): The most solves run at once.
+        grace_period (float): The seconds an interrupted solver is given to
+            report its best solution.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        grace_period: float = 5,
+        mp_context: Any = None,
+    ) -> None:
+        """Initializes a SolveExecutor object.
+
+        Args:
+            max_workers (int | None, optional): The most solves run at once.
+                Defaults to the number of CPUs.
+            grace_period (float, optional): The seconds an interrupted solver is
+                given to report its best solution. Defaults to 5.
+            mp_context (Any, optional): The multiprocessing context to start the
+                child processes with. Defaults to the default context.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.grace_period = grace_period
+        self._context = mp_context or multiprocessing.get_context()
+        # asyncio semaphores belong to one event loop
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Returns the running event loop's semaphore.
+
+        Returns:
+            asyncio.Semaphore: The semaphore limiting the solves that run at once.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+        return self._semaphores[loop]
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+        interruptible: bool = True,
+        on_cancel: Callable[[Any], None] | None = None,
+    ) -> Any:
+        """Runs a solve function in a child process.
+
+        Args:
+            func (Callable[..., Any]): The solve function, which must be picklable.
+            *args (Any): The solve function's arguments, which must be picklable.
+            timeout (float | None, optional): The seconds from this call, including
+                any wait for a free worker, after which the solver is interrupted.
+                It is killed if it has not reported a solution within the grace
+                period after that. The solver should be given a time limit of the
+                timeout, so that it normally stops itself. Defaults to no timeout.
+            interruptible (bool, optional): Whether the solver reports its best
+                solution when interrupted, otherwise it is killed at once when
+                the awaiting task is cancelled. Defaults to True.
+            on_cancel (Callable[[Any], None] | None, optional): Called with the
+                solve function's result, if the solver reports one after the
+                awaiting task is cancelled. Defaults to None.
+
+        Returns:
+            Any: The solve function's result, or None if the deadline passed
+                before it started or it was killed first.
+
+        Raises:
+            SolverError: If the solve function raised an exception.
+            asyncio.CancelledError: If the awaiting task was cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        semaphore = self._get_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), _get_remaining(deadline))
+        except asyncio.TimeoutError:
+            # the deadline passed while waiting for a free worker
+            return None
+        try:
+            receiver, sender = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_run_child, args=(sender, func, args), daemon=True
+            )
+            process.start()
+            sender.close()
+            received = _receive(receiver)
+            try:
+                message = await self._wait(
+                    process, received, deadline, interruptible, on_cancel
+                )
+            finally:
+                loop.remove_reader(receiver.fileno())
+                if process.is_alive():
+                    _signal_group(process, signal.SIGKILL)
+                process.join()
+                receiver.close()
+        finally:
+            semaphore.release()
+        if message is None:
+            return None
+        kind, value = message
+        if kind == "error":
+            raise SolverError(value)
+        return value
+
+    async def _wait(
+        self,
+        process: multiprocessing.Process,
+        received: asyncio.Future,
+        deadline: float | None,
+        interruptible: bool,
+        on_cancel: Callable[[Any], None] | None,
+    ) -> tuple[str, Any] | None:
+        """Waits for a child's outcome, interrupting it if it takes too long.
+
+        Args:
+            process (multiprocessing.Process): The child process.
+            received (asyncio.Future): The child's outcome.
+            deadline (float | None): The event loop time at which the solver is
+                interrupted, or None for no deadline.
+            interruptible (bool): Whether to interrupt the solver, rather than
+                kill it, when the awaiting task is cancelled.
+            on_cancel (Callable[[Any], None] | None): Called with the solve
+                function's result, if reported after the task is cancelled.
+
+        Returns:
+            tuple[str, Any] | None: The child's outcome, or None if it did not
+                report one.
+
+        Raises:
+            asyncio.CancelledError: If the awaiting task was cancelled.
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(received), _get_remaining(deadline)
+            )
+        except asyncio.TimeoutError:
+            return await self._interrupt(process, received)
+        except asyncio.CancelledError:
+            if interruptible:
+                message = await self._interrupt(process, received)
+                if message is not None and message[0] == "result" and on_cancel:
+                    on_cancel(message[1])
+            raise
+
+    async def _interrupt(
+        self, process: multiprocessing.Process, received: asyncio.Future
+    ) -> tuple[str, Any] | None:
+        """Interrupts a solver and waits for it to report its best solution.
+
+        Args:
+            process (multiprocessing.Process): The child process.
+            received (asyncio.Future): The child's outcome.
+
+        Returns:
+            tuple[str, Any] | None: The child's outcome, or None if it did not
+                report one within the grace period.
+        """
+        _signal_group(process, signal.SIGINT)
+        try:
+            return await asyncio.wait_for(asyncio.shield(received), self.grace_period)
+        except asyncio.TimeoutError:
+            return None
+
+
+# shared by sessions that are not given an executor
+DEFAULT_EXECUTOR = SolveExecutor()
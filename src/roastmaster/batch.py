@@ -0,0 +1,488 @@
+"""batch.py."""
+import asyncio
+import os
+import sys
+import tempfile
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import BrokenExecutor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from roastmaster.aio import SolveExecutor
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.results import Results
+from roastmaster.session import Session
+
+
+if TYPE_CHECKING:
+    from roastmaster.template import ModelTemplate
+
+# a problem may have its own options, which override those of the batch
+Problem = tuple[System, list[Dish]] | tuple[System, list[Dish], dict[str, Any]]
+
+# the per-problem options accepted by parse_problem, passed to solve_problem
+PROBLEM_OPTIONS = ("builder", "solver", "time_limit", "gap_rel")
+
+# the templates loaded by this worker process, by shape
+_TEMPLATES: dict[tuple, "ModelTemplate"] = {}
+
+
+@dataclass
+class BatchResult:
+    """The outcome of one problem in a batch.
+
+    Attributes:
+        index (int): The problem's position in the input.
+        results (Results | None): The results, if the problem was solved.
+        status (str | None): The Session status, if the solver ran.
+        objective_value (float | None): The objective value, if solved.
+        error (str | None): The error, if the problem failed.
+    """
+
+    index: int
+    results: Results | None = None
+    status: str | None = None
+    objective_value: float | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the problem was solved.
+
+        Returns:
+            bool: True if results are available.
+        """
+        return self.error is None
+
+
+def parse_problem(data: dict[str, Any]) -> tuple[System, list[Dish], dict[str, Any]]:
+    """Validates a problem given as JSON.
+
+    Args:
+        data (dict[str, Any]): The "system" and "dishes", and any of
+            PROBLEM_OPTIONS.
+
+    Returns:
+        tuple[System, list[Dish], dict[str, Any]]: The system and dish
+            configurations, and the options.
+
+    Raises:
+        ValueError: If the problem is not valid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("A problem must be a JSON object.")
+    unknown = set(data) - {"system", "dishes", *PROBLEM_OPTIONS}
+    if unknown:
+        raise ValueError(f"Unknown problem fields: {', '.join(sorted(unknown))}.")
+    if "system" not in data or not isinstance(data.get("dishes"), list):
+        raise ValueError('A problem needs a "system" and a list of "dishes".')
+    # pydantic's ValidationError is a ValueError
+    system = System.model_validate(data["system"])
+    dishes = [Dish.model_validate(dish) for dish in data["dishes"]]
+    options = {key: data[key] for key in PROBLEM_OPTIONS if key in data}
+    return system, dishes, options
+
+
+def init_worker(tmp_dir: str, templates: Sequence[str | Path] = ()) -> None:
+    """Gives a worker process its own directory for solver temporary files.
+
+    This is the initializer for process pools that solve sessions, e.g.
+    RestartingPool or a parameter sweep's pool, so that concurrent command-line
+    solvers do not share files. Solver logs are sent to stderr, so that they do
+    not mix with the output of the process running the batch. Any templates are
+    loaded once, for the "matrix" builder to fill in.
+
+    Args:
+        tmp_dir (str): The directory in which to make the worker's directory.
+        templates (Sequence[str | Path], optional): The paths of saved
+            ModelTemplates. Defaults to ().
+    """
+    worker_dir = tempfile.mkdtemp(dir=tmp_dir)
+    # pulp's command-line solvers write their model and solution files here
+    os.environ["TMPDIR"] = worker_dir
+    tempfile.tempdir = worker_dir
+    sys.stdout.flush()
+    os.dup2(2, 1)
+    if templates:
+        from roastmaster.template import ModelTemplate
+
+        for path in templates:
+            template = ModelTemplate.load(path)
+            _TEMPLATES[template.shape] = template
+
+
+def _get_template(
+    system: System, dishes: list[Dish], builder: str
+) -> "ModelTemplate | None":
+    """Returns this worker's template for a problem, if it has one.
+
+    Args:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        builder (str): The Session builder.
+
+    Returns:
+        ModelTemplate | None: The template, if the "matrix" builder is used and
+            a template of the problem's shape is loaded.
+    """
+    if builder != "matrix" or not _TEMPLATES:
+        return None
+    from roastmaster.template import get_shape
+
+    return _TEMPLATES.get(get_shape(system, len(dishes)))
+
+
+def _to_result(
+    index: int, session: Session | None, error: Exception | None = None
+) -> BatchResult:
+    """Records the outcome of one problem.
+
+    Args:
+        index (int): The problem's position in the input.
+        session (Session | None): The session, if it was built.
+        error (Exception | None, optional): The exception that stopped the
+            problem, if any. Defaults to None, for a solved session.
+
+    Returns:
+        BatchResult: The outcome.
+    """
+    if session is not None and error is None:
+        return BatchResult(
+            index=index,
+            results=session.get_results(),
+            status=session.status,
+            objective_value=session.get_objective_value(),
+        )
+    return BatchResult(
+        index=index,
+        status=session.status if session is not None else None,
+        error=f"{type(error).__name__}: {error}",
+    )
+
+
+def solve_problem(
+    index: int,
+    system: System,
+    dishes: list[Dish],
+    builder: str = "expression",
+    **solve_kwargs: Any,
+) -> BatchResult:
+    """Builds and solves one problem, capturing any failure.
+
+    Args:
+        index (int): The problem's position in the input.
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        builder (str, optional): The Session builder. Defaults to "expression".
+        **solve_kwargs (Any): Keyword arguments for Session.solve.
+
+    Returns:
+        BatchResult: The outcome.
+    """
+    session = None
+    try:
+        session = Session(
+            system,
+            dishes,
+            builder=builder,
+            template=_get_template(system, dishes, builder),
+        )
+        session.solve(**solve_kwargs)
+        return _to_result(index, session)
+    except Exception as e:  # one bad problem must not stop the batch
+        return _to_result(index, session, e)
+
+
+class RestartingPool:
+    """A process pool that starts new workers if one of them dies.
+
+    A worker killed by the operating system, or by a crash in a solver, breaks
+    its pool and fails every problem in flight. The next problem submitted
+    starts a new pool, so that one crash does not stop a batch or a long-running
+    service. Calls in flight when a worker dies raise BrokenExecutor, which the
+    caller should report as that call's failure.
+
+    Attributes:
+        restarts (int): The number of times the pool was restarted.
+    """
+
+    def __init__(
+        self, workers: int, tmp_dir: str, templates: Sequence[str | Path] = ()
+    ) -> None:
+        """Initializes a RestartingPool object.
+
+        Args:
+            workers (int): The number of worker processes.
+            tmp_dir (str): The directory in which each worker gets its own
+                directory for solver temporary files.
+            templates (Sequence[str | Path], optional): The paths of saved
+                ModelTemplates, which each worker loads. Defaults to ().
+        """
+        self._workers = workers
+        self._initargs = (tmp_dir, tuple(templates))
+        self._pool = self._start()
+        self.restarts = 0
+
+    def _start(self) -> ProcessPoolExecutor:
+        """Starts the worker processes.
+
+        Returns:
+            ProcessPoolExecutor: The pool.
+        """
+        return ProcessPoolExecutor(
+            self._workers, initializer=init_worker, initargs=self._initargs
+        )
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Submits a call, restarting the pool if it is broken.
+
+        Args:
+            func (Callable[..., Any]): The function.
+            *args (Any): The function's arguments.
+            **kwargs (Any): The function's keyword arguments.
+
+        Returns:
+            Future: The call's future.
+        """
+        try:
+            return self._pool.submit(func, *args, **kwargs)
+        except BrokenExecutor:
+            self._pool.shutdown(wait=False)
+            self._pool = self._start()
+            self.restarts += 1
+            return self._pool.submit(func, *args, **kwargs)
+
+    def shutdown(self, cancel_futures: bool = False) -> None:
+        """Waits for the calls in flight and stops the workers.
+
+        Args:
+            cancel_futures (bool, optional): Whether to cancel the calls not yet
+                started. Defaults to False.
+        """
+        self._pool.shutdown(cancel_futures=cancel_futures)
+
+
+def _get_outcome(future: Future, index: int) -> BatchResult:
+    """Returns a problem's outcome, or a failure if its worker died.
+
+    Args:
+        future (Future): The problem's future.
+        index (int): The problem's position in the input.
+
+    Returns:
+        BatchResult: The outcome.
+    """
+    try:
+        return future.result()
+    except BrokenExecutor as e:
+        return _to_result(index, None, e)
+
+
+def iter_solve_many(
+    problems: Iterable[Problem],
+    workers: int | None = None,
+    ordered: bool = True,
+    builder: str = "expression",
+    templates: Sequence[str | Path] = (),
+    **solve_kwargs: Any,
+) -> Iterator[BatchResult]:
+    """Solves problems across a process pool, yielding outcomes as they finish.
+
+    Problems are read lazily and at most twice as many as there are workers are
+    in flight at once, so memory use does not grow with the number of problems.
+
+    Args:
+        problems (Iterable[Problem]): The (System, list[Dish]) problems, each
+            optionally with a dict of options overriding the builder and
+            solve_kwargs, e.g. from parse_problem.
+        workers (int | None, optional): The number of worker processes. Defaults
+            to the number of CPUs.
+        ordered (bool, optional): If True, yield outcomes in input order,
+            otherwise as soon as each finishes. Defaults to True.
+        builder (str, optional): The Session builder. Defaults to "expression".
+        templates (Sequence[str | Path], optional): The paths of saved
+            ModelTemplates, which each worker loads once and the "matrix"
+            builder fills in for problems of their shapes. Defaults to ().
+        **solve_kwargs (Any): Keyword arguments for Session.solve.
+
+    Yields:
+        BatchResult: The outcome of each problem.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    queue = iter(enumerate(problems))
+    with tempfile.TemporaryDirectory(prefix="roastmaster-") as tmp_dir:
+        pool = RestartingPool(workers, tmp_dir, templates)
+        # the position of each problem in flight, reported if its worker dies
+        indices: dict[Future, int] = {}
+
+        def submit() -> Future | None:
+            """Submits the next problem, if any.
+
+            Returns:
+                Future | None: The submitted problem's future.
+            """
+            item = next(queue, None)
+            if item is None:
+                return None
+            index, (system, dishes, *options) = item
+            kwargs = {"builder": builder, **solve_kwargs, **dict(*options)}
+            future = pool.submit(solve_problem, index, system, dishes, **kwargs)
+            indices[future] = index
+            return future
+
+        try:
+            pending: deque[Future] = deque()
+            while len(pending) < max_pending and (future := submit()):
+                pending.append(future)
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done = list(wait(pending, return_when=FIRST_COMPLETED).done)
+                    for future in done:
+                        pending.remove(future)
+                for future in done:
+                    yield _get_outcome(future, indices.pop(future))
+                    if next_future := submit():
+                        pending.append(next_future)
+        finally:
+            pool.shutdown()
+
+
+def solve_many(
+    problems: Iterable[Problem],
+    workers: int | None = None,
+    builder: str = "expression",
+    templates: Sequence[str | Path] = (),
+    **solve_kwargs: Any,
+) -> list[BatchResult]:
+    """Solves problems across a process pool.
+
+    A failure in one problem is recorded in its BatchResult and does not stop
+    the others.
+
+    Args:
+        problems (Iterable[Problem]): The (System, list[Dish]) problems, each
+            optionally with a dict of options overriding the builder and
+            solve_kwargs, e.g. from parse_problem.
+        workers (int | None, optional): The number of worker processes. Defaults
+            to the number of CPUs.
+        builder (str, optional): The Session builder. Defaults to "expression".
+        templates (Sequence[str | Path], optional): The paths of saved
+            ModelTemplates, see iter_solve_many. Defaults to ().
+        **solve_kwargs (Any): Keyword arguments for Session.solve.
+
+    Returns:
+        list[BatchResult]: The outcomes, in input order.
+    """
+    return list(
+        iter_solve_many(
+            problems,
+            workers=workers,
+            ordered=True,
+            builder=builder,
+            templates=templates,
+            **solve_kwargs,
+        )
+    )
+
+
+async def solve_problem_async(
+    index: int,
+    system: System,
+    dishes: list[Dish],
+    builder: str = "expression",
+    executor: SolveExecutor | None = None,
+    **solve_kwargs: Any,
+) -> BatchResult:
+    """Builds and solves one problem without blocking the event loop.
+
+    The model is built in a thread and solved in a child process. A failure is
+    captured as in solve_problem, but cancelling the awaiting task cancels the
+    solve.
+
+    Args:
+        index (int): The problem's position in the input.
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        builder (str, optional): The Session builder. Defaults to "expression".
+        executor (SolveExecutor | None, optional): The executor, which limits
+            the solves that run at once. Defaults to a shared executor.
+        **solve_kwargs (Any): Keyword arguments for Session.solve_async, e.g.
+            timeout.
+
+    Returns:
+        BatchResult: The outcome.
+    """
+    session = None
+    try:
+        session = await asyncio.to_thread(Session, system, dishes, builder=builder)
+        await session.solve_async(executor=executor, **solve_kwargs)
+        return _to_result(index, session)
+    except Exception as e:  # one bad problem must not stop the batch
+        return _to_result(index, session, e)
+
+
+async def solve_many_async(
+    problems: Iterable[Problem],
+    workers: int | None = None,
+    builder: str = "expression",
+    **solve_kwargs: Any,
+) -> list[BatchResult]:
+    """Solves problems concurrently, without blocking the event loop.
+
+    A failure in one problem is recorded in its BatchResult and does not stop
+    the others. As in iter_solve_many, problems are read lazily and at most
+    twice as many as there are workers are in flight at once.
+
+    Args:
+        problems (Iterable[Problem]): The (System, list[Dish]) problems, each
+            optionally with a dict of options overriding the builder and
+            solve_kwargs, e.g. from parse_problem.
+        workers (int | None, optional): The most solves run at once. Defaults to
+            the number of CPUs.
+        builder (str, optional): The Session builder. Defaults to "expression".
+        **solve_kwargs (Any): Keyword arguments for Session.solve_async, e.g.
+            timeout.
+
+    Returns:
+        list[BatchResult]: The outcomes, in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = SolveExecutor(workers)
+    outcomes: list[BatchResult] = []
+    pending: set[asyncio.Task] = set()
+    try:
+        for index, (system, dishes, *options) in enumerate(problems):
+            if len(pending) >= 2 * workers:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                outcomes.extend(task.result() for task in done)
+            kwargs = {"builder": builder, **solve_kwargs, **dict(*options)}
+            pending.add(
+                asyncio.create_task(
+                    solve_problem_async(
+                        index, system, dishes, executor=executor, **kwargs
+                    )
+                )
+            )
+        outcomes.extend(await asyncio.gather(*pending))
+    finally:
+        # stop the solves in flight if this task is cancelled
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return sorted(outcomes, key=lambda outcome: outcome.index)
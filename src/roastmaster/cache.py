@@ -0,0 +1,248 @@
+"""cache.py."""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.results import Results
+from roastmaster.session import Session
+
+
+def get_cache_key(system: System, dishes: list[Dish], **options: Any) -> str:
+    """Returns a canonical hash of a problem.
+
+    The key depends only on the System and Dish field values and any options
+    that change the solution, not on the order in which dishes are listed.
+
+    Args:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        **options (Any): JSON-serialisable options that affect the results.
+
+    Returns:
+        str: The hex digest of the problem.
+    """
+    problem = {
+        "system": system.model_dump(mode="json"),
+        "dishes": sorted(
+            (dish.model_dump(mode="json") for dish in dishes),
+            key=lambda dish: dish["name"],
+        ),
+        "options": options,
+    }
+    canonical = json.dumps(problem, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """Caches solved Results by problem, with an optional on-disk tier.
+
+    The in-memory tier is an LRU of up to maxsize Results. Each lookup returns
+    a copy, so that a caller editing its results does not change later hits. If
+    a path is given,
+    results are also stored in an SQLite database there, shared between
+    processes, and the least recently used entries are evicted once the stored
+    results exceed max_disk_bytes.
+
+    Attributes:
+        maxsize (int): The maximum number of results held in memory.
+        path (Path | None): The SQLite database path, if any.
+        max_disk_bytes (int | None): The maximum size of the stored results.
+        hits (int): The number of lookups found in either tier.
+        misses (int): The number of lookups found in neither tier.
+        disk_hits (int): The number of hits served from disk.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        path: str | Path | None = None,
+        max_disk_bytes: int | None = None,
+    ) -> None:
+        """Initializes a ResultCache object.
+
+        Args:
+            maxsize (int, optional): The maximum number of results held in
+                memory. Defaults to 128.
+            path (str | Path | None, optional): An SQLite database path for the
+                on-disk tier. Defaults to no on-disk tier.
+            max_disk_bytes (int | None, optional): The maximum size of the
+                results stored on disk. Defaults to no limit.
+        """
+        self.maxsize = maxsize
+        self.path = Path(path) if path is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory: OrderedDict[str, Results] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if self.path is not None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT, size INTEGER, accessed REAL)"
+            )
+            self._db.commit()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """The cache counters.
+
+        Returns:
+            dict[str, int]: The hits, misses, disk hits and in-memory size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "size": len(self._memory),
+        }
+
+    def get(self, system: System, dishes: list[Dish], **options: Any) -> Results | None:
+        """Looks up the results for a problem.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            **options (Any): Options that affect the results, as for get_cache_key.
+
+        Returns:
+            Results | None: A copy of the cached results, or None on a miss.
+        """
+        key = get_cache_key(system, dishes, **options)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key].copy()
+            results = self._get_from_disk(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._put_in_memory(key, results)
+            return results.copy()
+
+    def put(
+        self, system: System, dishes: list[Dish], results: Results, **options: Any
+    ) -> None:
+        """Stores the results for a problem.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            results (Results): The results to store.
+            **options (Any): Options that affect the results, as for get_cache_key.
+        """
+        key = get_cache_key(system, dishes, **options)
+        with self._lock:
+            # a copy, so that the caller's later edits are not cached
+            self._put_in_memory(key, results.copy())
+            self._put_on_disk(key, results)
+
+    def solve(
+        self, system: System, dishes: list[Dish], builder: str = "expression"
+    ) -> Results:
+        """Returns the cached results for a problem, solving it on a miss.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            builder (str, optional): The Session builder. Defaults to "expression".
+
+        Returns:
+            Results: The results.
+        """
+        results = self.get(system, dishes, builder=builder)
+        if results is None:
+            session = Session(system, dishes, builder=builder)
+            session.solve()
+            results = session.get_results()
+            self.put(system, dishes, results, builder=builder)
+        return results
+
+    def clear(self) -> None:
+        """Empties both tiers and resets the counters."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.misses = self.disk_hits = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Closes the on-disk tier, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _put_in_memory(self, key: str, results: Results) -> None:
+        """Stores results in the LRU, evicting the least recently used.
+
+        Args:
+            key (str): The problem key.
+            results (Results): The results.
+        """
+        self._memory[key] = results
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _get_from_disk(self, key: str) -> Results | None:
+        """Looks up results in the on-disk tier.
+
+        Args:
+            key (str): The problem key.
+
+        Returns:
+            Results | None: The stored results, or None if absent.
+        """
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+        )
+        self._db.commit()
+        return Results.from_dict(json.loads(row[0]))
+
+    def _put_on_disk(self, key: str, results: Results) -> None:
+        """Stores results in the on-disk tier, evicting by size.
+
+        Args:
+            key (str): The problem key.
+            results (Results): The results.
+        """
+        if self._db is None:
+            return
+        value = json.dumps(results.to_dict())
+        self._db.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time()),
+        )
+        if self.max_disk_bytes is not None:
+            (total,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            # evict least recently used entries until under the limit
+            for old_key, size in self._db.execute(
+                "SELECT key, size FROM results ORDER BY accessed"
+            ).fetchall():
+                if total <= self.max_disk_bytes:
+                    break
+                self._db.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                total -= size
+        self._db.commit()
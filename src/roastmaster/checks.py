@@ -0,0 +1,125 @@
+"""checks.py."""
+import math
+
+from roastmaster.errors import InfeasibleError
+from roastmaster.models import Dish
+from roastmaster.models import System
+
+
+# small tolerance for comparing minutes, which may be floats
+EPS = 1e-9
+
+
+def _has_grid_point(least: float, most: float, time_increment: float) -> bool:
+    """Returns whether any duration in a range is a whole number of timesteps.
+
+    Args:
+        least (float): The shortest duration.
+        most (float): The longest duration.
+        time_increment (float): The timestep.
+
+    Returns:
+        bool: True if a multiple of the timestep lies in the range.
+    """
+    steps = math.ceil(least / time_increment - 1e-6)
+    return steps * time_increment <= most + 1e-6 * time_increment
+
+
+def check_dish(
+    system: System, dish: Dish, window: tuple[float, float] | None = None
+) -> None:
+    """Raises an exception if a dish cannot be cooked, whatever the other dishes.
+
+    Each spell in the oven costs the warm-up time, so a dish cooked in k spells
+    is in the oven for its cooking time, within its tolerance, plus k warm-up
+    times, which must be a whole number of timesteps for some k.
+
+    Args:
+        system (System): The system configuration.
+        dish (Dish): The dish configuration.
+        window (tuple[float, float] | None, optional): The period in which the
+            dish may be put in and taken out. Defaults to any time.
+
+    Raises:
+        InfeasibleError: If the dish does not fit in the oven, cannot cook within
+            the session or its window, or cannot cook on the time grid.
+    """
+    oven = system.oven
+    if dish.size > oven.num_shelves + EPS:
+        raise InfeasibleError(
+            f"{dish.name} needs {dish.size} shelves but the oven has "
+            f"{oven.num_shelves}.",
+            "too_large",
+            dish.name,
+        )
+    least, most = dish.get_cooking_time_range()
+    duration = least + oven.warm_up_time
+    if duration > system.total_time + EPS:
+        raise InfeasibleError(
+            f"{dish.name} needs {duration} minutes including warm-up but the "
+            f"session lasts {system.total_time}.",
+            "too_long",
+            dish.name,
+        )
+    if window is not None and duration > window[1] - window[0] + EPS:
+        raise InfeasibleError(
+            f"{dish.name} needs {duration} minutes including warm-up but its "
+            f"window lasts {window[1] - window[0]}.",
+            "window_too_short",
+            dish.name,
+        )
+    # each spell takes at least one timestep
+    max_spells = round(system.total_time / system.time_increment)
+    if least > 0 and not any(
+        _has_grid_point(
+            least + k * oven.warm_up_time,
+            most + k * oven.warm_up_time,
+            system.time_increment,
+        )
+        for k in range(1, max_spells + 1)
+    ):
+        tolerance = dish.cooking_time_tolerance_mins
+        raise InfeasibleError(
+            f"Cannot cook {dish.name} for {dish.cooking_time_mins}"
+            f"{f' ± {tolerance}' if tolerance else ''} minutes plus "
+            f"warm-up in {system.time_increment} minute increments.",
+            "off_grid",
+            dish.name,
+        )
+
+
+def check_feasibility(
+    system: System,
+    dishes: list[Dish],
+    windows: dict[str, tuple[float, float]] | None = None,
+) -> None:
+    """Raises an exception if a menu is clearly infeasible, without solving.
+
+    These are necessary conditions only: a menu that passes may still be
+    infeasible, but one that fails cannot be scheduled by any builder.
+
+    Args:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        windows (dict[str, tuple[float, float]] | None, optional): For any dish
+            name, the period in which that dish may be put in and taken out.
+            Defaults to None.
+
+    Raises:
+        InfeasibleError: If a dish cannot be cooked on its own, or the dishes
+            need more shelf-minutes than the oven has.
+    """
+    windows = windows or {}
+    for dish in dishes:
+        check_dish(system, dish, windows.get(dish.name))
+    # each dish occupies its space for at least its cooking and warm-up time
+    demand = sum(
+        dish.size * (dish.get_cooking_time_range()[0] + system.oven.warm_up_time)
+        for dish in dishes
+    )
+    capacity = system.oven.num_shelves * system.total_time
+    if demand > capacity + EPS:
+        raise InfeasibleError(
+            f"The dishes need {demand} shelf-minutes but the oven has " f"{capacity}.",
+            "over_capacity",
+        )
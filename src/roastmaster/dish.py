@@ -1,9 +1,19 @@
 """dish.py."""
 
-import pandas as pd
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
 import pulp  # type: ignore
 
 import roastmaster.models as models
+from roastmaster.errors import SolverError
+from roastmaster.results import FIELDS
+from roastmaster.results import Results
+
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class DishOpt:
@@ -13,6 +23,17 @@ class DishOpt:
         model (pulp.LpProblem): The optimization model.
         system_config (models.System): The system configuration.
         dish_config (models.Dish): The dish configuration.
+        explicit_state (bool, optional): Model in-ness and cooking time as state
+            variables. Defaults to False.
+        put_in_window (tuple[float, float] | None, optional): The period in which
+            the dish may be put in. Defaults to any time.
+        take_out_window (tuple[float, float] | None, optional): The period in which
+            the dish may be taken out. Defaults to any time.
+        start (float, optional): The first timestep modelled. Defaults to 0.
+        end (float | None, optional): The last timestep modelled. Defaults to
+            the total time.
+        initial_state (tuple[float, float], optional): The in-ness and time
+            cooked just before start. Defaults to (0, 0).
 
     Attributes:
         name (str): The name of the dish.
@@ -32,6 +53,12 @@ class DishOpt:
         model: pulp.LpProblem,
         system_config: models.System,
         dish_config: models.Dish,
+        explicit_state: bool = False,
+        put_in_window: tuple[float, float] | None = None,
+        take_out_window: tuple[float, float] | None = None,
+        start: float = 0,
+        end: float | None = None,
+        initial_state: tuple[float, float] = (0, 0),
     ) -> None:
         """Initializes a new instance of the Dish class.
 
@@ -39,68 +66,191 @@ class DishOpt:
             model (pulp.LpProblem): The optimization model.
             system_config (models.System): The system configuration.
             dish_config (models.Dish): The dish configuration.
+            explicit_state (bool, optional): If True, model in-ness and cooking time
+                as variables linked by one constraint per timestep, rather than as
+                expressions accumulated over all previous timesteps. The model then
+                grows linearly with the number of timesteps. Defaults to False.
+            put_in_window (tuple[float, float] | None, optional): The period in
+                which the dish may be put in. No put-in variables are created
+                outside it. Defaults to any time.
+            take_out_window (tuple[float, float] | None, optional): The period in
+                which the dish may be taken out. No take-out variables are created
+                outside it. Defaults to any time.
+            start (float, optional): The first timestep modelled, e.g. for one
+                window of a rolling horizon. Defaults to 0.
+            end (float | None, optional): The last timestep modelled. The dish
+                need only be cooked and out of the oven by then if it is the
+                total time. Defaults to the total time.
+            initial_state (tuple[float, float], optional): The in-ness and time
+                cooked just before start. Defaults to (0, 0).
         """
         self.name = dish_config.name
         self.dish_config = dish_config
 
         self.system_config = system_config
-        self.time_range = system_config.get_time_range()
+        end = system_config.total_time if end is None else end
+        time_range = system_config.get_time_range()
+        self.time_range = time_range[
+            (time_range >= start - 1e-9) & (time_range <= end + 1e-9)
+        ]
+        # constraints this dish added to the model
+        self.constraints: list[pulp.LpConstraint] = []
+        # decisions fixed to 0 and constraints left on constants by the windows
+        self.num_fixed_decisions = 0
+        self.num_skipped_constraints = 0
 
         # initialise some dynamic decisions / variables at time = T-1
-        self.put_in: pulp.LpVariable = {-self.system_config.time_increment: 0}
-        self.take_out: pulp.LpVariable = {-self.system_config.time_increment: 0}
-        self.is_in: pulp.LpVariable = {-self.system_config.time_increment: 0}
-        self.space_used: pulp.LpVariable = {-self.system_config.time_increment: 0}
-        self.time_cooked: pulp.LpVariable = {-self.system_config.time_increment: 0}
+        before = start - self.system_config.time_increment
+        self.initial_state = initial_state
+        is_in, time_cooked = initial_state
+        self.put_in: pulp.LpVariable = {before: 0}
+        self.take_out: pulp.LpVariable = {before: 0}
+        self.is_in: pulp.LpVariable = {before: is_in}
+        self.space_used: pulp.LpVariable = {before: is_in * dish_config.size}
+        self.time_cooked: pulp.LpVariable = {before: time_cooked}
 
         for time in self.time_range:
             # decision variables -- put into oven at this timestep
-            self.put_in[time] = pulp.LpVariable(
-                f"{self.dish_config.name}_in_{time}", cat="Binary"
-            )
+            self.put_in[time] = self._decision("in", time, put_in_window)
             # take out of oven at this timestep
-            self.take_out[time] = pulp.LpVariable(
-                f"{self.dish_config.name}_out_{time}", cat="Binary"
-            )
-            # in-ness = last inness + put in - take out
-            self.is_in[time] = (
-                self.is_in[time - self.system_config.time_increment]
-                + self.put_in[time]
-                - self.take_out[time]
-            )
-            # space used = in-ness * size
-            self.space_used[time] = self.is_in[time] * self.dish_config.size
-            # time cooked = last time cooked + inness * time increment
-            self.time_cooked[time] = (
-                self.time_cooked[time - self.system_config.time_increment]
-                + self.is_in[time] * self.system_config.time_increment
-            )
-            # penalty for multiple put-ins -- first e.g. 5 mins after
-            # putting in do not count towards cooking time
-            self.time_cooked[time] -= (
-                self.put_in[time] * self.system_config.oven.warm_up_time
-            )
+            self.take_out[time] = self._decision("out", time, take_out_window)
+            if explicit_state:
+                self._add_state(model, time)
+            else:
+                self._add_expressions(model, time)
 
-            # binary constraints on inness
-            model += self.is_in[time] >= 0
-            model += self.is_in[time] <= 1
-            model += (
+            self._add_constraint(
+                model,
                 self.put_in[time] + self.is_in[time - self.system_config.time_increment]
-                <= 1
+                <= 1,
             )
-            model += (
+            self._add_constraint(
+                model,
                 self.is_in[time - self.system_config.time_increment]
                 - self.take_out[time]
-                >= 0
+                >= 0,
             )
 
-        # cooking time constraint -- total cooking time == desired cooking time
-        # TODO: add some tolerance here, maybe user-defined
-        model += (
-            self.time_cooked[self.system_config.total_time]
-            == self.dish_config.cooking_time_mins
+        if end < self.system_config.total_time - 1e-9:
+            # an earlier window of a longer session
+            return
+        # cooking time constraint -- total cooking time within the dish's
+        # tolerance of the desired cooking time
+        least, most = self.dish_config.get_cooking_time_range()
+        time_cooked = self.time_cooked[self.system_config.total_time]
+        if least == most:
+            self._add_constraint(model, time_cooked == least)
+        else:
+            self._add_constraint(model, time_cooked >= least)
+            self._add_constraint(model, time_cooked <= most)
+        self._add_constraint(model, self.is_in[self.system_config.total_time] == 0)
+
+    def _decision(
+        self, kind: str, time: float, window: tuple[float, float] | None
+    ) -> pulp.LpVariable | int:
+        """Creates a binary decision variable, or 0 outside its window.
+
+        Args:
+            kind (str): "in" or "out".
+            time (float): The timestep.
+            window (tuple[float, float] | None): The period in which the decision
+                may be made, if restricted.
+
+        Returns:
+            pulp.LpVariable | int: The decision variable, or 0.
+        """
+        if window is not None and not window[0] - 1e-9 <= time <= window[1] + 1e-9:
+            self.num_fixed_decisions += 1
+            return 0
+        return pulp.LpVariable(f"{self.dish_config.name}_{kind}_{time}", cat="Binary")
+
+    def _add_constraint(
+        self, model: pulp.LpProblem, constraint: pulp.LpConstraint | bool
+    ) -> None:
+        """Adds a constraint to the model, keeping track of it.
+
+        Constraints on constants only, left by decisions outside their windows,
+        are checked here rather than added.
+
+        Args:
+            model (pulp.LpProblem): The optimization model.
+            constraint (pulp.LpConstraint | bool): The constraint.
+
+        Raises:
+            SolverError: If a constraint on constants only does not hold.
+        """
+        if constraint is True:
+            self.num_skipped_constraints += 1
+            return
+        if constraint is False:
+            raise SolverError(f"{self.name} cannot be cooked within its windows.")
+        self.constraints.append(constraint)
+        model += constraint
+
+    def _add_expressions(self, model: pulp.LpProblem, time: float) -> None:
+        """Defines the dish state at a timestep as expressions of the decisions.
+
+        Each expression includes the previous timestep's expression, so the model
+        grows quadratically with the number of timesteps.
+
+        Args:
+            model (pulp.LpProblem): The optimization model.
+            time (float): The timestep.
+        """
+        prev = time - self.system_config.time_increment
+        # in-ness = last inness + put in - take out
+        self.is_in[time] = self.is_in[prev] + self.put_in[time] - self.take_out[time]
+        # space used = in-ness * size
+        self.space_used[time] = self.is_in[time] * self.dish_config.size
+        # time cooked = last time cooked + inness * time increment
+        self.time_cooked[time] = (
+            self.time_cooked[prev]
+            + self.is_in[time] * self.system_config.time_increment
+        )
+        # penalty for multiple put-ins -- first e.g. 5 mins after
+        # putting in do not count towards cooking time
+        self.time_cooked[time] -= (
+            self.put_in[time] * self.system_config.oven.warm_up_time
+        )
+
+        # binary constraints on inness
+        self._add_constraint(model, self.is_in[time] >= 0)
+        self._add_constraint(model, self.is_in[time] <= 1)
+
+    def _add_state(self, model: pulp.LpProblem, time: float) -> None:
+        """Defines the dish state at a timestep as variables.
+
+        The state variables are linked to the previous timestep by one constraint
+        each, so the model grows linearly with the number of timesteps.
+
+        Args:
+            model (pulp.LpProblem): The optimization model.
+            time (float): The timestep.
+        """
+        prev = time - self.system_config.time_increment
+        # in-ness is bounded to [0, 1] rather than constrained
+        self.is_in[time] = pulp.LpVariable(
+            f"{self.dish_config.name}_isin_{time}", lowBound=0, upBound=1
+        )
+        self.space_used[time] = self.is_in[time] * self.dish_config.size
+        self.time_cooked[time] = pulp.LpVariable(
+            f"{self.dish_config.name}_cooked_{time}"
+        )
+
+        self._add_constraint(
+            model,
+            self.is_in[time]
+            == self.is_in[prev] + self.put_in[time] - self.take_out[time],
+        )
+        self._add_constraint(
+            model,
+            self.time_cooked[time]
+            == (
+                self.time_cooked[prev]
+                + self.is_in[time] * self.system_config.time_increment
+                - self.put_in[time] * self.system_config.oven.warm_up_time
+            ),
         )
-        model += self.is_in[self.system_config.total_time] == 0
 
     def get_score(self) -> pulp.LpAffineExpression:
         """Calculates the score of the dish based on temperature and oven openings.
@@ -109,19 +259,13 @@ class DishOpt:
             pulp.LpAffineExpression: The score of the dish.
 
         """
-        # reward hot food
-        dish_temp = (
-            3
-            * self.is_in[
-                self.system_config.total_time - self.system_config.time_increment
-            ]
-            + 2
-            * self.is_in[
-                self.system_config.total_time - 2 * self.system_config.time_increment
-            ]
-            + self.is_in[
-                self.system_config.total_time - 3 * self.system_config.time_increment
-            ]
+        # reward hot food, at those of the last timesteps that are modelled
+        end, step = self.system_config.total_time, self.system_config.time_increment
+        first, last = self.time_range[0] - 1e-9, self.time_range[-1] + 1e-9
+        dish_temp = pulp.lpSum(
+            weight * self.is_in[end - k * step]
+            for k, weight in ((1, 3), (2, 2), (3, 1))
+            if first <= end - k * step <= last
         )
 
         # penalise oven openings
@@ -132,34 +276,184 @@ class DishOpt:
             dish_temp * self.dish_config.serve_hot_weight
         ) - oven_openings * self.system_config.oven.oven_opening_penalty
 
-    def get_results(self) -> pd.DataFrame:
+    def set_initial_values(self, results: "pd.DataFrame") -> None:
+        """Sets the variables' initial values, e.g. to warm-start the solver.
+
+        Args:
+            results (pd.DataFrame): A schedule in the form returned by get_results.
+        """
+        for time in self.time_range:
+            for field in ("put_in", "take_out", "is_in", "time_cooked"):
+                # state variables, if any, need starting values too
+                var = getattr(self, field)[time]
+                if isinstance(var, pulp.LpVariable):
+                    var.setInitialValue(results.at[time, field])
+
+    def get_decision_values(self) -> np.ndarray:
+        """Returns the solved put-in and take-out decisions.
+
+        Decisions outside the dish's windows are 0.
+
+        Returns:
+            np.ndarray: The (2, timesteps) put-in and take-out values.
+        """
+        return np.array(
+            [
+                [
+                    var.varValue if isinstance(var, pulp.LpVariable) else var
+                    for var in (decisions[time] for time in self.time_range)
+                ]
+                for decisions in (self.put_in, self.take_out)
+            ],
+            dtype=float,
+        )
+
+    def get_results(self) -> "pd.DataFrame":
         """Retrieves the results of the optimization model.
 
         Returns:
             pd.DataFrame: The results of the optimization model.
 
         """
-        is_in: pd.Series = pd.Series(
-            {time: self.is_in[time].value() for time in self.time_range}
-        )
-        put_in: pd.Series = pd.Series(
-            {time: self.put_in[time].value() for time in self.time_range}
-        )
-        take_out: pd.Series = pd.Series(
-            {time: self.take_out[time].value() for time in self.time_range}
-        )
-        time_cooked: pd.Series = pd.Series(
-            {time: self.time_cooked[time].value() for time in self.time_range}
+        put_in, take_out = self.get_decision_values()
+        values = get_results_array(
+            self.system_config,
+            [self.dish_config],
+            put_in[None],
+            take_out[None],
+            initial_state=np.array([self.initial_state], dtype=float),
         )
-        space_used: pd.Series = pd.Series(
-            {time: self.space_used[time].value() for time in self.time_range}
-        )
-        return pd.DataFrame(
-            {
-                "is_in": is_in,
-                "put_in": put_in,
-                "take_out": take_out,
-                "time_cooked": time_cooked,
-                "space_used": space_used,
-            }
+        return Results.from_array(values, [self.name], self.time_range).dish_results[
+            self.name
+        ]
+
+
+def score_results(
+    system_config: models.System, dish_config: models.Dish, results: "pd.DataFrame"
+) -> float:
+    """Scores a dish's schedule with the same objective as DishOpt.get_score.
+
+    Args:
+        system_config (models.System): The system configuration.
+        dish_config (models.Dish): The dish configuration.
+        results (pd.DataFrame): The dish's results, indexed by time.
+
+    Returns:
+        float: The score of the dish.
+    """
+    end, step = system_config.total_time, system_config.time_increment
+    is_in = results["is_in"]
+    # reward hot food
+    dish_temp = (
+        3 * is_in.get(end - step, 0)
+        + 2 * is_in.get(end - 2 * step, 0)
+        + is_in.get(end - 3 * step, 0)
+    )
+
+    # penalise oven openings
+    oven_openings = results["put_in"].sum() + results["take_out"].sum()
+    return float(
+        dish_temp * dish_config.serve_hot_weight
+        - oven_openings * system_config.oven.oven_opening_penalty
+    )
+
+
+def get_spell_steps(system_config: models.System, dish_config: models.Dish) -> int:
+    """Returns the number of timesteps a dish spends in the oven if put in once.
+
+    Of the spells that cook the dish within its tolerance, this is the one that
+    cooks it nearest its cooking time.
+
+    Args:
+        system_config (models.System): The system configuration.
+        dish_config (models.Dish): The dish configuration.
+
+    Returns:
+        int: The number of timesteps.
+
+    Raises:
+        SolverError: If no cooking time within the tolerance is reachable on the
+            time grid.
+    """
+    step, warm_up = system_config.time_increment, system_config.oven.warm_up_time
+    least, most = dish_config.get_cooking_time_range()
+    fewest = math.ceil((least + warm_up) / step - 1e-6)
+    most_steps = math.floor((most + warm_up) / step + 1e-6)
+    if fewest > most_steps:
+        duration = dish_config.cooking_time_mins + warm_up
+        raise SolverError(
+            f"Cannot cook {dish_config.name} for {duration} minutes including "
+            f"warm-up in {step} minute increments."
         )
+    nearest = round((dish_config.cooking_time_mins + warm_up) / step)
+    return min(max(nearest, fewest), most_steps)
+
+
+def get_results_array(
+    system_config: models.System,
+    dish_configs: list[models.Dish],
+    put_in: np.ndarray,
+    take_out: np.ndarray,
+    initial_state: np.ndarray | None = None,
+) -> np.ndarray:
+    """Derives all the results fields from the put-in and take-out decisions.
+
+    Args:
+        system_config (models.System): The system configuration.
+        dish_configs (list[models.Dish]): The dish configurations.
+        put_in (np.ndarray): The (dishes, timesteps) put-in decisions.
+        take_out (np.ndarray): The (dishes, timesteps) take-out decisions.
+        initial_state (np.ndarray | None, optional): The (dishes, 2) in-ness and
+            time cooked just before the first timestep, e.g. for a window of a
+            longer session. Defaults to None, i.e. all 0.
+
+    Returns:
+        np.ndarray: The (dishes, timesteps, fields) results, as in Results.values.
+    """
+    if initial_state is None:
+        initial_state = np.zeros((len(dish_configs), 2))
+    size = np.array([dish.size for dish in dish_configs], dtype=float)
+    # in-ness and time cooked accumulate from their values before the first timestep
+    is_in = initial_state[:, :1] + np.cumsum(put_in - take_out, axis=1)
+    fields = {
+        "is_in": is_in,
+        "put_in": put_in,
+        "take_out": take_out,
+        "time_cooked": initial_state[:, 1:]
+        + np.cumsum(
+            is_in * system_config.time_increment
+            - put_in * system_config.oven.warm_up_time,
+            axis=1,
+        ),
+        "space_used": is_in * size[:, None],
+    }
+    return np.stack([fields[field] for field in FIELDS], axis=-1)
+
+
+def get_spell_results(
+    system_config: models.System,
+    dish_configs: list[models.Dish],
+    spells: list[tuple[int, int]],
+) -> Results:
+    """Returns the results of putting each dish in the oven once.
+
+    Args:
+        system_config (models.System): The system configuration.
+        dish_configs (list[models.Dish]): The dish configurations.
+        spells (list[tuple[int, int]]): The timesteps at which each dish is put
+            in and taken out.
+
+    Returns:
+        Results: The per-dish results.
+    """
+    time_range = system_config.get_time_range()
+    put_in = np.zeros((len(dish_configs), len(time_range)))
+    take_out = np.zeros((len(dish_configs), len(time_range)))
+    for i, (put_in_index, take_out_index) in enumerate(spells):
+        put_in[i, put_in_index] = 1
+        take_out[i, take_out_index] = 1
+    return Results.from_array(
+        get_results_array(system_config, dish_configs, put_in, take_out),
+        [dish.name for dish in dish_configs],
+        time_range,
+    )
@@ -0,0 +1,45 @@
+"""errors.py."""
+
+
+class SolverError(Exception):
+    """Exception raised when the solver fails."""
+
+    pass
+
+
+class InfeasibleError(SolverError):
+    """Exception raised when a problem is found infeasible before solving.
+
+    Attributes:
+        message (str): The explanation.
+        reason (str): A short code for the cause, e.g. "too_long".
+        dish (str | None): The dish at fault, if a single dish is.
+    """
+
+    def __init__(self, message: str, reason: str, dish: str | None = None) -> None:
+        """Initializes an InfeasibleError object.
+
+        Args:
+            message (str): The explanation.
+            reason (str): A short code for the cause.
+            dish (str | None, optional): The dish at fault, if a single dish is.
+                Defaults to None.
+        """
+        super().__init__(message, reason, dish)
+        self.message = message
+        self.reason = reason
+        self.dish = dish
+
+    def __str__(self) -> str:
+        """Returns the explanation.
+
+        Returns:
+            str: The explanation.
+        """
+        return self.message
+
+
+class QueueFullError(Exception):
+    """Exception raised when a service has no room to queue another problem."""
+
+    pass
@@ -0,0 +1,231 @@
+"""event.py."""
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pulp  # type: ignore
+
+from roastmaster.dish import get_spell_results
+from roastmaster.dish import get_spell_steps
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.presolve import get_symmetric_pairs
+from roastmaster.results import Results
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class EventModel:
+    """Builds the session model from dish start times rather than timesteps.
+
+    Each dish is put in the oven once, for its cooking time plus the oven
+    warm-up time, so its schedule is fixed by a single integer variable: the
+    timestep at which it is put in. The oven is fullest just as some dish is put
+    in, so oven space is only checked at those events. For each pair of dishes,
+    binary variables record whether one is in the oven when the other is put
+    in. Being hot at the end is likewise recorded by one binary variable per
+    scored timestep. The model therefore grows with the number of dishes and
+    not with the number of timesteps.
+
+    Attributes:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        model (pulp.LpProblem): The optimization model.
+        num_steps (dict[str, int]): The timesteps each dish spends in the oven.
+        put_in (dict[str, pulp.LpVariable]): The timestep at which each dish is
+            put in.
+    """
+
+    def __init__(
+        self,
+        system: System,
+        dishes: list[Dish],
+        windows: dict[str, tuple[float, float]] | None = None,
+        symmetry_breaking: bool = False,
+    ) -> None:
+        """Initializes an EventModel object.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            windows (dict[str, tuple[float, float]] | None, optional): For any
+                dish name, the period in which that dish may be put in and taken
+                out. Defaults to None.
+            symmetry_breaking (bool, optional): Whether to order dishes with the
+                same configuration and windows by their put-in times. Defaults to
+                False.
+        """
+        self.system = system
+        self.dishes = dishes
+        self.windows = windows or {}
+        self.time_range = system.get_time_range()
+        # big enough to switch off any constraint between timestep indices
+        self._big_m = 2 * len(self.time_range)
+        self.model = pulp.LpProblem("ROAST", pulp.LpMaximize)
+        self.num_steps = {dish.name: get_spell_steps(system, dish) for dish in dishes}
+        self.put_in = {dish.name: self._add_put_in(dish) for dish in dishes}
+        self._add_capacity_constraints()
+        if symmetry_breaking:
+            for i, j in get_symmetric_pairs(dishes, self.windows):
+                self.model += self.put_in[dishes[i].name] <= self.put_in[dishes[j].name]
+        self.model += (
+            pulp.lpSum(self._get_score(dish) for dish in dishes),
+            "dish_temp",
+        )
+
+    def _add_put_in(self, dish: Dish) -> pulp.LpVariable:
+        """Creates the variable for the timestep at which a dish is put in.
+
+        Args:
+            dish (Dish): The dish configuration.
+
+        Returns:
+            pulp.LpVariable: The put in timestep.
+
+        Raises:
+            SolverError: If the dish cannot be cooked in time or within its window.
+        """
+        # out by the last timestep
+        last = len(self.time_range) - 1 - self.num_steps[dish.name]
+        first = 0
+        if dish.name in self.windows:
+            start, end = self.windows[dish.name]
+            in_window = np.flatnonzero(
+                (self.time_range >= start - 1e-9) & (self.time_range <= end + 1e-9)
+            )
+            if len(in_window):
+                first = max(first, int(in_window[0]))
+                last = min(last, int(in_window[-1]) - self.num_steps[dish.name])
+            else:
+                last = -1
+        if last < first:
+            raise SolverError(f"{dish.name} cannot be cooked within its windows.")
+        return pulp.LpVariable(
+            f"{dish.name}_put_in", lowBound=first, upBound=last, cat="Integer"
+        )
+
+    def _forced_on(self, expr: pulp.LpAffineExpression, name: str) -> pulp.LpVariable:
+        """Creates a binary variable that must be 1 if an expression is >= 0.
+
+        Args:
+            expr (pulp.LpAffineExpression): An integer-valued expression.
+            name (str): The variable name.
+
+        Returns:
+            pulp.LpVariable: The binary variable.
+        """
+        indicator = pulp.LpVariable(name, cat="Binary")
+        self.model += expr <= -1 + self._big_m * indicator
+        return indicator
+
+    def _is_in_at(
+        self, dish: Dish, index: int
+    ) -> tuple[pulp.LpAffineExpression, pulp.LpAffineExpression]:
+        """Returns expressions that are both >= 0 iff a dish is in at a timestep.
+
+        Args:
+            dish (Dish): The dish configuration.
+            index (int): The timestep index.
+
+        Returns:
+            tuple[pulp.LpAffineExpression, pulp.LpAffineExpression]: The put in
+                and take out conditions.
+        """
+        put_in = self.put_in[dish.name]
+        return index - put_in, put_in + self.num_steps[dish.name] - 1 - index
+
+    def _add_capacity_constraints(self) -> None:
+        """Limits the oven space used when each dish is put in.
+
+        Raises:
+            SolverError: If a dish does not fit in the oven on its own.
+        """
+        for dish in self.dishes:
+            if dish.size > self.system.oven.num_shelves:
+                raise SolverError(f"{dish.name} does not fit in the oven.")
+            space_used = pulp.LpAffineExpression(constant=dish.size)
+            for other in self.dishes:
+                if other is dish:
+                    continue
+                # other is in when dish is put in if other was put in no later
+                # and taken out later
+                put_in = self.put_in[dish.name]
+                other_put_in = self.put_in[other.name]
+                started = self._forced_on(
+                    put_in - other_put_in, f"{other.name}_started_{dish.name}"
+                )
+                running = self._forced_on(
+                    other_put_in + self.num_steps[other.name] - 1 - put_in,
+                    f"{other.name}_running_{dish.name}",
+                )
+                overlap = pulp.LpVariable(
+                    f"{other.name}_in_at_{dish.name}", lowBound=0, upBound=1
+                )
+                self.model += overlap >= started + running - 1
+                space_used += other.size * overlap
+            self.model += space_used <= self.system.oven.num_shelves
+
+    def _get_score(self, dish: Dish) -> pulp.LpAffineExpression:
+        """Returns a dish's score, as in DishOpt.get_score.
+
+        Args:
+            dish (Dish): The dish configuration.
+
+        Returns:
+            pulp.LpAffineExpression: The score.
+        """
+        dish_temp = 0
+        for steps_before_end, weight in ((1, 3), (2, 2), (3, 1)):
+            index = len(self.time_range) - 1 - steps_before_end
+            if index < 0:
+                continue
+            after_put_in, before_take_out = self._is_in_at(dish, index)
+            name = f"{dish.name}_hot_{self.time_range[index]}"
+            if dish.serve_hot_weight >= 0:
+                # the objective pushes hot up, so it may only be 1 if in
+                hot = pulp.LpVariable(name, cat="Binary")
+                self.model += after_put_in >= -self._big_m * (1 - hot)
+                self.model += before_take_out >= -self._big_m * (1 - hot)
+            else:
+                # the objective pushes hot down, so it must be 1 if in
+                hot = pulp.LpVariable(name, lowBound=0, upBound=1)
+                self.model += hot >= (
+                    self._forced_on(after_put_in, f"{name}_started")
+                    + self._forced_on(before_take_out, f"{name}_running")
+                    - 1
+                )
+            dish_temp += weight * hot
+
+        # each dish is put in and taken out once
+        oven_openings = 2
+        return (
+            dish_temp * dish.serve_hot_weight
+            - oven_openings * self.system.oven.oven_opening_penalty
+        )
+
+    def set_initial_values(self, results: "Mapping[str, pd.DataFrame]") -> None:
+        """Sets the put in times' initial values from existing schedules.
+
+        Args:
+            results (Mapping[str, pd.DataFrame]): The results of each dish, as in
+                Results.dish_results.
+        """
+        for dish in self.dishes:
+            put_in = np.flatnonzero(results[dish.name]["put_in"].to_numpy() > 0.5)
+            if len(put_in):
+                self.put_in[dish.name].setInitialValue(int(put_in[0]))
+
+    def get_results(self) -> Results:
+        """Returns the schedule sampled onto the System time grid.
+
+        Returns:
+            Results: The per-dish results.
+        """
+        spells = []
+        for dish in self.dishes:
+            put_in = round(self.put_in[dish.name].value())
+            spells.append((put_in, put_in + self.num_steps[dish.name]))
+        return get_spell_results(self.system, self.dishes, spells)
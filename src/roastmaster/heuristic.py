@@ -0,0 +1,107 @@
+"""heuristic.py."""
+import numpy as np
+
+from roastmaster.dish import get_spell_results
+from roastmaster.dish import get_spell_steps
+from roastmaster.dish import score_results
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.results import Results
+
+
+class GreedyScheduler:
+    """Schedules dishes greedily, without solving a MILP.
+
+    Each dish is put in the oven once, for its cooking time plus the oven warm-up
+    time. Dishes are placed one at a time, longest cook first and, among dishes
+    with the same cooking time, the hottest-weighted first. Each is placed as
+    late as the oven's remaining shelf space allows, working back from the total
+    time, so that it is served as hot as possible.
+
+    Attributes:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        time_range (np.ndarray): The schedule timesteps.
+        status (str): "feasible" once a schedule has been found.
+    """
+
+    def __init__(self, system: System, dishes: list[Dish]) -> None:
+        """Initializes a GreedyScheduler object.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+        """
+        self.system = system
+        self.dishes = dishes
+        self.time_range = system.get_time_range()
+        self.status = "not_solved"
+        self._slots: dict[str, tuple[int, int]] = {}
+
+    def solve(self) -> None:
+        """Finds a schedule.
+
+        Raises:
+            SolverError: If a dish cannot be placed in the oven.
+        """
+        num_steps = {
+            dish.name: get_spell_steps(self.system, dish) for dish in self.dishes
+        }
+        order = sorted(
+            self.dishes,
+            key=lambda dish: (-num_steps[dish.name], -dish.serve_hot_weight),
+        )
+
+        # oven space used at each timestep
+        space_used = np.zeros(len(self.time_range))
+        last = len(self.time_range) - 1
+        self._slots = {}
+        for dish in order:
+            # in from put_in up to take_out - 1, out by the last timestep
+            for take_out in range(last, num_steps[dish.name] - 1, -1):
+                put_in = take_out - num_steps[dish.name]
+                space = space_used[put_in:take_out] + dish.size
+                if np.all(space <= self.system.oven.num_shelves + 1e-9):
+                    space_used[put_in:take_out] = space
+                    self._slots[dish.name] = (put_in, take_out)
+                    break
+            else:
+                self.status = "infeasible"
+                raise SolverError(f"Could not fit {dish.name} in the oven.")
+        self.status = "feasible"
+
+    def check_solved(self) -> None:
+        """Raises an exception if no schedule has been found.
+
+        Raises:
+            SolverError: If solve() has not found a schedule.
+        """
+        if self.status != "feasible":
+            raise SolverError(
+                "No schedule found. Make sure GreedyScheduler.solve() has been called."
+            )
+
+    def get_results(self) -> Results:
+        """Returns the schedule.
+
+        Returns:
+            Results: The per-dish results.
+        """
+        self.check_solved()
+        return get_spell_results(
+            self.system,
+            self.dishes,
+            [self._slots[dish.name] for dish in self.dishes],
+        )
+
+    def get_objective_value(self) -> float:
+        """Returns the schedule's score under the Session objective.
+
+        Returns:
+            float: The sum of DishOpt.get_score over all dishes.
+        """
+        results = self.get_results().dish_results
+        return sum(
+            score_results(self.system, dish, results[dish.name]) for dish in self.dishes
+        )
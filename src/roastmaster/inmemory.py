@@ -0,0 +1,173 @@
+"""inmemory.py."""
+import numpy as np
+import pulp
+
+
+def get_constraints(model: pulp.LpProblem) -> list[pulp.LpConstraint]:
+    """Returns a pulp model's constraints, whatever the pulp version.
+
+    Args:
+        model (pulp.LpProblem): The model.
+
+    Returns:
+        list[pulp.LpConstraint]: The constraints, in the order they were added.
+    """
+    # pulp 2 holds constraints in a dict, later versions make it callable
+    constraints = model.constraints
+    return list(constraints() if callable(constraints) else constraints.values())
+
+
+class ModelArrays:
+    """A pulp model's variables, objective and constraints as arrays.
+
+    Attributes:
+        variables (list[pulp.LpVariable]): The variables, in column order.
+        c (np.ndarray): The objective coefficients, to be minimised.
+        objective_constant (float): The objective constant, to be minimised.
+        a (sparse.csr_array): The constraint matrix.
+        lb (np.ndarray): The constraint lower bounds.
+        ub (np.ndarray): The constraint upper bounds.
+        bounds (Bounds): The variable bounds.
+        integrality (np.ndarray): 1 for integer variables, 0 for continuous.
+    """
+
+    def __init__(self, model: pulp.LpProblem) -> None:
+        """Initializes a ModelArrays object.
+
+        Args:
+            model (pulp.LpProblem): The model.
+        """
+        # scipy is slow to import, so only when a model is solved
+        from scipy import sparse  # type: ignore
+        from scipy.optimize import Bounds  # type: ignore
+
+        self.variables = model.variables()
+        index = {var.name: i for i, var in enumerate(self.variables)}
+        num_vars = len(self.variables)
+
+        # milp minimises, so flip the objective of a maximisation
+        sign = -1 if model.sense == pulp.LpMaximize else 1
+        self.c = np.zeros(num_vars)
+        self.objective_constant = 0.0
+        if model.objective is not None:
+            for var, coef in model.objective.items():
+                self.c[index[var.name]] = sign * coef
+            self.objective_constant = sign * model.objective.constant
+
+        constraints = get_constraints(model)
+        rows, cols, vals = [], [], []
+        self.lb = np.full(len(constraints), -np.inf)
+        self.ub = np.full(len(constraints), np.inf)
+        for row, constraint in enumerate(constraints):
+            for var, coef in constraint.items():
+                rows.append(row)
+                cols.append(index[var.name])
+                vals.append(coef)
+            # constraints read expr + constant <sense> 0
+            if constraint.sense != pulp.LpConstraintLE:
+                self.lb[row] = -constraint.constant
+            if constraint.sense != pulp.LpConstraintGE:
+                self.ub[row] = -constraint.constant
+        self.a = sparse.csr_array(
+            (vals, (rows, cols)), shape=(len(constraints), num_vars)
+        )
+
+        self.bounds = Bounds(
+            [-np.inf if v.lowBound is None else v.lowBound for v in self.variables],
+            [np.inf if v.upBound is None else v.upBound for v in self.variables],
+        )
+        self.integrality = np.array(
+            [v.cat == pulp.LpInteger for v in self.variables], dtype=float
+        )
+
+
+class InMemoryHiGHS(pulp.LpSolver):
+    """Solves pulp models with HiGHS in-process, without files or subprocesses.
+
+    The model is passed to HiGHS through scipy.optimize.milp as sparse arrays,
+    and the solution is read back as an array. This avoids writing an MPS file,
+    starting a solver process and parsing its solution file on every solve,
+    which dominates the solve time of small models. Warm starts are not
+    supported.
+    """
+
+    name = "InMemoryHiGHS"
+
+    def __init__(
+        self,
+        mip: bool = True,
+        msg: bool = False,
+        timeLimit: float | None = None,  # noqa: N803
+        gapRel: float | None = None,  # noqa: N803
+    ) -> None:
+        """Initializes an InMemoryHiGHS object.
+
+        Args:
+            mip (bool, optional): Whether to respect integer variables. Defaults
+                to True.
+            msg (bool, optional): Whether to print the HiGHS log. Defaults to
+                False.
+            timeLimit (float | None, optional): The maximum solve time in
+                seconds. Defaults to no limit.
+            gapRel (float | None, optional): The relative MIP gap at which to
+                stop. Defaults to the HiGHS default.
+        """
+        super().__init__(mip=mip, msg=msg, timeLimit=timeLimit, gapRel=gapRel)
+
+    def available(self) -> bool:
+        """Returns whether the solver can be used.
+
+        Returns:
+            bool: Always True, since scipy is a dependency.
+        """
+        return True
+
+    def actualSolve(self, lp: pulp.LpProblem) -> int:  # noqa: N802
+        """Solves a model, setting its variables' values and status.
+
+        Args:
+            lp (pulp.LpProblem): The model.
+
+        Returns:
+            int: The pulp status.
+        """
+        from scipy.optimize import LinearConstraint  # type: ignore
+        from scipy.optimize import milp  # type: ignore
+
+        arrays = ModelArrays(lp)
+        options = {
+            "disp": bool(self.msg),
+            "time_limit": self.timeLimit,
+            "mip_rel_gap": self.optionsDict.get("gapRel"),
+        }
+        res = milp(
+            arrays.c,
+            constraints=(
+                LinearConstraint(arrays.a, arrays.lb, arrays.ub)
+                if arrays.a.shape[0]
+                else None
+            ),
+            integrality=arrays.integrality if self.mip else None,
+            bounds=arrays.bounds,
+            options={key: value for key, value in options.items() if value is not None},
+        )
+        if res.x is None:
+            status, sol_status = {
+                2: (pulp.LpStatusInfeasible, pulp.LpSolutionInfeasible),
+                3: (pulp.LpStatusUnbounded, pulp.LpSolutionUnbounded),
+            }.get(res.status, (pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound))
+        else:
+            # snap integers to exact values, as file-based solvers report them
+            values = np.where(arrays.integrality == 1, np.round(res.x), res.x)
+            lp.assignVarsVals(
+                dict(zip([var.name for var in arrays.variables], values, strict=True))
+            )
+            if res.status == 0:
+                status, sol_status = pulp.LpStatusOptimal, pulp.LpSolutionOptimal
+            else:
+                status, sol_status = (
+                    pulp.LpStatusOptimal,
+                    pulp.LpSolutionIntegerFeasible,
+                )
+        lp.assignStatus(status, sol_status)
+        return status
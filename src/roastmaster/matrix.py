@@ -0,0 +1,335 @@
+"""matrix.py."""
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.optimize import Bounds  # type: ignore
+from scipy.optimize import LinearConstraint  # type: ignore
+from scipy.optimize import milp  # type: ignore
+
+from roastmaster.dish import get_results_array
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.presolve import get_decision_windows
+from roastmaster.presolve import get_symmetric_pairs
+from roastmaster.results import Results
+
+
+if TYPE_CHECKING:
+    from roastmaster.template import ModelTemplate
+
+
+# variable blocks, each of shape (num dishes, num timesteps)
+FIELDS = ("put_in", "take_out", "is_in", "time_cooked")
+
+
+class MatrixModel:
+    """Builds the session model directly as sparse arrays.
+
+    The formulation matches Session's "state" builder: in-ness and cooking time
+    are variables linked by one constraint per dish per timestep. Rather than
+    creating pulp objects, the constraint matrix, bounds and objective are
+    assembled as dish x time blocks with NumPy and handed to the HiGHS solver
+    through scipy.optimize.milp in one call.
+
+    Attributes:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        time_range (np.ndarray): The model timesteps.
+        c (np.ndarray): The objective coefficients, to be maximised.
+        a (sparse.csr_array): The constraint matrix.
+        lb (np.ndarray): The constraint lower bounds.
+        ub (np.ndarray): The constraint upper bounds.
+        bounds (Bounds): The variable bounds.
+        integrality (np.ndarray): 1 for binary variables, 0 for continuous.
+    """
+
+    def __init__(
+        self,
+        system: System,
+        dishes: list[Dish],
+        windows: dict[str, tuple[float, float]] | None = None,
+        presolve: str | None = None,
+        symmetry_breaking: bool = False,
+        template: "ModelTemplate | None" = None,
+    ) -> None:
+        """Initializes a MatrixModel object.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            windows (dict[str, tuple[float, float]] | None, optional): For any
+                dish name, the period in which that dish may be put in and taken
+                out. Decisions outside it are fixed to 0. Defaults to None.
+            presolve (str | None, optional): One of presolve.PRESOLVE_MODES, to
+                also fix decisions that cannot be made. Defaults to None.
+            symmetry_breaking (bool, optional): Whether to order dishes with the
+                same configuration and windows, as in Session. Defaults to False.
+            template (ModelTemplate | None, optional): A template compiled for
+                this system and number of dishes, from which to fill in the
+                constraints rather than build them. Defaults to None.
+        """
+        self.system = system
+        self.dishes = dishes
+        self.windows = windows or {}
+        self.presolve = presolve
+        self.symmetry_breaking = symmetry_breaking
+        self.num_fixed_decisions = 0
+        self.time_range = system.get_time_range()
+        self.solution: np.ndarray | None = None
+        self.objective_value: float | None = None
+
+        num_dishes, num_times = len(dishes), len(self.time_range)
+        self.shape = (num_dishes, num_times)
+        self.num_vars = len(FIELDS) * num_dishes * num_times
+
+        size = np.array([dish.size for dish in dishes], dtype=float)
+        cooking_time = np.array(
+            [dish.get_cooking_time_range() for dish in dishes], float
+        ).reshape(num_dishes, 2)
+        serve_hot_weight = np.array([dish.serve_hot_weight for dish in dishes], float)
+
+        if template is None:
+            self.a, self.lb, self.ub = self._build_constraints(size)
+        else:
+            self.a, self.lb, self.ub = template.fill(system, size)
+        if symmetry_breaking:
+            a, lb, ub = self._build_symmetry_constraints()
+            self.a = sparse.vstack([self.a, a], format="csr")
+            self.lb = np.concatenate([self.lb, lb])
+            self.ub = np.concatenate([self.ub, ub])
+        self.bounds = self._build_bounds(cooking_time)
+        self.c = self._build_objective(serve_hot_weight)
+        self.integrality = np.zeros(self.num_vars)
+        self.integrality[self._index("put_in").ravel()] = 1
+        self.integrality[self._index("take_out").ravel()] = 1
+
+    def _index(self, field: str) -> np.ndarray:
+        """Returns the variable indices for a field.
+
+        Args:
+            field (str): One of FIELDS.
+
+        Returns:
+            np.ndarray: The (num dishes, num timesteps) array of variable indices.
+        """
+        block = int(np.prod(self.shape))
+        start = FIELDS.index(field) * block
+        return np.arange(start, start + block).reshape(self.shape)
+
+    def _build_constraints(
+        self, size: np.ndarray
+    ) -> tuple[sparse.csr_array, np.ndarray, np.ndarray]:
+        """Assembles the constraint matrix and its bounds.
+
+        Args:
+            size (np.ndarray): The size of each dish.
+
+        Returns:
+            tuple[sparse.csr_array, np.ndarray, np.ndarray]: The constraint
+                matrix and its lower and upper bounds.
+        """
+        dt = self.system.time_increment
+        warm_up = self.system.oven.warm_up_time
+        put_in, take_out = self._index("put_in"), self._index("take_out")
+        is_in, cooked = self._index("is_in"), self._index("time_cooked")
+        # previous timestep's variables, which are zero before the first timestep
+        prev_is_in, prev_cooked = is_in[:, :-1], cooked[:, :-1]
+        block = put_in.size
+
+        rows: list[np.ndarray] = []
+        cols: list[np.ndarray] = []
+        vals: list[np.ndarray] = []
+        lb: list[np.ndarray] = []
+        ub: list[np.ndarray] = []
+        num_rows = 0
+
+        def add_block(terms: list[tuple[np.ndarray, float | np.ndarray]]) -> None:
+            """Adds one row per entry of the index arrays.
+
+            Args:
+                terms (list[tuple[np.ndarray, float | np.ndarray]]): Pairs of
+                    variable indices and coefficients. Index arrays are aligned
+                    to the last timesteps of the block.
+            """
+            for idx, coeff in terms:
+                first = self.shape[1] - idx.shape[1]
+                row_idx = np.arange(block).reshape(self.shape)[:, first:]
+                rows.append((num_rows + row_idx).ravel())
+                cols.append(idx.ravel())
+                vals.append(np.broadcast_to(coeff, idx.shape).ravel())
+
+        # in-ness = last in-ness + put in - take out
+        add_block([(is_in, 1), (prev_is_in, -1), (put_in, -1), (take_out, 1)])
+        lb.append(np.zeros(block))
+        ub.append(np.zeros(block))
+        num_rows += block
+        # time cooked = last time cooked + in-ness * dt - put in * warm up
+        add_block([(cooked, 1), (prev_cooked, -1), (is_in, -dt), (put_in, warm_up)])
+        lb.append(np.zeros(block))
+        ub.append(np.zeros(block))
+        num_rows += block
+        # cannot put in if already in
+        add_block([(put_in, 1), (prev_is_in, 1)])
+        lb.append(np.full(block, -np.inf))
+        ub.append(np.ones(block))
+        num_rows += block
+        # cannot take out if not in
+        add_block([(take_out, 1), (prev_is_in, -1)])
+        lb.append(np.full(block, -np.inf))
+        ub.append(np.zeros(block))
+        num_rows += block
+
+        # total oven space constraint, one row per timestep
+        num_times = self.shape[1]
+        rows.append(num_rows + np.tile(np.arange(num_times), self.shape[0]))
+        cols.append(is_in.ravel())
+        vals.append(np.repeat(size, num_times))
+        lb.append(np.full(num_times, -np.inf))
+        ub.append(np.full(num_times, self.system.oven.num_shelves, dtype=float))
+        num_rows += num_times
+
+        a = sparse.csr_array(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(num_rows, self.num_vars),
+        )
+        return a, np.concatenate(lb), np.concatenate(ub)
+
+    def _build_symmetry_constraints(
+        self,
+    ) -> tuple[sparse.csr_array, np.ndarray, np.ndarray]:
+        """Assembles the rows ordering identical dishes, one row per pair.
+
+        As in Session, identical dishes are ordered by whether they are in the
+        oven at the last timestep before serving, then by their put-in times.
+
+        Returns:
+            tuple[sparse.csr_array, np.ndarray, np.ndarray]: The constraint rows
+                and their lower and upper bounds.
+        """
+        put_in, is_in = self._index("put_in"), self._index("is_in")
+        pairs = np.array(
+            get_symmetric_pairs(self.dishes, self.windows), dtype=int
+        ).reshape(-1, 2)
+        num_pairs, num_times = len(pairs), self.shape[1]
+        out_weight = num_times * (num_times + 1) // 2 + 1
+        # the first dish's key less the second's, see Session._get_ordering_key
+        cols = np.hstack([is_in[pairs, -2], put_in[pairs[:, 0]], put_in[pairs[:, 1]]])
+        time_weights = np.arange(1, num_times + 1)
+        vals = np.hstack([[-out_weight, out_weight], time_weights, -time_weights])
+        a = sparse.csr_array(
+            (
+                np.tile(vals, num_pairs),
+                (np.repeat(np.arange(num_pairs), cols.shape[1]), cols.ravel()),
+            ),
+            shape=(num_pairs, self.num_vars),
+        )
+        return a, np.full(num_pairs, -np.inf), np.zeros(num_pairs)
+
+    def _build_bounds(self, cooking_time: np.ndarray) -> Bounds:
+        """Assembles the variable bounds.
+
+        The final in-ness and cooking time constraints are expressed as bounds.
+
+        Args:
+            cooking_time (np.ndarray): The (dishes, 2) least and most time each
+                dish may be cooked for.
+
+        Returns:
+            Bounds: The variable bounds.
+        """
+        lower = np.zeros(self.num_vars)
+        upper = np.ones(self.num_vars)
+        cooked = self._index("time_cooked")
+        lower[cooked.ravel()] = -np.inf
+        upper[cooked.ravel()] = np.inf
+        # cooking time constraint -- total cooking time within the tolerance
+        lower[cooked[:, -1]] = cooking_time[:, 0]
+        upper[cooked[:, -1]] = cooking_time[:, 1]
+        # everything is out of the oven at the end
+        upper[self._index("is_in")[:, -1]] = 0
+        # no decisions outside each dish's windows
+        for i, dish in enumerate(self.dishes):
+            windows = get_decision_windows(
+                self.system, dish, self.windows.get(dish.name), self.presolve
+            )
+            for field, window in zip(("put_in", "take_out"), windows, strict=True):
+                if window is not None:
+                    outside = (self.time_range < window[0] - 1e-9) | (
+                        self.time_range > window[1] + 1e-9
+                    )
+                    upper[self._index(field)[i, outside]] = 0
+                    self.num_fixed_decisions += int(outside.sum())
+        return Bounds(lower, upper)
+
+    def _build_objective(self, serve_hot_weight: np.ndarray) -> np.ndarray:
+        """Assembles the objective coefficients, as in DishOpt.get_score.
+
+        Args:
+            serve_hot_weight (np.ndarray): The serve hot weight of each dish.
+
+        Returns:
+            np.ndarray: The objective coefficients.
+        """
+        c = np.zeros(self.num_vars)
+        is_in = self._index("is_in")
+        # reward hot food
+        for steps_before_end, weight in ((1, 3), (2, 2), (3, 1)):
+            time_idx = self.shape[1] - 1 - steps_before_end
+            if time_idx >= 0:
+                c[is_in[:, time_idx]] += weight * serve_hot_weight
+        # penalise oven openings
+        penalty = self.system.oven.oven_opening_penalty
+        c[self._index("put_in").ravel()] -= penalty
+        c[self._index("take_out").ravel()] -= penalty
+        return c
+
+    def solve(
+        self, time_limit: float | None = None, gap_rel: float | None = None
+    ) -> str:
+        """Solves the model.
+
+        Args:
+            time_limit (float | None, optional): The maximum solve time in seconds.
+                Defaults to no limit.
+            gap_rel (float | None, optional): The relative MIP gap at which to stop.
+                Defaults to the HiGHS default.
+
+        Returns:
+            str: The solution status, one of "optimal", "feasible", "infeasible",
+                "unbounded" or "not_solved".
+        """
+        options = {"time_limit": time_limit, "mip_rel_gap": gap_rel}
+        res = milp(
+            -self.c,  # milp minimises
+            constraints=LinearConstraint(self.a, self.lb, self.ub),
+            integrality=self.integrality,
+            bounds=self.bounds,
+            options={key: value for key, value in options.items() if value is not None},
+        )
+        if res.x is None:
+            return {2: "infeasible", 3: "unbounded"}.get(res.status, "not_solved")
+        self.solution = res.x
+        self.objective_value = -res.fun
+        return "optimal" if res.status == 0 else "feasible"
+
+    def get_results(self) -> Results:
+        """Returns the results of the model.
+
+        Returns:
+            Results: The per-dish results.
+
+        Raises:
+            SolverError: If the model has no solution.
+        """
+        if self.solution is None:
+            raise SolverError("The model has no solution.")
+        # clipped first, so that HiGHS values such as -1e-12 do not round to -0.0
+        put_in = np.round(np.clip(self.solution[self._index("put_in")], 0, 1))
+        take_out = np.round(np.clip(self.solution[self._index("take_out")], 0, 1))
+        return Results.from_array(
+            get_results_array(self.system, self.dishes, put_in, take_out),
+            [dish.name for dish in self.dishes],
+            self.time_range,
+        )
@@ -12,6 +12,8 @@ class Dish(BaseModel):
     Attributes:
         name (str): The name of the dish.
         cooking_time_mins (int): The cooking time of the dish in minutes.
+        cooking_time_tolerance_mins (int, optional): How many minutes the dish
+            may be cooked for more or less than its cooking time. Defaults to 0.
         resting_time_mins (int, optional): The resting time of the dish in minutes.
             Defaults to 0.
         size (float, optional): The size of the dish. Defaults to 0.5.
@@ -21,10 +23,23 @@ class Dish(BaseModel):
 
     name: str
     cooking_time_mins: int
+    cooking_time_tolerance_mins: int = 0
     resting_time_mins: int = 0
     size: float = 0.5
     serve_hot_weight: float = 1
 
+    def get_cooking_time_range(self) -> tuple[float, float]:
+        """Returns the least and most time the dish may be cooked for.
+
+        Returns:
+            tuple[float, float]: The cooking time less and plus the tolerance,
+                in minutes, and at least 0.
+        """
+        return (
+            max(self.cooking_time_mins - self.cooking_time_tolerance_mins, 0),
+            self.cooking_time_mins + self.cooking_time_tolerance_mins,
+        )
+
     @classmethod
     def get_preset(cls, name: str):
         """Get a preset dish configuration by name.
@@ -0,0 +1,121 @@
+"""multires.py."""
+import math
+from typing import Any
+
+import numpy as np
+
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.session import Session
+
+
+def get_coarse_dish(dish: Dish, system: System, coarse_increment: float) -> Dish:
+    """Rounds a dish's cooking time so that it can be met on a coarse grid.
+
+    A dish put in once spends its cooking time plus the oven warm-up time in the
+    oven, which must be a whole number of coarse timesteps.
+
+    Args:
+        dish (Dish): The dish configuration.
+        system (System): The system configuration.
+        coarse_increment (float): The coarse time increment.
+
+    Returns:
+        Dish: The dish with its cooking time rounded to the coarse grid.
+    """
+    warm_up = system.oven.warm_up_time
+    num_steps = max(
+        round((dish.cooking_time_mins + warm_up) / coarse_increment),
+        math.floor(warm_up / coarse_increment) + 1,
+    )
+    return dish.model_copy(
+        update={"cooking_time_mins": num_steps * coarse_increment - warm_up}
+    )
+
+
+def get_windows(
+    session: Session, band: float, total_time: float
+) -> dict[str, tuple[float, float]]:
+    """Returns a window around each dish's time in the oven in a solved session.
+
+    Args:
+        session (Session): The solved session.
+        band (float): The margin either side of the dish's time in the oven.
+        total_time (float): The end of the fine time grid.
+
+    Returns:
+        dict[str, tuple[float, float]]: The window for each dish.
+    """
+    windows = {}
+    for name, df in session.get_results().dish_results.items():
+        moves = df.index[(df["put_in"] > 0.5) | (df["take_out"] > 0.5)]
+        windows[name] = (
+            max(0, moves.min() - band),
+            min(total_time, moves.max() + band),
+        )
+    return windows
+
+
+def solve_coarse_to_fine(
+    system: System,
+    dishes: list[Dish],
+    coarse_increment: float = 15,
+    band: float | None = None,
+    builder: str = "state",
+    **solve_kwargs: Any,
+) -> Session:
+    """Solves on a coarse time grid, then at the requested increment near it.
+
+    The coarse solve rounds each dish's cooking time to the coarse grid. The
+    fine solve then only models each dish's decisions within a band around its
+    time in the oven in the coarse solution, so it is much smaller than the full
+    fine model. If either solve fails, the full fine model is solved instead.
+
+    Args:
+        system (System): The system configuration, with the fine time increment.
+        dishes (list[Dish]): The dish configurations.
+        coarse_increment (float, optional): The coarse time increment, a multiple
+            of the fine increment that divides the total time. Defaults to 15.
+        band (float | None, optional): The margin either side of each dish's
+            coarse time in the oven. Defaults to coarse_increment.
+        builder (str, optional): The Session builder. Defaults to "state".
+        **solve_kwargs (Any): Keyword arguments for Session.solve.
+
+    Returns:
+        Session: The solved fine session. Its windows attribute is empty if the
+            full fine model was solved.
+
+    Raises:
+        ValueError: If the coarse increment does not fit the fine grid.
+    """
+    steps = coarse_increment / system.time_increment
+    if not (
+        np.isclose(steps, round(steps))
+        and np.isclose(system.total_time % coarse_increment, 0)
+    ):
+        raise ValueError(
+            f"A coarse increment of {coarse_increment} must be a multiple of "
+            f"{system.time_increment} and divide {system.total_time}."
+        )
+    band = coarse_increment if band is None else band
+
+    coarse_system = system.model_copy(update={"time_increment": coarse_increment})
+    try:
+        coarse = Session(
+            coarse_system,
+            [get_coarse_dish(dish, system, coarse_increment) for dish in dishes],
+            builder=builder,
+        )
+        coarse.solve(**solve_kwargs)
+        fine = Session(
+            system,
+            dishes,
+            builder=builder,
+            windows=get_windows(coarse, band, system.total_time),
+        )
+        fine.solve(**solve_kwargs)
+    except SolverError:
+        fine = Session(system, dishes, builder=builder)
+        fine.solve(**solve_kwargs)
+    return fine
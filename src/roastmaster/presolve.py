@@ -0,0 +1,239 @@
+"""presolve.py."""
+from collections.abc import Mapping
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from roastmaster.models import Dish
+from roastmaster.models import System
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+Window = tuple[float, float]
+
+# "safe" keeps every feasible schedule, "single_spell" assumes each dish is put
+# in once, which removes far more variables but excludes reheating a dish
+PRESOLVE_MODES = ("safe", "single_spell")
+
+
+def _get_window(times: np.ndarray, possible: np.ndarray) -> Window:
+    """Returns the period spanning the possible times.
+
+    Args:
+        times (np.ndarray): The timesteps.
+        possible (np.ndarray): Whether a decision is possible at each timestep.
+
+    Returns:
+        Window: The first and last possible times, or an empty period.
+    """
+    if not possible.any():
+        return (np.inf, -np.inf)
+    return (float(times[possible][0]), float(times[possible][-1]))
+
+
+def get_put_in_window(system: System, dish: Dish, single_spell: bool = False) -> Window:
+    """Returns the period in which a dish could be put in.
+
+    A dish put in at time t can cook for at most the rest of the session, less
+    the warm-up time, plus whatever it cooked in one earlier spell ending
+    before t. It cannot be put in at the last timestep, since it must be out by
+    then. Put-ins that cannot reach the least cooking time within the dish's
+    tolerance are impossible.
+
+    Args:
+        system (System): The system configuration.
+        dish (Dish): The dish configuration.
+        single_spell (bool, optional): Whether to assume the dish is put in only
+            once, so there is no earlier spell. Defaults to False.
+
+    Returns:
+        Window: The earliest and latest possible put-in times.
+    """
+    times = system.get_time_range()
+    end, step = system.total_time, system.time_increment
+    warm_up = system.oven.warm_up_time
+    most_cooked = end - times - warm_up
+    if not single_spell:
+        most_cooked += np.maximum(0, times - step - warm_up)
+    possible = (times <= end - step + 1e-9) & (
+        most_cooked >= dish.get_cooking_time_range()[0] - 1e-9
+    )
+    return _get_window(times, possible)
+
+
+def get_take_out_window(
+    system: System, dish: Dish, single_spell: bool = False
+) -> Window:
+    """Returns the period in which a dish could be taken out.
+
+    A dish taken out at time t can have cooked for at most the time until then,
+    less the warm-up time, plus whatever it cooks in one later spell starting
+    after t. It cannot be taken out at the first timestep, since it cannot be
+    in before then.
+
+    Args:
+        system (System): The system configuration.
+        dish (Dish): The dish configuration.
+        single_spell (bool, optional): Whether to assume the dish is put in only
+            once, so there is no later spell. Defaults to False.
+
+    Returns:
+        Window: The earliest and latest possible take-out times.
+    """
+    times = system.get_time_range()
+    end, step = system.total_time, system.time_increment
+    warm_up = system.oven.warm_up_time
+    most_cooked = times - warm_up
+    if not single_spell:
+        most_cooked += np.maximum(0, end - times - step - warm_up)
+    possible = (times >= step - 1e-9) & (
+        most_cooked >= dish.get_cooking_time_range()[0] - 1e-9
+    )
+    return _get_window(times, possible)
+
+
+def intersect_windows(window: Window | None, other: Window | None) -> Window | None:
+    """Returns the overlap of two periods, either of which may be unrestricted.
+
+    Args:
+        window (Window | None): A period, or None for any time.
+        other (Window | None): Another period, or None for any time.
+
+    Returns:
+        Window | None: The overlap, or None for any time.
+    """
+    if window is None:
+        return other
+    if other is None:
+        return window
+    return (max(window[0], other[0]), min(window[1], other[1]))
+
+
+def get_decision_windows(
+    system: System, dish: Dish, window: Window | None = None, mode: str | None = None
+) -> tuple[Window | None, Window | None]:
+    """Returns the periods in which a dish may be put in and taken out.
+
+    Args:
+        system (System): The system configuration.
+        dish (Dish): The dish configuration.
+        window (Window | None, optional): A period to which both decisions are
+            restricted. Defaults to any time.
+        mode (str | None, optional): One of PRESOLVE_MODES, to also restrict the
+            decisions to the times at which they are possible. Defaults to no
+            presolve.
+
+    Returns:
+        tuple[Window | None, Window | None]: The put-in and take-out windows, or
+            None for any time.
+    """
+    if mode is None:
+        return window, window
+    single_spell = mode == "single_spell"
+    return (
+        intersect_windows(window, get_put_in_window(system, dish, single_spell)),
+        intersect_windows(window, get_take_out_window(system, dish, single_spell)),
+    )
+
+
+def get_symmetric_groups(
+    dishes: list[Dish], windows: dict[str, Window] | None = None
+) -> list[list[int]]:
+    """Returns groups of interchangeable dishes, to be ordered in the model.
+
+    Dishes are interchangeable if all their fields but the name, and their
+    windows, are the same. Swapping their schedules gives another solution with
+    the same objective, so ordering them, e.g. by their put-in times, removes
+    equivalent branches without changing the optimum.
+
+    Args:
+        dishes (list[Dish]): The dish configurations.
+        windows (dict[str, Window] | None, optional): The period in which each
+            dish may be put in and taken out, if restricted. Defaults to None.
+
+    Returns:
+        list[list[int]]: The indices of each group of two or more
+            interchangeable dishes, in order.
+    """
+    windows = windows or {}
+    groups: dict[str, list[int]] = {}
+    for i, dish in enumerate(dishes):
+        key = repr((dish.model_dump(exclude={"name"}), windows.get(dish.name)))
+        groups.setdefault(key, []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def get_symmetric_pairs(
+    dishes: list[Dish], windows: dict[str, Window] | None = None
+) -> list[tuple[int, int]]:
+    """Returns each interchangeable dish and the next one like it.
+
+    Args:
+        dishes (list[Dish]): The dish configurations.
+        windows (dict[str, Window] | None, optional): The period in which each
+            dish may be put in and taken out, if restricted. Defaults to None.
+
+    Returns:
+        list[tuple[int, int]]: The pairs of indices, see get_symmetric_groups.
+    """
+    return [
+        pair
+        for group in get_symmetric_groups(dishes, windows)
+        for pair in pairwise(group)
+    ]
+
+
+def _get_ordering_key(
+    results: "pd.DataFrame", put_in_only: bool = False
+) -> tuple[float, float]:
+    """Returns the key by which Session orders identical dishes.
+
+    Args:
+        results (pd.DataFrame): The dish's results.
+        put_in_only (bool, optional): Whether to order by put-in times alone.
+            Defaults to False.
+
+    Returns:
+        tuple[float, float]: Whether the dish is out of the oven at the last
+            timestep before serving, or 0 if put_in_only, then the sum of the
+            indices of the timesteps at which it is put in, counting from 1.
+    """
+    put_in = results["put_in"].to_numpy()
+    is_out = 0 if put_in_only else 1 - results["is_in"].iloc[-2]
+    return is_out, float(put_in @ np.arange(1, len(put_in) + 1))
+
+
+def order_symmetric_results(
+    dishes: list[Dish],
+    results: "Mapping[str, pd.DataFrame]",
+    windows: dict[str, Window] | None = None,
+    put_in_only: bool = False,
+) -> "dict[str, pd.DataFrame]":
+    """Reassigns interchangeable dishes' schedules to respect Session's ordering.
+
+    Args:
+        dishes (list[Dish]): The dish configurations.
+        results (Mapping[str, pd.DataFrame]): The results of each dish, as in
+            Results.dish_results.
+        windows (dict[str, Window] | None, optional): The period in which each
+            dish may be put in and taken out, if restricted. Defaults to None.
+        put_in_only (bool, optional): Whether to order by put-in times alone, as
+            the "event" builder does. Defaults to False.
+
+    Returns:
+        dict[str, pd.DataFrame]: The results, with the schedules in each group of
+            interchangeable dishes in the order Session requires.
+    """
+    results = dict(results)
+    for group in get_symmetric_groups(dishes, windows):
+        names = [dishes[i].name for i in group]
+        schedules = sorted(
+            (results[name] for name in names),
+            key=lambda df: _get_ordering_key(df, put_in_only),
+        )
+        results.update(zip(names, schedules, strict=True))
+    return results
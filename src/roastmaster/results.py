@@ -1,25 +1,218 @@
 """results.py."""
 import random
+from collections.abc import Iterator
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# results fields, in the order of the last axis of Results.values
+FIELDS = ("is_in", "put_in", "take_out", "time_cooked", "space_used")
+
+
+class DishResults(Mapping):
+    """A read-only view of Results as one DataFrame per dish.
+
+    Each dish's DataFrame is only built the first time it is looked up.
+    """
+
+    def __init__(self, results: "Results") -> None:
+        """Initializes a DishResults object.
+
+        Args:
+            results (Results): The results to view.
+        """
+        self._results = results
+
+    def __getitem__(self, name: str) -> "pd.DataFrame":
+        """Returns a dish's results.
+
+        Args:
+            name (str): The dish name.
+
+        Returns:
+            pd.DataFrame: The dish's results, indexed by time.
+        """
+        return self._results._get_frame(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the dish names.
+
+        Returns:
+            Iterator[str]: The dish names.
+        """
+        return iter(self._results.names)
+
+    def __len__(self) -> int:
+        """Returns the number of dishes.
+
+        Returns:
+            int: The number of dishes.
+        """
+        return len(self._results.names)
 
 
 class Results:
     """Represents the results of an optimisation session.
 
+    The results are held as a dish x time x field array. Per-dish DataFrames and
+    aggregates are built from it on demand.
+
     Attributes:
-        dish_results (dict[str, pd.DataFrame]): The per-dish results dataframes.
+        names (list[str]): The dish names, in the order of the first axis of
+            values.
     """
 
-    def __init__(self, dish_results: dict[str, pd.DataFrame]) -> None:
+    def __init__(self, dish_results: "dict[str, pd.DataFrame] | None" = None) -> None:
         """Initializes a Results object.
 
         Args:
-            dish_results (dict[str, pd.DataFrame]): The per-dish results dataframes.
+            dish_results (dict[str, pd.DataFrame] | None, optional): The per-dish
+                results dataframes, with a column for each of FIELDS. Defaults to
+                no dishes.
+        """
+        self._frames = dict(dish_results or {})
+        self.names = list(self._frames)
+        self._values: np.ndarray | None = None
+        self._time_range: np.ndarray | None = None
+
+    @classmethod
+    def from_array(
+        cls, values: np.ndarray, names: list[str], time_range: np.ndarray
+    ) -> "Results":
+        """Creates a Results object from a dish x time x field array.
+
+        Args:
+            values (np.ndarray): The results, with FIELDS along the last axis.
+            names (list[str]): The dish names, along the first axis.
+            time_range (np.ndarray): The timesteps, along the second axis.
+
+        Returns:
+            Results: The results.
         """
-        self.dish_results = dish_results
+        results = cls()
+        results.names = list(names)
+        results._values = values
+        results._time_range = np.asarray(time_range)
+        return results
 
-    def get_aggregated_results(self) -> pd.DataFrame:
+    def copy(self) -> "Results":
+        """Returns a copy that can be edited without changing these results.
+
+        Returns:
+            Results: The copy.
+        """
+        return Results.from_array(
+            self.values.copy(), self.names, self.time_range.copy()
+        )
+
+    @property
+    def values(self) -> np.ndarray:
+        """The dish x time x field results array.
+
+        Returns:
+            np.ndarray: The results, with FIELDS along the last axis.
+        """
+        if self._values is None:
+            self._values = (
+                np.stack(
+                    [
+                        self._frames[name][list(FIELDS)].to_numpy(dtype=float)
+                        for name in self.names
+                    ]
+                )
+                if self.names
+                else np.zeros((0, 0, len(FIELDS)))
+            )
+        return self._values
+
+    @property
+    def time_range(self) -> np.ndarray:
+        """The timesteps.
+
+        Returns:
+            np.ndarray: The timesteps, along the second axis of values.
+        """
+        if self._time_range is None:
+            self._time_range = (
+                self._frames[self.names[0]].index.to_numpy()
+                if self.names
+                else np.zeros(0)
+            )
+        return self._time_range
+
+    @property
+    def dish_results(self) -> DishResults:
+        """The per-dish results dataframes.
+
+        Returns:
+            DishResults: A mapping from dish name to its results, indexed by time.
+        """
+        return DishResults(self)
+
+    def _get_frame(self, name: str) -> "pd.DataFrame":
+        """Returns a dish's results, building them if needed.
+
+        Args:
+            name (str): The dish name.
+
+        Returns:
+            pd.DataFrame: The dish's results, indexed by time.
+        """
+        if name not in self._frames:
+            # pandas is slow to import, so only when a DataFrame is needed
+            import pandas as pd
+
+            values = self.values[self.names.index(name)]
+            self._frames[name] = pd.DataFrame(
+                values, index=self.time_range, columns=list(FIELDS)
+            )
+        return self._frames[name]
+
+    def to_dict(self) -> dict[str, dict[str, list[float]]]:
+        """Returns the results as a JSON-serialisable dict.
+
+        Returns:
+            dict[str, dict[str, list[float]]]: Each dish's results columns,
+                including the "time" index.
+        """
+        time_range = self.time_range.tolist()
+        return {
+            name: {
+                "time": time_range,
+                **{
+                    field: self.values[i, :, j].tolist()
+                    for j, field in enumerate(FIELDS)
+                },
+            }
+            for i, name in enumerate(self.names)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, list[float]]]) -> "Results":
+        """Creates a Results object from the output of to_dict.
+
+        Args:
+            data (dict[str, dict[str, list[float]]]): Each dish's results columns,
+                including the "time" index.
+
+        Returns:
+            Results: The results.
+        """
+        if not data:
+            return cls()
+        names = list(data)
+        values = np.array(
+            [[data[name][field] for field in FIELDS] for name in names], dtype=float
+        ).transpose(0, 2, 1)
+        return cls.from_array(values, names, np.array(data[names[0]]["time"]))
+
+    def get_aggregated_results(self) -> "pd.DataFrame":
         """Returns the system-wide aggregate results by dish.
 
         Returns a pd.DataFrame indexed by time and giving system-wide sums of
@@ -28,18 +221,27 @@ class Results:
         Returns:
             pd.DataFrame: The system-wide aggregated results for visualisation.
         """
-        return sum((df for dish, df in self.dish_results.items()), pd.DataFrame())
+        import pandas as pd
+
+        if not self.names:
+            return pd.DataFrame()
+        return pd.DataFrame(
+            self.values.sum(axis=0), index=self.time_range, columns=list(FIELDS)
+        )
 
     def print_instructions(self) -> None:
         """Prints instructions for cooking the dishes based on the optimiser results."""
-        res = self.dish_results
-        put_in = pd.DataFrame({name: res[name]["put_in"] for name in res})
-        take_out = pd.DataFrame({name: res[name]["take_out"] for name in res})
-
-        for time in put_in.index:
-            items_going_in = put_in.loc[time][put_in.loc[time] == 1].index
-            items_coming_out = take_out.loc[time][take_out.loc[time] == 1].index
-            if items_going_in.empty and items_coming_out.empty:
+        put_in = self.values[:, :, FIELDS.index("put_in")]
+        take_out = self.values[:, :, FIELDS.index("take_out")]
+
+        for k, time in enumerate(self.time_range):
+            items_going_in = [
+                name for i, name in enumerate(self.names) if put_in[i, k] == 1
+            ]
+            items_coming_out = [
+                name for i, name in enumerate(self.names) if take_out[i, k] == 1
+            ]
+            if not items_going_in and not items_coming_out:
                 continue
             action_string = f"{time} minutes: "
             action_string += " ".join(
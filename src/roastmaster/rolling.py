@@ -0,0 +1,361 @@
+"""rolling.py."""
+import time
+from typing import Any
+
+import numpy as np
+import pulp
+
+from roastmaster.checks import check_feasibility
+from roastmaster.dish import DishOpt
+from roastmaster.dish import get_results_array
+from roastmaster.dish import score_results
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.results import FIELDS
+from roastmaster.results import Results
+from roastmaster.session import Session
+from roastmaster.session import get_solver
+from roastmaster.session import get_status
+
+
+class RollingHorizon:
+    """Solves a long session as a sequence of overlapping time windows.
+
+    Each window models the timesteps from its start to the end of the window
+    plus the overlap, starting from the dishes' state left by the earlier
+    windows. Only the decisions before the overlap are kept, and the next window
+    starts from there. Every window but the last requires that each dish can
+    still be cooked by the total time, and that the dishes' remaining cooking
+    fits in the oven's remaining shelf-minutes. Only the last window sees the
+    serve hot reward, so earlier windows put dishes in as late as these allow.
+
+    Since each window is about the same size, the time and memory to solve grow
+    linearly with the total time. If a window has no solution, it is merged
+    with the window before it.
+
+    Attributes:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        window (float): The minutes of decisions kept from each window.
+        overlap (float): The further minutes modelled in each window.
+        builder (str): The Session builder for each window, "expression" or
+            "state".
+        status (str): The solution status, "feasible" once solved, since the
+            schedule is not proven optimal.
+        num_backtracks (int): The number of times a window had no solution, so
+            that it was solved together with the window before it.
+        window_stats (list[dict[str, float]]): The start, end, solve time and
+            model size of each window solved.
+    """
+
+    def __init__(
+        self,
+        system: System,
+        dishes: list[Dish],
+        window: float = 60,
+        overlap: float = 60,
+        builder: str = "state",
+    ) -> None:
+        """Initializes a RollingHorizon object.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            window (float, optional): The minutes of decisions kept from each
+                window. Defaults to 60.
+            overlap (float, optional): The further minutes modelled in each
+                window, so that its decisions allow for what follows. Defaults
+                to 60.
+            builder (str, optional): The Session builder for each window,
+                "expression" or "state". Defaults to "state".
+
+        Raises:
+            ValueError: If the window or overlap is not a whole number of
+                timesteps, or the builder is not supported.
+        """
+        step = system.time_increment
+        for name, minutes, least in (("window", window, 1), ("overlap", overlap, 0)):
+            if not (minutes / step >= least and np.isclose(minutes % step, 0)):
+                raise ValueError(
+                    f"The {name} of {minutes} minutes must be a whole number of "
+                    f"{step} minute timesteps."
+                )
+        if builder not in ("expression", "state"):
+            raise ValueError(
+                f"Rolling horizons do not support the {builder!r} builder."
+            )
+        check_feasibility(system, dishes)
+        self.system = system
+        self.dishes = dishes
+        self.window = window
+        self.overlap = overlap
+        self.builder = builder
+        self.status = "not_solved"
+        self.num_backtracks = 0
+        self.window_stats: list[dict[str, float]] = []
+        self.time_range = system.get_time_range()
+        shape = (len(dishes), len(self.time_range))
+        self._put_in = np.zeros(shape)
+        self._take_out = np.zeros(shape)
+
+    def _get_state(self, index: int) -> np.ndarray:
+        """Returns each dish's in-ness and time cooked before a timestep.
+
+        Args:
+            index (int): The timestep index.
+
+        Returns:
+            np.ndarray: The (dishes, 2) in-ness and time cooked, from the
+                decisions kept so far.
+        """
+        if index == 0:
+            return np.zeros((len(self.dishes), 2))
+        values = get_results_array(
+            self.system, self.dishes, self._put_in[:, :index], self._take_out[:, :index]
+        )
+        return values[:, -1, [FIELDS.index("is_in"), FIELDS.index("time_cooked")]]
+
+    def _add_lookahead(self, model: pulp.LpProblem, dishes: list[DishOpt]) -> None:
+        """Requires the dishes to be cookable after a window that ends early.
+
+        A dish that is not yet cooked must be in the oven from the next timestep
+        for its remaining cooking time, plus the warm-up time if it is out, and
+        out by the total time. So for each later time u, whatever does not fit
+        between u and the total time must be cooked before u, and the dishes'
+        shelf-minutes before u must fit in the oven. None of this rules out any
+        feasible schedule.
+
+        Args:
+            model (pulp.LpProblem): The window model.
+            dishes (list[DishOpt]): The window's dishes.
+        """
+        step = self.system.time_increment
+        warm_up = self.system.oven.warm_up_time
+        end = dishes[0].time_range[-1]
+        last = self.system.total_time - step
+        # check every window's length ahead, and the end
+        checkpoints = [*np.arange(end + self.window, last, self.window), last]
+        demand: dict[float, list[pulp.LpAffineExpression]] = {
+            u: [] for u in checkpoints
+        }
+        for dish in dishes:
+            # the least time within the tolerance, so as not to rule anything out
+            cooking_time = dish.dish_config.get_cooking_time_range()[0]
+            # only 1 if the dish is already cooked
+            done = pulp.LpVariable(f"{dish.name}_done_{end}", cat="Binary")
+            model += dish.time_cooked[end] >= cooking_time * done
+            needed = (
+                cooking_time
+                - dish.time_cooked[end]
+                + warm_up * (1 - dish.is_in[end] - done)
+            )
+            model += needed <= last - end
+            for u in checkpoints[:-1]:
+                before_u = pulp.LpVariable(f"{dish.name}_before_{u}", lowBound=0)
+                model += before_u >= needed - (last - u)
+                demand[u].append(dish.dish_config.size * before_u)
+            demand[last].append(dish.dish_config.size * needed)
+        for u, shelf_minutes in demand.items():
+            model += pulp.lpSum(shelf_minutes) <= self.system.oven.num_shelves * (
+                u - end
+            )
+
+    def _solve_window(
+        self, start_index: int, end_index: int, solver: pulp.LpSolver
+    ) -> None:
+        """Solves one window and keeps its decisions up to the next window.
+
+        Args:
+            start_index (int): The index of the window's first timestep.
+            end_index (int): The index of the window's last timestep.
+            solver (pulp.LpSolver): The configured solver.
+
+        Raises:
+            SolverError: If the window has no solution.
+        """
+        start, end = self.time_range[start_index], self.time_range[end_index]
+        state = self._get_state(start_index)
+        model = pulp.LpProblem("ROAST", pulp.LpMaximize)
+        dishes = [
+            DishOpt(
+                model,
+                self.system,
+                dish,
+                explicit_state=self.builder == "state",
+                start=start,
+                end=end,
+                initial_state=(state[i, 0], state[i, 1]),
+            )
+            for i, dish in enumerate(self.dishes)
+        ]
+        for t in dishes[0].time_range:
+            space_used = pulp.lpSum(dish.space_used[t] for dish in dishes)
+            model += space_used <= self.system.oven.num_shelves
+        score = pulp.lpSum(dish.get_score() for dish in dishes)
+        is_last = end_index == len(self.time_range) - 1
+        if not is_last:
+            self._add_lookahead(model, dishes)
+            # break ties towards cooking later, so dishes are hot when served,
+            # by less in total than an oven opening costs
+            tie_break = 0.1 / (len(dishes) * len(self.time_range))
+            score -= tie_break * pulp.lpSum(
+                dish.is_in[t] for dish in dishes for t in dish.time_range
+            )
+        model += score, "dish_temp"
+
+        solve_start = time.perf_counter()
+        model.solve(solver)
+        self.window_stats.append(
+            {
+                "start": float(start),
+                "end": float(end),
+                "solve_time": time.perf_counter() - solve_start,
+                "num_variables": len(model.variables()),
+                "num_constraints": model.numConstraints(),
+            }
+        )
+        if get_status(model) not in ("optimal", "feasible"):
+            raise SolverError(f"The window from {start} to {end} has no solution.")
+
+        keep = slice(
+            start_index,
+            end_index + 1 if is_last else start_index + self._steps(self.window),
+        )
+        for i, dish in enumerate(dishes):
+            put_in, take_out = np.round(dish.get_decision_values())
+            self._put_in[i, keep] = put_in[: keep.stop - keep.start]
+            self._take_out[i, keep] = take_out[: keep.stop - keep.start]
+
+    def _steps(self, minutes: float) -> int:
+        """Returns the number of timesteps in a duration.
+
+        Args:
+            minutes (float): The duration.
+
+        Returns:
+            int: The number of timesteps.
+        """
+        return round(minutes / self.system.time_increment)
+
+    def solve(
+        self, solver: str | pulp.LpSolver | None = None, **solver_options: Any
+    ) -> None:
+        """Solves the windows in turn.
+
+        If a window has no solution, the decisions kept from the window before
+        it are dropped and the two are solved as one window to the end. This is
+        repeated as needed, so at worst the whole session is solved at once.
+
+        Args:
+            solver (str | pulp.LpSolver | None, optional): The solver name (see
+                get_solver) or a configured pulp solver. Defaults to pulp's
+                default solver.
+            **solver_options (Any): Options for get_solver, e.g. time_limit,
+                applied to each window.
+
+        Raises:
+            SolverError: If the whole session has no solution either.
+        """
+        if not isinstance(solver, pulp.LpSolver):
+            solver = get_solver(solver, **solver_options)
+        self.status = "not_solved"
+        self._put_in[:] = 0
+        self._take_out[:] = 0
+        self.window_stats = []
+        self.num_backtracks = 0
+        last_index = len(self.time_range) - 1
+        # the starts of the windows whose decisions are kept
+        kept: list[int] = []
+        start_index, end_index = 0, self._steps(self.window + self.overlap) - 1
+        while True:
+            end_index = min(end_index, last_index)
+            try:
+                self._solve_window(start_index, end_index, solver)
+            except SolverError:
+                if not kept:
+                    raise
+                self.num_backtracks += 1
+                start_index, end_index = kept.pop(), last_index
+                continue
+            if end_index == last_index:
+                break
+            kept.append(start_index)
+            start_index += self._steps(self.window)
+            end_index = start_index + self._steps(self.window + self.overlap) - 1
+        self.status = "feasible"
+
+    def check_solved(self) -> None:
+        """Raises an exception if the session has not been solved.
+
+        Raises:
+            SolverError: If the session has not been solved.
+        """
+        if self.status != "feasible":
+            raise SolverError("The rolling horizon has not been solved.")
+
+    def get_results(self) -> Results:
+        """Returns the schedule kept from all the windows.
+
+        Returns:
+            Results: The per-dish results.
+        """
+        self.check_solved()
+        return Results.from_array(
+            get_results_array(self.system, self.dishes, self._put_in, self._take_out),
+            [dish.name for dish in self.dishes],
+            self.time_range,
+        )
+
+    def get_objective_value(self) -> float:
+        """Returns the schedule's value of the full model's objective.
+
+        Returns:
+            float: The objective value.
+        """
+        dish_results = self.get_results().dish_results
+        return sum(
+            score_results(self.system, dish, dish_results[dish.name])
+            for dish in self.dishes
+        )
+
+    def compare_with_full(
+        self, solver: str | pulp.LpSolver | None = None, **solver_options: Any
+    ) -> dict[str, Any]:
+        """Solves the whole session at once to measure the rolling horizon's gap.
+
+        This is only tractable for sessions small enough to solve directly,
+        e.g. with a time limit.
+
+        Args:
+            solver (str | pulp.LpSolver | None, optional): The solver name (see
+                get_solver) or a configured pulp solver. Defaults to pulp's
+                default solver.
+            **solver_options (Any): Options for get_solver, e.g. time_limit.
+
+        Returns:
+            dict[str, Any]: The rolling and full objective values and solve
+                times, the full model's status and the relative gap, or None for
+                the full values if it found no solution.
+        """
+        self.check_solved()
+        start = time.perf_counter()
+        session = Session(self.system, self.dishes, builder=self.builder)
+        try:
+            session.solve(solver=solver, **solver_options)
+            full_objective = session.get_objective_value()
+        except SolverError:
+            full_objective = None
+        objective = self.get_objective_value()
+        return {
+            "objective": objective,
+            "solve_time": sum(stats["solve_time"] for stats in self.window_stats),
+            "full_objective": full_objective,
+            "full_status": session.status,
+            "full_time": time.perf_counter() - start,
+            "gap": (
+                None
+                if full_objective is None
+                else (full_objective - objective) / max(abs(full_objective), 1e-9)
+            ),
+        }
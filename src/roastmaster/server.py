@@ -0,0 +1,300 @@
+"""server.py."""
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import BrokenExecutor
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from roastmaster.batch import BatchResult
+from roastmaster.batch import RestartingPool
+from roastmaster.batch import parse_problem
+from roastmaster.batch import solve_problem
+from roastmaster.cache import get_cache_key
+from roastmaster.errors import QueueFullError
+from roastmaster.models import Dish
+from roastmaster.models import System
+
+
+class SchedulingService:
+    """Solves problems on a fixed pool of worker processes.
+
+    Identical problems in flight at the same time are solved once, and every
+    request for them gets the same outcome. Distinct problems wait in a queue
+    of at most max_queue for a free worker, and are rejected once it is full.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        max_queue (int): The most problems waiting for a worker.
+        requests (int): The number of problems submitted.
+        solves (int): The number of problems sent to a worker.
+        coalesced (int): The number of problems joined onto one in flight.
+        rejected (int): The number of problems rejected as the queue was full.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_queue: int | None = None,
+        templates: Sequence[str | Path] = (),
+    ) -> None:
+        """Initializes a SchedulingService object.
+
+        Args:
+            workers (int | None, optional): The number of worker processes.
+                Defaults to the number of CPUs.
+            max_queue (int | None, optional): The most problems waiting for a
+                worker. Defaults to twice the number of workers.
+            templates (Sequence[str | Path], optional): The paths of saved
+                ModelTemplates, which each worker loads at startup. Defaults to
+                ().
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = 2 * self.workers if max_queue is None else max_queue
+        self.requests = self.solves = self.coalesced = self.rejected = 0
+        self._in_flight: dict[str, Future] = {}
+        # the latencies of the most recent requests, in seconds
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        self._tmp_dir = tempfile.TemporaryDirectory(prefix="roastmaster-")
+        # started again if a worker dies, e.g. from a solver crash
+        self._pool = RestartingPool(self.workers, self._tmp_dir.name, templates)
+
+    def submit(
+        self, system: System, dishes: list[Dish], **options: Any
+    ) -> tuple[Future, bool]:
+        """Queues a problem, or joins an identical one already in flight.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            **options (Any): Any of batch.PROBLEM_OPTIONS.
+
+        Returns:
+            tuple[Future, bool]: The future BatchResult, and whether it was
+                joined onto a problem in flight.
+
+        Raises:
+            QueueFullError: If the queue is full.
+        """
+        builder = options.pop("builder", "expression")
+        key = get_cache_key(system, dishes, builder=builder, **options)
+        with self._lock:
+            self.requests += 1
+            if key in self._in_flight:
+                self.coalesced += 1
+                return self._in_flight[key], True
+            if len(self._in_flight) >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"The queue of {self.max_queue} problems is full, try again later."
+                )
+            future = self._pool.submit(
+                solve_problem, self.solves, system, dishes, builder, **options
+            )
+            self.solves += 1
+            self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._finish(key))
+        return future, False
+
+    def _finish(self, key: str) -> None:
+        """Stops coalescing onto a finished problem.
+
+        Args:
+            key (str): The problem key.
+        """
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def solve(self, system: System, dishes: list[Dish], **options: Any) -> BatchResult:
+        """Solves a problem, waiting for the outcome.
+
+        Args:
+            system (System): The system configuration.
+            dishes (list[Dish]): The dish configurations.
+            **options (Any): Any of batch.PROBLEM_OPTIONS.
+
+        Returns:
+            BatchResult: The outcome.
+        """
+        start = time.perf_counter()
+        future, _ = self.submit(system, dishes, **options)
+        outcome = future.result()
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return outcome
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Returns the queue depth, counters and recent latencies.
+
+        Returns:
+            dict[str, Any]: The metrics. The queue depth counts the problems
+                waiting for a worker, the restarts count the times the workers
+                were started again after one died, and the latencies summarise
+                the most recent solved requests, in seconds.
+        """
+        with self._lock:
+            in_flight = list(self._in_flight.values())
+            latencies = sorted(self._latencies)
+            metrics: dict[str, Any] = {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": len(in_flight),
+                "queue_depth": sum(not future.running() for future in in_flight),
+                "requests": self.requests,
+                "solves": self.solves,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "restarts": self._pool.restarts,
+            }
+        metrics["latency"] = {
+            "count": len(latencies),
+            "mean": statistics.fmean(latencies) if latencies else None,
+            "p50": _get_percentile(latencies, 0.5),
+            "p95": _get_percentile(latencies, 0.95),
+            "max": latencies[-1] if latencies else None,
+        }
+        return metrics
+
+    def close(self) -> None:
+        """Stops the workers, cancelling any queued problems."""
+        self._pool.shutdown(cancel_futures=True)
+        self._tmp_dir.cleanup()
+
+
+def _get_percentile(values: list[float], q: float) -> float | None:
+    """Returns a percentile of sorted values, by the nearest rank.
+
+    Args:
+        values (list[float]): The sorted values.
+        q (float): The percentile, between 0 and 1.
+
+    Returns:
+        float | None: The percentile, or None if there are no values.
+    """
+    if not values:
+        return None
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves POST /solve, GET /metrics and GET /health."""
+
+    server: "SchedulingServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Serves the metrics and health check."""
+        if self.path == "/metrics":
+            self._send(HTTPStatus.OK, self.server.service.get_metrics())
+        elif self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"No such path {self.path}."})
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Solves the problem in the request body."""
+        if self.path != "/solve":
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"No such path {self.path}."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            system, dishes, options = parse_problem(json.loads(self.rfile.read(length)))
+        except ValueError as e:  # includes invalid JSON and pydantic errors
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        try:
+            outcome = self.server.service.solve(system, dishes, **options)
+        except QueueFullError as e:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}, retry=True)
+            return
+        except (BrokenExecutor, RuntimeError) as e:
+            # a worker died mid-solve, or the service is shutting down
+            self._send(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"error": f"{type(e).__name__}: {e}"},
+            )
+            return
+        # results are only missing if not ok, which mypy cannot tell from ok
+        if not outcome.ok or outcome.results is None:
+            self._send(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"status": outcome.status, "error": outcome.error},
+            )
+            return
+        self._send(
+            HTTPStatus.OK,
+            {
+                "status": outcome.status,
+                "objective_value": outcome.objective_value,
+                "results": outcome.results.to_dict(),
+            },
+        )
+
+    def _send(self, status: HTTPStatus, body: dict, retry: bool = False) -> None:
+        """Sends a JSON response.
+
+        Args:
+            status (HTTPStatus): The response status.
+            body (dict): The response body.
+            retry (bool, optional): Whether to ask the client to retry after a
+                second. Defaults to False.
+        """
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if retry:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Logs requests only if the server is verbose.
+
+        Args:
+            format (str): The message format.
+            *args (Any): The message arguments.
+        """
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SchedulingServer(ThreadingHTTPServer):
+    """An HTTP server for a SchedulingService.
+
+    Each request is handled in its own thread, which waits for its problem's
+    outcome, while the solves themselves run on the service's workers.
+
+    Attributes:
+        service (SchedulingService): The service.
+        verbose (bool): Whether to log each request.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: SchedulingService,
+        verbose: bool = False,
+    ) -> None:
+        """Initializes a SchedulingServer object.
+
+        Args:
+            address (tuple[str, int]): The host and port, or port 0 for any.
+            service (SchedulingService): The service.
+            verbose (bool, optional): Whether to log each request. Defaults to
+                False.
+        """
+        super().__init__(address, _Handler)
+        self.service = service
+        self.verbose = verbose
@@ -1,16 +1,162 @@
 """session.py."""
+import contextlib
+import copy
+import inspect
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
 import pulp
 
+from roastmaster.aio import DEFAULT_EXECUTOR
+from roastmaster.aio import SolveExecutor
+from roastmaster.aio import solve_matrix_model
+from roastmaster.aio import solve_pulp_model
+from roastmaster.checks import check_feasibility
 from roastmaster.dish import DishOpt
+from roastmaster.dish import get_results_array
+from roastmaster.errors import SolverError
+from roastmaster.event import EventModel
+from roastmaster.heuristic import GreedyScheduler
+from roastmaster.inmemory import InMemoryHiGHS
+from roastmaster.inmemory import get_constraints
 from roastmaster.models import Dish
 from roastmaster.models import System
+from roastmaster.presolve import PRESOLVE_MODES
+from roastmaster.presolve import get_decision_windows
+from roastmaster.presolve import get_symmetric_pairs
+from roastmaster.presolve import order_symmetric_results
 from roastmaster.results import Results
+from roastmaster.stats import SessionStats
+from roastmaster.stats import StatsCallback
+from roastmaster.stats import StatsRecorder
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from roastmaster.matrix import MatrixModel
+    from roastmaster.template import ModelTemplate
+
+BUILDERS = ("expression", "state", "matrix", "event")
+
+# short names for common solvers, otherwise any name in pulp.listSolvers()
+SOLVER_ALIASES = {
+    "cbc": "PULP_CBC_CMD",
+    "highs": "HiGHS",
+    "inmemory": InMemoryHiGHS.name,
+}
+
+# the solver to use instead of one that is missing or unavailable, e.g. pulp.HiGHS
+# needs pulp 2.8 or later and highspy
+SOLVER_FALLBACKS = {"HiGHS": "HiGHS_CMD"}
 
+# session status for each pulp solution status
+SOLUTION_STATUS = {
+    pulp.LpSolutionOptimal: "optimal",
+    pulp.LpSolutionIntegerFeasible: "feasible",
+    pulp.LpSolutionInfeasible: "infeasible",
+    pulp.LpSolutionUnbounded: "unbounded",
+    pulp.LpSolutionNoSolutionFound: "not_solved",
+}
 
-class SolverError(Exception):
-    """Exception raised when the solver fails."""
+# session status for each pulp model status, if the solution status has none
+MODEL_STATUS = {
+    pulp.LpStatusInfeasible: "infeasible",
+    pulp.LpStatusUnbounded: "unbounded",
+}
+
+
+def get_status(model: pulp.LpProblem) -> str:
+    """Returns the session status of a solved pulp model.
+
+    Some solvers, such as CBC, only report that a model is infeasible or
+    unbounded through its status, leaving its solution status as no solution
+    found.
+
+    Args:
+        model (pulp.LpProblem): The model.
+
+    Returns:
+        str: The session status, e.g. "optimal" or "infeasible".
+    """
+    status = SOLUTION_STATUS.get(model.sol_status, "not_solved")
+    if status == "not_solved":
+        status = MODEL_STATUS.get(model.status, status)
+    return status
 
-    pass
+
+def get_solver(
+    name: str | None = None,
+    time_limit: float | None = None,
+    gap_rel: float | None = None,
+    threads: int | None = None,
+    warm_start: bool = False,
+) -> pulp.LpSolver:
+    """Creates a pulp solver with the given options.
+
+    Args:
+        name (str | None, optional): The solver name, either an alias in
+            SOLVER_ALIASES, any name in pulp.listSolvers() or "InMemoryHiGHS".
+            A solver in SOLVER_FALLBACKS that pulp cannot run is replaced by
+            its fallback. Defaults to pulp's default solver.
+        time_limit (float | None, optional): The maximum solve time in seconds.
+            Defaults to no limit.
+        gap_rel (float | None, optional): The relative MIP gap at which to stop.
+            Defaults to the solver default.
+        threads (int | None, optional): The number of threads the solver may use.
+            Defaults to the solver default.
+        warm_start (bool, optional): Whether the solver should start from the
+            variables' initial values. Defaults to False.
+
+    Returns:
+        pulp.LpSolver: The solver.
+
+    Raises:
+        ValueError: If the solver does not exist, is not available or does not
+            support the options or warm starts.
+    """
+    name = SOLVER_ALIASES.get(name.lower(), name) if name else pulp.LpSolverDefault.name
+    if name in SOLVER_FALLBACKS and not _is_available(name):
+        name = SOLVER_FALLBACKS[name]
+    options = {"timeLimit": time_limit, "gapRel": gap_rel, "threads": threads}
+    options = {key: value for key, value in options.items() if value is not None}
+    if name == InMemoryHiGHS.name:
+        if threads is not None:
+            raise ValueError(f"Solver {name!r} does not support threads.")
+        solver = InMemoryHiGHS(timeLimit=time_limit, gapRel=gap_rel)
+    else:
+        try:
+            solver = pulp.getSolver(name, **options)
+        except pulp.PulpSolverError:
+            raise ValueError(f"Unknown solver {name!r}.") from None
+        except TypeError:
+            raise ValueError(
+                f"Solver {name!r} does not support {sorted(options)}."
+            ) from None
+    if not solver.available():
+        raise ValueError(f"Solver {name!r} is not available.")
+    if warm_start:
+        if "warmStart" not in inspect.signature(type(solver)).parameters:
+            raise ValueError(f"Solver {name!r} does not support warm starts.")
+        solver = pulp.getSolver(name, warmStart=True, **options)
+    return solver
+
+
+def _is_available(name: str) -> bool:
+    """Returns whether pulp has a solver and can run it.
+
+    Args:
+        name (str): The solver name.
+
+    Returns:
+        bool: True if the solver is available.
+    """
+    try:
+        return pulp.getSolver(name).available()
+    except pulp.PulpSolverError:
+        return False
 
 
 class Session:
@@ -18,48 +164,765 @@ class Session:
 
     Attributes:
         system (System): The system configuration.
-        model (pulp.LpProblem): The optimization model.
+        builder (str): The model construction mode, one of BUILDERS.
+        model (pulp.LpProblem | None): The optimization model, unless the
+            "matrix" builder is used.
+        matrix (MatrixModel | None): The sparse array model, if the "matrix"
+            builder is used.
+        event (EventModel | None): The start time model, if the "event" builder
+            is used.
         dishes (list[DishOpt]): The list of dishes to be optimized.
+        status (str): The solution status after solving, "optimal" if the
+            solution is proven optimal or "feasible" if it is only the best found
+            within the solver limits.
     """
 
-    def __init__(self, system: System, dishes: list[Dish]):
+    def __init__(
+        self,
+        system: System,
+        dishes: list[Dish],
+        builder: str = "expression",
+        windows: dict[str, tuple[float, float]] | None = None,
+        presolve: str | None = None,
+        symmetry_breaking: bool = False,
+        track_memory: bool = False,
+        stats_callback: StatsCallback | None = None,
+        template: "ModelTemplate | None" = None,
+    ):
         """Initializes a Session object.
 
+        The "expression" builder defines each dish's in-ness and cooking time as
+        expressions accumulated over all previous timesteps. The "state" builder
+        defines them as variables with one linking constraint per timestep, so
+        that the model grows linearly with the number of timesteps. The "matrix"
+        builder assembles the "state" formulation directly as sparse arrays,
+        without creating pulp objects, and solves it with HiGHS. The "event"
+        builder puts each dish in once and models only its start time, so that
+        the model size does not depend on the number of timesteps; its results
+        are sampled back onto the time grid.
+
         Args:
             system (System): The system configuration.
             dishes (list[Dish]): The list of dishes to be optimized.
+            builder (str, optional): The model construction mode, one of
+                BUILDERS. Defaults to "expression".
+            windows (dict[str, tuple[float, float]] | None, optional): For any
+                dish name, the period in which that dish may be put in and taken
+                out. Decisions outside it are not modelled. Defaults to None.
+            presolve (str | None, optional): One of PRESOLVE_MODES. "safe" leaves
+                out put-in and take-out decisions that no feasible schedule can
+                make. "single_spell" assumes each dish is put in only once, so
+                that it cannot be put in after the total time less its cooking
+                and warm-up time, nor taken out before it has cooked; this
+                removes far more decisions but rules out reheating a dish.
+                Ignored by the "event" builder, which already assumes a single
+                spell. Defaults to None.
+            symmetry_breaking (bool, optional): Whether to order dishes with the
+                same configuration and windows, so that the solver does not
+                explore equivalent schedules. They are ordered by whether they
+                are in the oven at the last timestep before serving, then by
+                their put-in times, or by their put-in times for the "event"
+                builder. Defaults to False.
+            track_memory (bool, optional): Whether to record each phase's peak
+                memory in stats, which slows it down. Defaults to False.
+            stats_callback (StatsCallback | None, optional): Called with the phase
+                name and stats after each phase. Defaults to None.
+            template (ModelTemplate | None, optional): A template compiled for
+                the system and number of dishes, from which the "matrix" builder
+                fills in its constraints. Ignored by other builders. Defaults to
+                None.
+
+        Raises:
+            ValueError: If the builder or presolve mode is not recognised, or
+                the template does not match the problem.
+            InfeasibleError: If the menu is clearly infeasible, see
+                check_feasibility.
 
         """
+        if builder not in BUILDERS:
+            raise ValueError(
+                f"Unknown builder {builder!r}, expected one of {BUILDERS}."
+            )
+        if presolve is not None and presolve not in PRESOLVE_MODES:
+            raise ValueError(
+                f"Unknown presolve mode {presolve!r}, expected one of "
+                f"{PRESOLVE_MODES}."
+            )
         self.system = system
+        self.builder = builder
+        self.windows = windows or {}
+        self.presolve = presolve
+        self.symmetry_breaking = symmetry_breaking
+        self._solved = False
+        self.status = "not_solved"
+        self._solve_options: dict[str, Any] = {"solver": None}
+        self.model: pulp.LpProblem | None = None
+        self.matrix: "MatrixModel | None" = None
+        self.event: EventModel | None = None
+        self.dishes: list[DishOpt] = []
+        self._recorder = StatsRecorder(track_memory, stats_callback)
+        # fail fast, rather than building and solving a hopeless model
+        check_feasibility(self.system, dishes, self.windows)
+        if builder == "matrix":
+            # scipy is slow to import, so only for the builder that needs it
+            import roastmaster.matrix
+
+            with self._recorder.phase("build_model"):
+                self.matrix = roastmaster.matrix.MatrixModel(
+                    self.system,
+                    dishes,
+                    windows=self.windows,
+                    presolve=presolve,
+                    symmetry_breaking=symmetry_breaking,
+                    template=template,
+                )
+        elif builder == "event":
+            with self._recorder.phase("build_model"):
+                self.event = EventModel(
+                    self.system,
+                    dishes,
+                    windows=self.windows,
+                    symmetry_breaking=symmetry_breaking,
+                )
+            self.model = self.event.model
+        else:
+            self._build_model(dishes)
+        self._record_model_size()
+
+    @property
+    def stats(self) -> SessionStats:
+        """The wall time, and optionally peak memory, of each phase so far.
+
+        Phases are "build_model" for the "matrix" and "event" builders, or
+        "build_dishes" and "add_shared_constraints" otherwise, then "solve", with
+        "write_model" separated out where the solver writes the model to a file,
+        and "get_results". Also holds the current model size and solution status.
+
+        Returns:
+            SessionStats: The session stats.
+        """
+        return self._recorder.stats
+
+    @property
+    def _pulp_model(self) -> pulp.LpProblem:
+        """The pulp model, which every builder but "matrix" has.
+
+        Returns:
+            pulp.LpProblem: The model.
+
+        Raises:
+            ValueError: If the "matrix" builder is used.
+        """
+        if self.model is None:
+            raise ValueError('Sessions using the "matrix" builder have no pulp model.')
+        return self.model
+
+    def _record_model_size(self) -> None:
+        """Records the number of variables, constraints and nonzeros."""
+        stats = self._recorder.stats
+        if self.matrix is not None:
+            stats.num_variables = self.matrix.num_vars
+            stats.num_constraints = self.matrix.a.shape[0]
+            stats.num_nonzeros = self.matrix.a.nnz
+            return
+        model = self._pulp_model
+        constraints = get_constraints(model)
+        stats.num_variables = len(model.variables())
+        stats.num_constraints = len(constraints)
+        stats.num_nonzeros = sum(len(constraint) for constraint in constraints)
+
+    def _build_model(self, dishes: list[Dish]) -> None:
+        """Builds the pulp model.
+
+        Args:
+            dishes (list[Dish]): The list of dishes to be optimized.
+        """
         self.model = pulp.LpProblem("ROAST", pulp.LpMaximize)
-        self.dishes = [
-            DishOpt(model=self.model, system_config=self.system, dish_config=dish)
-            for dish in dishes
-        ] or []
+        with self._recorder.phase("build_dishes"):
+            self.dishes = [self._build_dish(dish) for dish in dishes]
+        self._add_shared_constraints()
+
+    def _build_dish(self, dish: Dish) -> DishOpt:
+        """Builds a dish's variables and constraints into the model.
+
+        Args:
+            dish (Dish): The dish configuration.
 
+        Returns:
+            DishOpt: The dish.
+        """
+        put_in_window, take_out_window = get_decision_windows(
+            self.system, dish, self.windows.get(dish.name), self.presolve
+        )
+        return DishOpt(
+            model=self.model,
+            system_config=self.system,
+            dish_config=dish,
+            explicit_state=self.builder == "state",
+            put_in_window=put_in_window,
+            take_out_window=take_out_window,
+        )
+
+    def _add_shared_constraints(self) -> None:
+        """Adds the constraints and objective over all dishes."""
+        with self._recorder.phase("add_shared_constraints"):
+            self._add_capacity_and_objective()
+
+    def _add_capacity_and_objective(self) -> None:
+        """Adds the oven space constraints, dish ordering and objective."""
+        model = self._pulp_model
+        self._capacity: dict[float, pulp.LpConstraint] = {}
         for time in self.system.get_time_range():
-            space_used = sum(dish.space_used[time] for dish in self.dishes)
+            space_used = pulp.lpSum(dish.space_used[time] for dish in self.dishes)
             # total oven space constraint
-            self.model += space_used <= self.system.oven.num_shelves
+            self._capacity[time] = space_used <= self.system.oven.num_shelves
+            model += self._capacity[time]
+
+        for i, j in self._get_symmetric_pairs():
+            self._add_ordering(self.dishes[i], self.dishes[j])
 
         # sum up scores for each dish to generate objective
-        obj = sum(dish.get_score() for dish in self.dishes)
-        self.model += obj, "dish_temp"  # add objective
+        obj = pulp.lpSum(dish.get_score() for dish in self.dishes)
+        model += obj, "dish_temp"  # add objective
+
+    def _get_symmetric_pairs(self) -> list[tuple[int, int]]:
+        """Returns the pairs of interchangeable dishes to be ordered.
+
+        Returns:
+            list[tuple[int, int]]: The indices of each pair in dishes, or none if
+                symmetry breaking is off.
+        """
+        if not self.symmetry_breaking:
+            return []
+        return get_symmetric_pairs(
+            [dish.dish_config for dish in self.dishes], self.windows
+        )
+
+    def _add_ordering(self, dish: DishOpt, other: DishOpt) -> None:
+        """Orders one dish before an identical one, see _get_ordering_key.
+
+        Args:
+            dish (DishOpt): The dish to be ordered first.
+            other (DishOpt): The identical dish.
+        """
+        self._pulp_model.addConstraint(
+            self._get_ordering_key(dish) <= self._get_ordering_key(other)
+        )
+
+    def _get_ordering_key(self, dish: DishOpt) -> pulp.LpAffineExpression:
+        """Returns the expression by which identical dishes are ordered.
+
+        Dishes are ordered first by whether they are in the oven at the last
+        timestep before serving, then by their put-in times: the key is the sum
+        of the indices of the timesteps at which the dish is put in, counting
+        from 1, plus a weight greater than any such sum if it is out at the end.
+
+        Args:
+            dish (DishOpt): The dish.
+
+        Returns:
+            pulp.LpAffineExpression: The key, lower for dishes ordered first.
+        """
+        last = self.system.total_time - self.system.time_increment
+        num_times = len(dish.time_range)
+        out_weight = num_times * (num_times + 1) // 2 + 1
+        return out_weight * (1 - dish.is_in[last]) + pulp.lpSum(
+            (i + 1) * dish.put_in[time] for i, time in enumerate(dish.time_range)
+        )
+
+    def _check_editable(self) -> None:
+        """Raises an exception if the session cannot be edited.
+
+        Raises:
+            ValueError: If the "matrix" or "event" builder is used.
+        """
+        if self.builder in ("matrix", "event"):
+            raise ValueError(
+                f"Sessions using the {self.builder!r} builder cannot be edited."
+            )
+
+    def _get_dish_index(self, name: str) -> int:
+        """Returns the position of a dish in the session.
+
+        Args:
+            name (str): The dish name.
+
+        Returns:
+            int: The index into dishes.
+
+        Raises:
+            KeyError: If there is no such dish.
+        """
+        for i, dish in enumerate(self.dishes):
+            if dish.name == name:
+                return i
+        raise KeyError(f"No dish named {name!r} in the session.")
+
+    def add_dish(self, dish: Dish, resolve: bool = True) -> None:
+        """Adds a dish without rebuilding the other dishes.
+
+        The new dish's constraints are added to the model, its space is added to
+        the existing oven space constraints and its score to the objective.
+
+        Args:
+            dish (Dish): The dish configuration.
+            resolve (bool, optional): Whether to re-solve a solved session,
+                starting from the previous solution. Defaults to True.
+
+        Raises:
+            ValueError: If the session already has a dish with the same name.
+            InfeasibleError: If the menu would be clearly infeasible.
+        """
+        self._check_editable()
+        if any(existing.name == dish.name for existing in self.dishes):
+            raise ValueError(f"The session already has a dish named {dish.name!r}.")
+        configs = [existing.dish_config for existing in self.dishes]
+        check_feasibility(self.system, [*configs, dish], self.windows)
+        self._add_dish(dish)
+        self._edited(resolve)
+
+    def remove_dish(self, name: str, resolve: bool = True) -> None:
+        """Removes a dish without rebuilding the other dishes.
+
+        The remaining dishes' constraints are reused as they are; only the oven
+        space constraints and the objective are rebuilt.
+
+        Args:
+            name (str): The dish name.
+            resolve (bool, optional): Whether to re-solve a solved session,
+                starting from the previous solution. Defaults to True.
+        """
+        self._check_editable()
+        self._remove_dish(self._get_dish_index(name))
+        self._edited(resolve)
+
+    def update_dish(self, dish: Dish, resolve: bool = True) -> None:
+        """Replaces the dish with the same name, e.g. to change its cooking time.
+
+        The dish's previous schedule, if any, is kept as the starting point for
+        the re-solve.
+
+        Args:
+            dish (Dish): The new dish configuration.
+            resolve (bool, optional): Whether to re-solve a solved session,
+                starting from the previous solution. Defaults to True.
 
-    def solve(self) -> None:
+        Raises:
+            InfeasibleError: If the menu would be clearly infeasible.
+        """
+        self._check_editable()
+        index = self._get_dish_index(dish.name)
+        configs = [existing.dish_config for existing in self.dishes]
+        configs[index] = dish
+        check_feasibility(self.system, configs, self.windows)
+        previous = self.dishes[index].get_results() if self._solved else None
+        self._remove_dish(index)
+        new_dish = self._add_dish(dish)
+        if previous is not None:
+            new_dish.set_initial_values(previous)
+        self._edited(resolve)
+
+    def set_objective_parameters(
+        self,
+        oven_opening_penalty: float | None = None,
+        serve_hot_weights: dict[str, float] | None = None,
+        resolve: bool = True,
+    ) -> None:
+        """Changes the objective's parameters without rebuilding the constraints.
+
+        Only the objective is rebuilt, from each dish's score, unless the new
+        weights make identical dishes differ, in which case the ordering between
+        them is dropped as in remove_dish.
+
+        Args:
+            oven_opening_penalty (float | None, optional): The new oven opening
+                penalty. Defaults to the current penalty.
+            serve_hot_weights (dict[str, float] | None, optional): The new serve
+                hot weight of any dish, by name. Defaults to None.
+            resolve (bool, optional): Whether to re-solve a solved session,
+                starting from the previous solution. Defaults to True.
+        """
+        self._check_editable()
+        serve_hot_weights = serve_hot_weights or {}
+        for name in serve_hot_weights:
+            self._get_dish_index(name)
+        pairs = self._get_symmetric_pairs()
+        if oven_opening_penalty is not None:
+            oven = self.system.oven.model_copy(
+                update={"oven_opening_penalty": oven_opening_penalty}
+            )
+            self.system = self.system.model_copy(update={"oven": oven})
+        for dish in self.dishes:
+            dish.system_config = self.system
+            if dish.name in serve_hot_weights:
+                dish.dish_config = dish.dish_config.model_copy(
+                    update={"serve_hot_weight": serve_hot_weights[dish.name]}
+                )
+        if self._get_symmetric_pairs() != pairs:
+            self._reassemble_model()
+        else:
+            self._pulp_model.setObjective(
+                pulp.lpSum(dish.get_score() for dish in self.dishes)
+            )
+        self._edited(resolve)
+
+    def _add_dish(self, dish: Dish) -> DishOpt:
+        """Builds a dish into the existing model.
+
+        Args:
+            dish (Dish): The dish configuration.
+
+        Returns:
+            DishOpt: The new dish.
+        """
+        new_dish = self._build_dish(dish)
+        self.dishes.append(new_dish)
+        for time, constraint in self._capacity.items():
+            constraint.addInPlace(new_dish.space_used[time])
+        for i, j in self._get_symmetric_pairs():
+            if j == len(self.dishes) - 1:
+                self._add_ordering(self.dishes[i], new_dish)
+        self._pulp_model.objective += new_dish.get_score()
+        return new_dish
+
+    def _remove_dish(self, index: int) -> None:
+        """Removes a dish, reassembling the model from the remaining dishes.
+
+        Args:
+            index (int): The index of the dish in dishes.
+        """
+        self.dishes.pop(index)
+        self._reassemble_model()
+
+    def _reassemble_model(self) -> None:
+        """Rebuilds the model from the dishes' existing constraints."""
+        self.model = pulp.LpProblem("ROAST", pulp.LpMaximize)
+        for dish in self.dishes:
+            for constraint in dish.constraints:
+                self.model += constraint
+        self._add_shared_constraints()
+
+    def _edited(self, resolve: bool) -> None:
+        """Re-solves a solved session after an edit, or marks it unsolved.
+
+        Args:
+            resolve (bool): Whether to re-solve a solved session.
+        """
+        was_solved, self._solved = self._solved, False
+        self.status = "not_solved"
+        self._recorder.stats.status = self.status
+        self._record_model_size()
+        if was_solved and resolve:
+            self.resolve()
+
+    def resolve(self) -> None:
+        """Re-solves the model with the last solve options.
+
+        The solver starts from the variables' current values, i.e. the previous
+        solution, where it supports warm starts.
+        """
+        self._check_editable()
+        options = dict(self._solve_options)
+        solver = options.pop("solver")
+        if not isinstance(solver, pulp.LpSolver):
+            try:
+                solver = get_solver(solver, warm_start=True, **options)
+            except ValueError:
+                solver = get_solver(solver, **options)
+        self._solve_pulp(solver)
+
+    def solve(
+        self,
+        solver: str | pulp.LpSolver | None = None,
+        time_limit: float | None = None,
+        gap_rel: float | None = None,
+        threads: int | None = None,
+        warm_start: bool = False,
+    ) -> None:
         """Solves the model.
 
+        Once solved, the status attribute reports whether the solution is proven
+        optimal or only the best found within the time limit or gap.
+
+        Args:
+            solver (str | pulp.LpSolver | None, optional): The solver name (see
+                get_solver) or a configured pulp solver. Defaults to pulp's default
+                solver, or HiGHS for the "matrix" builder.
+            time_limit (float | None, optional): The maximum solve time in seconds.
+                Defaults to no limit.
+            gap_rel (float | None, optional): The relative MIP gap at which to stop.
+                Defaults to the solver default.
+            threads (int | None, optional): The number of threads the solver may use.
+                Defaults to the solver default.
+            warm_start (bool, optional): Whether to start the solver from a
+                GreedyScheduler schedule, if one can be found. A configured pulp
+                solver must itself have warmStart set. Defaults to False.
+
         Raises:
             SolverError: If model solving fails.
+            ValueError: If the solver options are invalid.
+
+        """
+        if self.matrix is not None:
+            self._check_matrix_options(solver, threads, warm_start)
+            with self._recorder.phase("solve"):
+                self.status = self.matrix.solve(time_limit=time_limit, gap_rel=gap_rel)
+            self._check_status()
+        else:
+            self._solve_pulp(
+                self._get_pulp_solver(solver, time_limit, gap_rel, threads, warm_start)
+            )
+
+    async def solve_async(
+        self,
+        solver: str | pulp.LpSolver | None = None,
+        time_limit: float | None = None,
+        gap_rel: float | None = None,
+        threads: int | None = None,
+        warm_start: bool = False,
+        timeout: float | None = None,
+        executor: SolveExecutor | None = None,
+    ) -> None:
+        """Solves the model in a child process, without blocking the event loop.
+
+        The model is sent to a child process to solve, and the solution is copied
+        back. If the timeout passes or the awaiting task is cancelled, the solver
+        is stopped, and the session keeps the best solution found so far, if the
+        solver reports one, as for a time limit.
+
+        Args:
+            solver (str | pulp.LpSolver | None, optional): The solver name (see
+                get_solver) or a configured pulp solver. Defaults to pulp's default
+                solver, or HiGHS for the "matrix" builder.
+            time_limit (float | None, optional): The maximum solve time in seconds.
+                Defaults to no limit.
+            gap_rel (float | None, optional): The relative MIP gap at which to stop.
+                Defaults to the solver default.
+            threads (int | None, optional): The number of threads the solver may use.
+                Defaults to the solver default.
+            warm_start (bool, optional): Whether to start the solver from a
+                GreedyScheduler schedule, if one can be found. A configured pulp
+                solver must itself have warmStart set. Defaults to False.
+            timeout (float | None, optional): The seconds after which to stop the
+                solver, counted from this call including any wait for a free
+                worker, which also caps its time limit. Defaults to no timeout.
+            executor (SolveExecutor | None, optional): The executor, which limits
+                the solves that run at once. Defaults to a shared executor.
+
+        Raises:
+            SolverError: If model solving fails, or the solver was stopped
+                before it found a solution.
+            ValueError: If the solver options are invalid.
+        """
+        executor = executor or DEFAULT_EXECUTOR
+        if timeout is not None:
+            time_limit = timeout if time_limit is None else min(time_limit, timeout)
+        if self.matrix is not None:
+            self._check_matrix_options(solver, threads, warm_start)
+            with self._recorder.phase("solve"):
+                result = await executor.run(
+                    solve_matrix_model,
+                    self.matrix,
+                    time_limit,
+                    gap_rel,
+                    timeout=timeout,
+                    interruptible=False,
+                )
+            self.status = "not_solved" if result is None else result[0]
+            if self.status in ("optimal", "feasible"):
+                _, self.matrix.solution, self.matrix.objective_value = result
+            self._check_status()
+            return
+
+        if isinstance(solver, pulp.LpSolver) and timeout is not None:
+            # cap the configured solver's time limit, leaving it unchanged
+            capped: pulp.LpSolver = copy.copy(solver)
+            if capped.timeLimit is None or capped.timeLimit > timeout:
+                capped.timeLimit = timeout
+            solver, time_limit = capped, None
+        solver = self._get_pulp_solver(solver, time_limit, gap_rel, threads, warm_start)
+
+        def on_cancel(result: tuple[int, int, dict[str, float | None]]) -> None:
+            """Keeps the solver's best solution when the task is cancelled.
+
+            Args:
+                result (tuple[int, int, dict[str, float | None]]): The child's
+                    solve result.
+            """
+            self._set_pulp_solution(result)
+            with contextlib.suppress(SolverError):
+                self._check_status()
+
+        with self._recorder.phase("solve"):
+            result = await executor.run(
+                solve_pulp_model,
+                self.model,
+                solver,
+                timeout=timeout,
+                # CBC stops and writes its best solution when interrupted
+                interruptible=isinstance(solver, pulp.COIN_CMD),
+                on_cancel=on_cancel,
+            )
+        self._set_pulp_solution(result)
+        self._check_status()
+
+    def _check_matrix_options(
+        self, solver: str | pulp.LpSolver | None, threads: int | None, warm_start: bool
+    ) -> None:
+        """Checks that the "matrix" builder supports the solve options.
+
+        Args:
+            solver (str | pulp.LpSolver | None): The solver.
+            threads (int | None): The number of threads.
+            warm_start (bool): Whether to warm start.
 
+        Raises:
+            ValueError: If the options are not supported.
         """
-        # model.solve() returns 1 if solver succeeds, -1 otherwise.
-        self._solved = self.model.solve() == 1
+        if solver is not None and (
+            not isinstance(solver, str) or solver.lower() != "highs"
+        ):
+            raise ValueError('The "matrix" builder only supports HiGHS.')
+        if threads is not None or warm_start:
+            raise ValueError(
+                'The "matrix" builder does not support threads or warm starts.'
+            )
+
+    def _get_pulp_solver(
+        self,
+        solver: str | pulp.LpSolver | None,
+        time_limit: float | None,
+        gap_rel: float | None,
+        threads: int | None,
+        warm_start: bool,
+    ) -> pulp.LpSolver:
+        """Configures the solver, keeping the options for resolve.
+
+        Args:
+            solver (str | pulp.LpSolver | None): The solver name or a configured
+                pulp solver.
+            time_limit (float | None): The maximum solve time in seconds.
+            gap_rel (float | None): The relative MIP gap at which to stop.
+            threads (int | None): The number of threads the solver may use.
+            warm_start (bool): Whether to start the solver from a GreedyScheduler
+                schedule.
+
+        Returns:
+            pulp.LpSolver: The configured solver.
+
+        Raises:
+            ValueError: If the solver options are invalid.
+        """
+        self._solve_options = {
+            "solver": solver,
+            "time_limit": time_limit,
+            "gap_rel": gap_rel,
+            "threads": threads,
+        }
+        if not isinstance(solver, pulp.LpSolver):
+            solver = get_solver(solver, time_limit, gap_rel, threads, warm_start)
+        elif (time_limit, gap_rel, threads) != (None, None, None):
+            raise ValueError("Pass options either to the pulp solver or here.")
+        if warm_start:
+            self._set_initial_values()
+        return solver
+
+    def _set_pulp_solution(
+        self, result: tuple[int, int, dict[str, float | None]] | None
+    ) -> None:
+        """Copies a solution solved in a child process into the model.
+
+        Args:
+            result (tuple[int, int, dict[str, float | None]] | None): The pulp
+                status, solution status and variable values, or None if the
+                solver was stopped without one.
+        """
+        model = self._pulp_model
+        if result is None:
+            # pulp would otherwise mark the solution infeasible
+            model.assignStatus(pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound)
+        else:
+            status, sol_status, values = result
+            model.assignVarsVals(values)
+            model.assignStatus(status, sol_status)
+        self.status = get_status(model)
+
+    def _solve_pulp(self, solver: pulp.LpSolver) -> None:
+        """Solves the pulp model.
+
+        Args:
+            solver (pulp.LpSolver): The configured solver.
+        """
+        model = self._pulp_model
+        with self._recorder.phase("solve"), self._recorder.method_phase(
+            model, ["writeMPS", "writeLP"], "write_model"
+        ):
+            model.solve(solver)
+        self.status = get_status(model)
+        self._check_status()
+
+    def _check_status(self) -> None:
+        """Marks the session solved if the solver found a solution.
+
+        Raises:
+            SolverError: If no solution was found.
+        """
+        self._solved = self.status in ("optimal", "feasible")
+        self._recorder.stats.status = self.status
         try:
             self.check_solved()
         except SolverError:
             raise SolverError("Model solving failed.") from None
 
+    def _set_initial_values(self) -> None:
+        """Sets the variables' initial values from a GreedyScheduler schedule.
+
+        If the heuristic cannot find a schedule, the solver starts from nothing.
+        """
+        dishes = (
+            self.event.dishes
+            if self.event is not None
+            else [dish.dish_config for dish in self.dishes]
+        )
+        heuristic = GreedyScheduler(self.system, dishes)
+        try:
+            heuristic.solve()
+        except SolverError:
+            return
+        results: Mapping[str, pd.DataFrame] = heuristic.get_results().dish_results
+        if self.symmetry_breaking:
+            results = order_symmetric_results(
+                dishes, results, self.windows, put_in_only=self.event is not None
+            )
+        if self.event is not None:
+            self.event.set_initial_values(results)
+        for dish in self.dishes:
+            dish.set_initial_values(results[dish.name])
+
+    @property
+    def is_optimal(self) -> bool:
+        """Whether the solution is proven optimal.
+
+        Returns:
+            bool: True if the solver proved optimality.
+        """
+        return self.status == "optimal"
+
+    def get_presolve_stats(self) -> dict[str, int]:
+        """Returns how much of the model the windows and presolve removed.
+
+        Returns:
+            dict[str, int]: The number of put-in and take-out variables removed,
+                or fixed to 0 for the "matrix" builder, and the number of
+                constraints left on constants only and so not added.
+        """
+        if self.matrix is not None:
+            return {"variables": self.matrix.num_fixed_decisions, "constraints": 0}
+        return {
+            "variables": sum(dish.num_fixed_decisions for dish in self.dishes),
+            "constraints": sum(dish.num_skipped_constraints for dish in self.dishes),
+        }
+
     def check_solved(self):
         """Raises an exception if the model has not been solved."""
         if not self._solved:
@@ -67,6 +930,23 @@ class Session:
                 "System has not been solved. Make sure Optimiser.solve() has been called."
             )
 
+    def get_objective_value(self) -> float:
+        """Returns the objective value of the solved model.
+
+        Returns:
+            float: The objective value.
+
+        Raises:
+            SolverError: If the model has no solution.
+
+        """
+        self.check_solved()
+        if self.matrix is None:
+            return pulp.value(self._pulp_model.objective)
+        if self.matrix.objective_value is None:
+            raise SolverError("The model has no solution.")
+        return self.matrix.objective_value
+
     def get_results(self) -> Results:
         """Returns the results of the model.
 
@@ -78,4 +958,29 @@ class Session:
 
         """
         self.check_solved()
-        return Results({dish.name: dish.get_results() for dish in self.dishes})
+        with self._recorder.phase("get_results"):
+            return self._get_results()
+
+    def _get_results(self) -> Results:
+        """Reads the results from the solved model.
+
+        Returns:
+            Results: The per-dish results.
+        """
+        if self.matrix is not None:
+            return self.matrix.get_results()
+        if self.event is not None:
+            return self.event.get_results()
+        # only the decisions are read from the solver, the rest is derived
+        decisions = np.array([dish.get_decision_values() for dish in self.dishes])
+        decisions = decisions.reshape(len(self.dishes), 2, -1)
+        return Results.from_array(
+            get_results_array(
+                self.system,
+                [dish.dish_config for dish in self.dishes],
+                decisions[:, 0],
+                decisions[:, 1],
+            ),
+            [dish.name for dish in self.dishes],
+            self.system.get_time_range(),
+        )
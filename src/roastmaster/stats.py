@@ -0,0 +1,161 @@
+"""stats.py."""
+import functools
+import time
+import tracemalloc
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+
+@dataclass
+class PhaseStats:
+    """Timing and memory for one phase of a session.
+
+    Attributes:
+        wall_time (float): The wall time in seconds, excluding nested phases.
+        peak_memory (int | None): The peak memory traced during the phase in
+            bytes, counting allocations since the outermost phase started, if
+            memory is tracked.
+    """
+
+    wall_time: float = 0.0
+    peak_memory: int | None = None
+
+
+@dataclass
+class SessionStats:
+    """Instrumentation for a session.
+
+    Attributes:
+        phases (dict[str, PhaseStats]): The latest run of each phase, e.g.
+            "build_dishes", "add_shared_constraints", "write_model", "solve" and
+            "get_results".
+        num_variables (int | None): The number of model variables.
+        num_constraints (int | None): The number of model constraints.
+        num_nonzeros (int | None): The number of nonzero constraint coefficients.
+        status (str | None): The solution status.
+    """
+
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+    num_variables: int | None = None
+    num_constraints: int | None = None
+    num_nonzeros: int | None = None
+    status: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the stats as a JSON-serialisable dict.
+
+        Returns:
+            dict[str, Any]: The stats.
+        """
+        return asdict(self)
+
+
+StatsCallback = Callable[[str, SessionStats], None]
+
+
+class StatsRecorder:
+    """Records phases into a SessionStats object.
+
+    Phases may be nested, in which case the outer phase's wall time excludes
+    the inner phase's.
+
+    Attributes:
+        stats (SessionStats): The recorded stats.
+        track_memory (bool): Whether to record peak memory with tracemalloc.
+        callback (StatsCallback | None): Called with the phase name and the stats
+            after each phase.
+    """
+
+    def __init__(
+        self, track_memory: bool = False, callback: StatsCallback | None = None
+    ) -> None:
+        """Initializes a StatsRecorder object.
+
+        Args:
+            track_memory (bool, optional): Whether to record peak memory with
+                tracemalloc, which slows down the phases. Defaults to False.
+            callback (StatsCallback | None, optional): Called with the phase name
+                and the stats after each phase, e.g. to forward them to a metrics
+                system. Defaults to None.
+        """
+        self.stats = SessionStats()
+        self.track_memory = track_memory
+        self.callback = callback
+        # for each phase in progress, the time and peak memory of nested phases
+        self._stack: list[list[float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Records a phase.
+
+        Args:
+            name (str): The phase name.
+
+        Yields:
+            None: Control, while the phase runs.
+        """
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.track_memory:
+            if self._stack:
+                # keep the outer phase's peak so far before resetting it
+                outer = self._stack[-1]
+                outer[1] = max(outer[1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append([0.0, 0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested_time, nested_peak = self._stack.pop()
+            peak_memory = None
+            if self.track_memory:
+                peak_memory = max(int(nested_peak), tracemalloc.get_traced_memory()[1])
+                if started_tracing:
+                    tracemalloc.stop()
+            if self._stack:
+                outer = self._stack[-1]
+                outer[0] += elapsed
+                outer[1] = max(outer[1], peak_memory or 0)
+            self.stats.phases[name] = PhaseStats(
+                wall_time=elapsed - nested_time, peak_memory=peak_memory
+            )
+            if self.callback is not None:
+                self.callback(name, self.stats)
+
+    @contextmanager
+    def method_phase(self, obj: Any, methods: list[str], name: str) -> Iterator[None]:
+        """Records calls to an object's methods as a phase, e.g. inside a solver.
+
+        Args:
+            obj (Any): The object, whose methods are replaced while in the context.
+            methods (list[str]): The method names.
+            name (str): The phase name.
+
+        Yields:
+            None: Control, while the methods are recorded.
+        """
+
+        def record(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.phase(name):
+                    return method(*args, **kwargs)
+
+            return wrapper
+
+        for method in methods:
+            setattr(obj, method, record(getattr(obj, method)))
+        try:
+            yield
+        finally:
+            for method in methods:
+                # uncover the class's method again
+                delattr(obj, method)
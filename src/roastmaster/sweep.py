@@ -0,0 +1,202 @@
+"""sweep.py."""
+import itertools
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from roastmaster.batch import init_worker
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import System
+from roastmaster.results import FIELDS
+from roastmaster.session import Session
+
+
+@dataclass
+class SweepPoint:
+    """The objective parameters of one point in a sweep.
+
+    Attributes:
+        oven_opening_penalty (float | None): The oven opening penalty, or None
+            to keep the system's.
+        serve_hot_weights (dict[str, float]): The serve hot weight of any dish,
+            by name, overriding the dish's.
+    """
+
+    oven_opening_penalty: float | None = None
+    serve_hot_weights: dict[str, float] = field(default_factory=dict)
+
+
+def get_grid(
+    oven_opening_penalties: Iterable[float | None] = (None,),
+    serve_hot_weights: Iterable[dict[str, float]] = ({},),
+) -> list[SweepPoint]:
+    """Returns every combination of penalties and weights.
+
+    Args:
+        oven_opening_penalties (Iterable[float | None], optional): The oven
+            opening penalties. Defaults to the system's.
+        serve_hot_weights (Iterable[dict[str, float]], optional): The serve hot
+            weights, each overriding those of some dishes. Defaults to the
+            dishes' own.
+
+    Returns:
+        list[SweepPoint]: The points, varying the weights fastest so that
+            consecutive points are close.
+    """
+    return [
+        SweepPoint(penalty, dict(weights))
+        for penalty, weights in itertools.product(
+            oven_opening_penalties, list(serve_hot_weights)
+        )
+    ]
+
+
+def get_schedule_features(session: Session) -> dict[str, float]:
+    """Summarises a solved session's schedule.
+
+    Args:
+        session (Session): The solved session.
+
+    Returns:
+        dict[str, float]: The number of oven openings, the number of dishes in
+            the oven at the last timestep before serving and the unweighted hot
+            score, as in DishOpt.get_score.
+    """
+    values = session.get_results().values
+    is_in = values[:, :, FIELDS.index("is_in")]
+    openings = values[:, :, [FIELDS.index("put_in"), FIELDS.index("take_out")]]
+    hot_score = 0.0
+    for steps_before_end, weight in ((1, 3), (2, 2), (3, 1)):
+        if steps_before_end < is_in.shape[1]:
+            hot_score += weight * is_in[:, -1 - steps_before_end].sum()
+    return {
+        "oven_openings": float(openings.sum()),
+        "hot_dishes": float(is_in[:, -2].sum()) if is_in.shape[1] > 1 else 0.0,
+        "hot_score": float(hot_score),
+    }
+
+
+def _sweep_serial(
+    system: System,
+    dishes: list[Dish],
+    points: list[tuple[int, SweepPoint]],
+    builder: str,
+    solve_kwargs: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Builds one session and solves it at each point in turn.
+
+    Args:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        points (list[tuple[int, SweepPoint]]): The points and their positions.
+        builder (str): The Session builder, "expression" or "state".
+        solve_kwargs (dict[str, Any]): Keyword arguments for Session.solve.
+
+    Returns:
+        list[dict[str, Any]]: A row for each point.
+    """
+    session = Session(system, dishes, builder=builder)
+    rows = []
+    for index, point in points:
+        # set every parameter, since the session keeps the last point's
+        penalty = (
+            system.oven.oven_opening_penalty
+            if point.oven_opening_penalty is None
+            else point.oven_opening_penalty
+        )
+        weights = {
+            dish.name: point.serve_hot_weights.get(dish.name, dish.serve_hot_weight)
+            for dish in dishes
+        }
+        row: dict[str, Any] = {
+            "point": index,
+            "oven_opening_penalty": penalty,
+            **{f"serve_hot_weight[{name}]": w for name, w in weights.items()},
+        }
+        start = time.perf_counter()
+        try:
+            # the first point is a cold solve, later ones start from the last
+            # solution
+            was_solved = session.status in ("optimal", "feasible")
+            session.set_objective_parameters(penalty, weights, resolve=False)
+            if was_solved:
+                session.resolve()
+            else:
+                session.solve(**solve_kwargs)
+        except SolverError:
+            pass
+        row["solve_time"] = time.perf_counter() - start
+        row["status"] = session.status
+        if session.status in ("optimal", "feasible"):
+            row["objective"] = session.get_objective_value()
+            row.update(get_schedule_features(session))
+        rows.append(row)
+    return rows
+
+
+def sweep(
+    system: System,
+    dishes: list[Dish],
+    points: Iterable[SweepPoint],
+    workers: int | None = 1,
+    builder: str = "expression",
+    **solve_kwargs: Any,
+) -> pd.DataFrame:
+    """Solves a menu at each of several objective parameter points.
+
+    The constraints are built once per worker. At each point only the objective
+    is rebuilt, and the solver is warm-started from the previous point's
+    solution where it supports it. With several workers, the points are split
+    into contiguous runs, one per worker process.
+
+    Args:
+        system (System): The system configuration.
+        dishes (list[Dish]): The dish configurations.
+        points (Iterable[SweepPoint]): The points, e.g. from get_grid.
+        workers (int | None, optional): The number of worker processes, or None
+            for the number of CPUs. Defaults to 1, solving in this process.
+        builder (str, optional): The Session builder, "expression" or "state".
+            Defaults to "expression".
+        **solve_kwargs (Any): Keyword arguments for Session.solve.
+
+    Returns:
+        pd.DataFrame: A row for each point, in order, with its parameters, solve
+            time, status, objective value and schedule features.
+
+    Raises:
+        ValueError: If the builder cannot be edited.
+    """
+    if builder not in ("expression", "state"):
+        raise ValueError(f"Sweeps do not support the {builder!r} builder.")
+    indexed = list(enumerate(points))
+    workers = min(workers or os.cpu_count() or 1, max(len(indexed), 1))
+    if workers == 1:
+        rows = _sweep_serial(system, dishes, indexed, builder, solve_kwargs)
+    else:
+        runs = [list(run) for run in np.array_split(np.arange(len(indexed)), workers)]
+        with tempfile.TemporaryDirectory(prefix="roastmaster-") as tmp_dir:
+            with ProcessPoolExecutor(
+                workers, initializer=init_worker, initargs=(tmp_dir,)
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _sweep_serial,
+                        system,
+                        dishes,
+                        [indexed[i] for i in run],
+                        builder,
+                        solve_kwargs,
+                    )
+                    for run in runs
+                ]
+                rows = [row for future in futures for row in future.result()]
+    return pd.DataFrame(rows)
@@ -0,0 +1,258 @@
+"""template.py."""
+import json
+from pathlib import Path
+
+import numpy as np
+import pulp
+from scipy import sparse  # type: ignore
+
+from roastmaster.inmemory import ModelArrays
+from roastmaster.matrix import FIELDS
+from roastmaster.matrix import MatrixModel
+from roastmaster.models import Dish
+from roastmaster.models import System
+
+
+# what a template depends on; dish sizes and the number of shelves are filled in
+SHAPE_FIELDS = ("num_dishes", "total_time", "time_increment", "warm_up_time")
+
+TEMPLATE_VERSION = 1
+
+
+def get_shape(system: System, num_dishes: int) -> tuple[int, float, float, float]:
+    """Returns the shape of a problem, which a template must match.
+
+    Args:
+        system (System): The system configuration.
+        num_dishes (int): The number of dishes.
+
+    Returns:
+        tuple[int, float, float, float]: The values of SHAPE_FIELDS.
+    """
+    return (
+        num_dishes,
+        float(system.total_time),
+        float(system.time_increment),
+        float(system.oven.warm_up_time),
+    )
+
+
+class ModelTemplate:
+    """The constraints of the "matrix" builder, compiled once for a shape.
+
+    Problems with the same number of dishes, total time, time increment and
+    warm-up time share the same constraint structure: only the dish sizes in the
+    oven space rows and the number of shelves bounding them change. A template
+    holds that structure, so that a MatrixModel can fill in those coefficients
+    rather than assemble the constraint matrix. The variable bounds and the
+    objective, which hold the cooking times, windows and weights, are cheap and
+    still built for each problem.
+
+    Attributes:
+        shape (tuple[int, float, float, float]): The values of SHAPE_FIELDS.
+        a (sparse.csr_array): The constraint matrix, with every size set to 1.
+        lb (np.ndarray): The constraint lower bounds.
+        ub (np.ndarray): The constraint upper bounds, with one shelf.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, float, float, float],
+        a: sparse.csr_array,
+        lb: np.ndarray,
+        ub: np.ndarray,
+    ) -> None:
+        """Initializes a ModelTemplate object.
+
+        Args:
+            shape (tuple[int, float, float, float]): The values of SHAPE_FIELDS.
+            a (sparse.csr_array): The constraint matrix, ending with one oven
+                space row per timestep.
+            lb (np.ndarray): The constraint lower bounds.
+            ub (np.ndarray): The constraint upper bounds.
+        """
+        self.shape = shape
+        self.a = sparse.csr_array(a)
+        self.lb = lb
+        self.ub = ub
+        num_dishes, total_time, time_increment, _ = shape
+        self._num_times = _get_num_times(total_time, time_increment)
+        # the entries of the oven space rows, and the dish each one belongs to
+        self._size_entries = np.arange(
+            self.a.indptr[-self._num_times - 1], self.a.indptr[-1]
+        )
+        is_in_start = FIELDS.index("is_in") * num_dishes * self._num_times
+        self._size_dishes = (
+            self.a.indices[self._size_entries] - is_in_start
+        ) // self._num_times
+
+    @classmethod
+    def compile(cls, system: System, num_dishes: int) -> "ModelTemplate":
+        """Compiles the template for a system and number of dishes.
+
+        Args:
+            system (System): The system configuration. Its number of shelves
+                and oven opening penalty do not matter.
+            num_dishes (int): The number of dishes.
+
+        Returns:
+            ModelTemplate: The template.
+        """
+        dishes = [
+            Dish(name=f"dish_{i}", cooking_time_mins=0, size=1)
+            for i in range(num_dishes)
+        ]
+        system = system.model_copy(
+            update={"oven": system.oven.model_copy(update={"num_shelves": 1})}
+        )
+        matrix = MatrixModel(system, dishes)
+        return cls(get_shape(system, num_dishes), matrix.a, matrix.lb, matrix.ub)
+
+    def check_shape(self, system: System, num_dishes: int) -> None:
+        """Raises an exception if a problem does not match the template.
+
+        Args:
+            system (System): The system configuration.
+            num_dishes (int): The number of dishes.
+
+        Raises:
+            ValueError: If the problem's shape differs from the template's.
+        """
+        shape = get_shape(system, num_dishes)
+        if shape != self.shape:
+            raise ValueError(
+                f"The template is for "
+                f"{dict(zip(SHAPE_FIELDS, self.shape, strict=True))}, not "
+                f"{dict(zip(SHAPE_FIELDS, shape, strict=True))}."
+            )
+
+    def fill(
+        self, system: System, size: np.ndarray
+    ) -> tuple[sparse.csr_array, np.ndarray, np.ndarray]:
+        """Fills in the dish sizes and number of shelves.
+
+        Args:
+            system (System): The system configuration.
+            size (np.ndarray): The size of each dish.
+
+        Returns:
+            tuple[sparse.csr_array, np.ndarray, np.ndarray]: The constraint
+                matrix and its lower and upper bounds.
+        """
+        self.check_shape(system, len(size))
+        a = self.a.copy()
+        a.data[self._size_entries] = size[self._size_dishes]
+        ub = self.ub.copy()
+        ub[-self._num_times :] = system.oven.num_shelves
+        return a, self.lb.copy(), ub
+
+    def save(self, path: str | Path) -> None:
+        """Saves the template as an MPS file and a JSON metadata file.
+
+        The constraints are written to the path with an ".mps" suffix, and the
+        shape to the path with a ".json" suffix.
+
+        Args:
+            path (str | Path): The path, with or without a suffix.
+        """
+        path = Path(path)
+        variables = [
+            pulp.LpVariable(
+                name,
+                lowBound=None if name.startswith("time_cooked") else 0,
+                upBound=None if name.startswith("time_cooked") else 1,
+                cat=(
+                    pulp.LpInteger
+                    if name.startswith(("put_in", "take_out"))
+                    else pulp.LpContinuous
+                ),
+            )
+            for name in _get_variable_names(self.shape)
+        ]
+        model = pulp.LpProblem("template", pulp.LpMaximize)
+        for row in range(self.a.shape[0]):
+            entries = slice(self.a.indptr[row], self.a.indptr[row + 1])
+            expression = pulp.LpAffineExpression(
+                zip(
+                    (variables[col] for col in self.a.indices[entries]),
+                    self.a.data[entries],
+                    strict=True,
+                )
+            )
+            if self.lb[row] == self.ub[row]:
+                constraint = expression == self.lb[row]
+            else:
+                constraint = expression <= self.ub[row]
+            model.addConstraint(constraint, f"c{row:07d}")
+        model.writeMPS(str(path.with_suffix(".mps")))
+        metadata = {
+            "version": TEMPLATE_VERSION,
+            "shape": dict(zip(SHAPE_FIELDS, self.shape, strict=True)),
+            "num_variables": self.a.shape[1],
+            "num_constraints": self.a.shape[0],
+        }
+        path.with_suffix(".json").write_text(json.dumps(metadata, indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ModelTemplate":
+        """Loads a template saved by save.
+
+        Args:
+            path (str | Path): The path, with or without a suffix.
+
+        Returns:
+            ModelTemplate: The template.
+
+        Raises:
+            ValueError: If the files are not a template of this version.
+        """
+        path = Path(path)
+        metadata = json.loads(path.with_suffix(".json").read_text())
+        if metadata.get("version") != TEMPLATE_VERSION:
+            raise ValueError(
+                f"{path} is a version {metadata.get('version')} template, "
+                f"expected version {TEMPLATE_VERSION}."
+            )
+        shape = tuple(metadata["shape"][field] for field in SHAPE_FIELDS)
+        _, model = pulp.LpProblem.fromMPS(str(path.with_suffix(".mps")))
+        arrays = ModelArrays(model)
+        # pulp may list the variables in another order, and adds a dummy one
+        names = _get_variable_names(shape)  # type: ignore
+        column = {var.name: i for i, var in enumerate(arrays.variables)}
+        if arrays.a.shape[0] != metadata["num_constraints"] or not all(
+            name in column for name in names
+        ):
+            raise ValueError(f"{path} does not match its metadata.")
+        order = np.array([column[name] for name in names])
+        return cls(shape, arrays.a[:, order], arrays.lb, arrays.ub)  # type: ignore
+
+
+def _get_num_times(total_time: float, time_increment: float) -> int:
+    """Returns the number of timesteps, as in System.get_time_range.
+
+    Args:
+        total_time (float): The total time.
+        time_increment (float): The time increment.
+
+    Returns:
+        int: The number of timesteps.
+    """
+    return len(np.arange(0, total_time + 1, time_increment))
+
+
+def _get_variable_names(shape: tuple[int, float, float, float]) -> list[str]:
+    """Returns a template's variable names, in column order.
+
+    Args:
+        shape (tuple[int, float, float, float]): The values of SHAPE_FIELDS.
+
+    Returns:
+        list[str]: The name of each variable, by field, dish and timestep.
+    """
+    num_dishes, total_time, time_increment, _ = shape
+    return [
+        f"{field}_{i}_{t}"
+        for field in FIELDS
+        for i in range(num_dishes)
+        for t in range(_get_num_times(total_time, time_increment))
+    ]
@@ -0,0 +1,170 @@
+import asyncio
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from roastmaster.aio import SolveExecutor
+from roastmaster.batch import solve_many_async
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.session import Session
+
+
+system = System(
+    total_time=30,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+)
+
+dishes = [
+    Dish(name="potatoes", size=0.5, cooking_time_mins=10, serve_hot_weight=2),
+    Dish(name="carrots", size=0.5, cooking_time_mins=5, serve_hot_weight=1),
+]
+
+# takes CBC well over a minute to prove optimal
+hard_system = System(
+    total_time=300,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=3, oven_opening_penalty=1, warm_up_time=5),
+)
+hard_dishes = [
+    Dish.get_preset(name).model_copy(update={"name": f"{name}_{i}"})
+    for i in range(2)
+    for name in ("turkey", "roast_potatoes", "carrots", "parsnips", "stuffing")
+]
+
+
+@pytest.mark.parametrize("builder", ["expression", "event", "matrix"])
+def test_solve_async(builder: str):
+    expected = Session(system, dishes, builder=builder)
+    expected.solve()
+    session = Session(system, dishes, builder=builder)
+    asyncio.run(session.solve_async())
+    assert session.status == "optimal"
+    assert session.get_objective_value() == pytest.approx(
+        expected.get_objective_value()
+    )
+    assert session.stats.status == "optimal"
+
+
+def test_timeout_keeps_incumbent():
+    session = Session(hard_system, hard_dishes)
+    start = time.perf_counter()
+    asyncio.run(session.solve_async(warm_start=True, timeout=2))
+    assert time.perf_counter() - start < 2 + SolveExecutor().grace_period
+    assert session.status == "feasible"
+    assert len(session.get_results().dish_results) == len(hard_dishes)
+
+
+def test_timeout_includes_queueing():
+    executor = SolveExecutor(max_workers=1, grace_period=5)
+    sessions = [Session(hard_system, hard_dishes) for _ in range(2)]
+
+    async def solve_both() -> list:
+        return await asyncio.gather(
+            *(
+                session.solve_async(warm_start=True, timeout=2, executor=executor)
+                for session in sessions
+            ),
+            return_exceptions=True,
+        )
+
+    start = time.perf_counter()
+    outcomes = asyncio.run(solve_both())
+    # the second solve waited for the worker until its deadline, so never ran
+    assert time.perf_counter() - start < 2 + executor.grace_period
+    assert sessions[0].status == "feasible"
+    assert sessions[1].status == "not_solved"
+    assert isinstance(outcomes[1], SolverError)
+
+
+def test_cancel_keeps_incumbent():
+    session = Session(hard_system, hard_dishes)
+    executor = SolveExecutor(grace_period=10)
+    pids = []
+
+    async def solve_and_cancel() -> None:
+        task = asyncio.create_task(
+            session.solve_async(warm_start=True, executor=executor)
+        )
+        await asyncio.sleep(2)
+        pids.extend(child.pid for child in multiprocessing.active_children())
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(solve_and_cancel())
+    assert session.status == "feasible"
+    assert pids
+    # the child and its CBC process are gone
+    assert not any(_group_exists(pid) for pid in pids)
+
+
+def test_cancel_without_incumbent():
+    session = Session(hard_system, hard_dishes, builder="matrix")
+
+    async def solve_and_cancel() -> None:
+        task = asyncio.create_task(session.solve_async())
+        await asyncio.sleep(1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.perf_counter()
+    asyncio.run(solve_and_cancel())
+    # HiGHS is killed at once, since it cannot report a solution
+    assert time.perf_counter() - start < 3
+    assert session.status == "not_solved"
+    with pytest.raises(SolverError):
+        session.check_solved()
+
+
+def test_solve_many_async():
+    too_long = Dish(name="turkey", size=0.5, cooking_time_mins=150)
+    problems = [(system, dishes), (system, [too_long]), (system, dishes)]
+    outcomes = asyncio.run(solve_many_async(problems, workers=2))
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2]
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    assert outcomes[0].status == "optimal"
+    assert "InfeasibleError" in outcomes[1].error
+
+
+def test_solve_many_async_bounds_problems_in_flight():
+    problems = ((system, dishes) for _ in range(6))
+    peak = 0
+
+    async def solve_and_count() -> list:
+        nonlocal peak
+        solving = asyncio.create_task(solve_many_async(problems, workers=1))
+        while not solving.done():
+            in_flight = sum(
+                getattr(task.get_coro(), "__name__", None) == "solve_problem_async"
+                for task in asyncio.all_tasks()
+            )
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+        return solving.result()
+
+    outcomes = asyncio.run(solve_and_count())
+    assert [outcome.index for outcome in outcomes] == list(range(6))
+    assert all(outcome.ok for outcome in outcomes)
+    assert 0 < peak <= 2
+
+
+def test_large_outcome():
+    # arrives in many reads, each of which must not block the event loop
+    outcome = asyncio.run(SolveExecutor(max_workers=1).run(bytes, 10**7))
+    assert outcome == bytes(10**7)
+
+
+def _group_exists(pgid: int) -> bool:
+    """Returns whether any process is in a process group."""
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    return True
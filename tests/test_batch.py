@@ -0,0 +1,94 @@
+import os
+from pathlib import Path
+
+import pulp
+import pytest
+
+from roastmaster.batch import iter_solve_many
+from roastmaster.batch import solve_many
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.results import Results
+from roastmaster.session import get_solver
+from roastmaster.template import ModelTemplate
+
+
+system_conf = System(
+    total_time=20,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+)
+
+feasible = [Dish(name="pineapple", size=0.3, cooking_time_mins=10)]
+infeasible = [Dish(name="turkey", size=0.3, cooking_time_mins=150)]
+
+problems = [
+    (system_conf, feasible),
+    (system_conf, infeasible),
+    (system_conf, feasible),
+]
+
+
+def test_solve_many():
+    outcomes = solve_many(problems, workers=2)
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2]
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    assert isinstance(outcomes[0].results, Results)
+    assert outcomes[0].status == "optimal"
+    assert "InfeasibleError" in outcomes[1].error
+
+
+def test_iter_solve_many_unordered():
+    outcomes = list(iter_solve_many(iter(problems), workers=2, ordered=False))
+    assert sorted(outcome.index for outcome in outcomes) == [0, 1, 2]
+
+
+def has_solver(name: str) -> bool:
+    try:
+        get_solver(name)
+    except ValueError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(
+    not has_solver("highs"), reason="No pulp HiGHS solver is available."
+)
+def test_solve_many_with_solve_options():
+    outcomes = solve_many(problems[:1], workers=1, builder="state", solver="highs")
+    assert outcomes[0].ok
+
+
+def test_solve_many_with_templates(tmp_path: Path):
+    ModelTemplate.compile(system_conf, 1).save(tmp_path / "template")
+    outcomes = solve_many(
+        problems, workers=2, builder="matrix", templates=[tmp_path / "template"]
+    )
+    expected = solve_many(problems, workers=2, builder="matrix")
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    assert outcomes[0].objective_value == pytest.approx(expected[0].objective_value)
+
+
+class CrashingSolver(pulp.LpSolver):
+    """Kills the worker process, as a solver segfault or the OOM killer would."""
+
+    def actualSolve(self, lp: pulp.LpProblem) -> int:  # noqa: N802
+        """Exits the process at once.
+
+        Args:
+            lp (pulp.LpProblem): The model.
+
+        Returns:
+            int: Never returns.
+        """
+        os._exit(1)
+
+
+def test_worker_crash():
+    crash = (system_conf, feasible, {"solver": CrashingSolver()})
+    outcomes = list(iter_solve_many([crash] + problems * 2, workers=1))
+    assert [outcome.index for outcome in outcomes] == list(range(7))
+    assert "BrokenProcessPool" in outcomes[0].error
+    # later problems run on new workers
+    assert [outcome.ok for outcome in outcomes[-3:]] == [True, False, True]
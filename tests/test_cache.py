@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from roastmaster.cache import ResultCache
+from roastmaster.cache import get_cache_key
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.results import Results
+
+
+system_conf = System(
+    total_time=20,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+)
+
+dish_conf = [
+    Dish(name="pineapple", size=0.3, cooking_time_mins=10, serve_hot_weight=3),
+    Dish(name="mango", size=0.3, cooking_time_mins=5, serve_hot_weight=1),
+]
+
+
+def test_key_ignores_dish_order():
+    assert get_cache_key(system_conf, dish_conf) == get_cache_key(
+        system_conf, dish_conf[::-1]
+    )
+
+
+def test_key_depends_on_values():
+    other = system_conf.model_copy(update={"total_time": 25})
+    assert get_cache_key(system_conf, dish_conf) != get_cache_key(other, dish_conf)
+    assert get_cache_key(system_conf, dish_conf) != get_cache_key(
+        system_conf, dish_conf, builder="state"
+    )
+
+
+def test_memory_hit():
+    cache = ResultCache()
+    first = cache.solve(system_conf, dish_conf)
+    second = cache.solve(system_conf, dish_conf)
+    for name, df in first.dish_results.items():
+        pd.testing.assert_frame_equal(df, second.dish_results[name])
+    assert cache.stats == {"hits": 1, "misses": 1, "disk_hits": 0, "size": 1}
+
+
+def test_hits_are_copies():
+    cache = ResultCache()
+    first = cache.solve(system_conf, dish_conf)
+    first.dish_results["pineapple"]["is_in"] = -1
+    second = cache.solve(system_conf, dish_conf)
+    third = cache.solve(system_conf, dish_conf)
+    second.dish_results["pineapple"]["is_in"] = -1
+    assert (third.dish_results["pineapple"]["is_in"] >= 0).all()
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=1)
+    results = Results({})
+    cache.put(system_conf, dish_conf[:1], results)
+    cache.put(system_conf, dish_conf[1:], results)
+    assert cache.get(system_conf, dish_conf[:1]) is None
+    assert cache.get(system_conf, dish_conf[1:]) is not None
+
+
+def test_disk_hit(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    results = ResultCache(path=path).solve(system_conf, dish_conf)
+    cache = ResultCache(path=path)
+    cached = cache.get(system_conf, dish_conf, builder="expression")
+    assert cache.disk_hits == 1
+    for name, df in results.dish_results.items():
+        pd.testing.assert_frame_equal(df, cached.dish_results[name])
+
+
+@pytest.mark.parametrize("max_disk_bytes", [0, 10**6])
+def test_disk_eviction(tmp_path, max_disk_bytes: int):
+    path = tmp_path / "cache.sqlite"
+    ResultCache(path=path, max_disk_bytes=max_disk_bytes).solve(system_conf, dish_conf)
+    cache = ResultCache(path=path)
+    found = cache.get(system_conf, dish_conf, builder="expression") is not None
+    assert found == (max_disk_bytes > 0)
@@ -0,0 +1,54 @@
+import pytest
+
+from roastmaster.checks import check_feasibility
+from roastmaster.errors import InfeasibleError
+from roastmaster.errors import SolverError
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+
+
+system = System(total_time=60, time_increment=5, oven=Oven(name="oven", num_shelves=2))
+
+
+@pytest.mark.parametrize(
+    "dishes, windows, reason",
+    [
+        ([Dish(name="big", size=3, cooking_time_mins=10)], None, "too_large"),
+        ([Dish(name="long", cooking_time_mins=55)], None, "too_long"),
+        (
+            [Dish(name="late", cooking_time_mins=20)],
+            {"late": (40, 60)},
+            "window_too_short",
+        ),
+        ([Dish(name="odd", cooking_time_mins=12)], None, "off_grid"),
+        (
+            [Dish(name=f"pie_{i}", size=1, cooking_time_mins=30) for i in range(4)],
+            None,
+            "over_capacity",
+        ),
+    ],
+)
+def test_infeasible(dishes: list[Dish], windows: dict | None, reason: str):
+    with pytest.raises(InfeasibleError) as excinfo:
+        check_feasibility(system, dishes, windows)
+    assert excinfo.value.reason == reason
+    assert isinstance(excinfo.value, SolverError)
+
+
+def test_feasible():
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+    check_feasibility(system, dishes, {"chicken": (30, 60)})
+
+
+def test_off_grid_reachable_with_reheating():
+    # 12 + 2 * 4 = 20 minutes is a whole number of steps with two spells
+    oven = Oven(name="oven", warm_up_time=4)
+    dish = Dish(name="odd", cooking_time_mins=12)
+    check_feasibility(system.model_copy(update={"oven": oven}), [dish])
+
+
+def test_off_grid_within_tolerance():
+    # 12 minutes is off the grid, but 15 is within its tolerance
+    dish = Dish(name="odd", cooking_time_mins=12, cooking_time_tolerance_mins=3)
+    check_feasibility(system, [dish])
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from roastmaster.event import EventModel
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.session import Session
+from roastmaster.session import SolverError
+
+
+system_conf = System(total_time=60, oven=Oven(name="oven", num_shelves=1))
+
+dish_conf = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+
+
+def test_matches_expression_builder():
+    system = System(
+        total_time=20,
+        oven=Oven(name="oven", num_shelves=1, warm_up_time=5),
+    )
+    dishes = [Dish(name="pineapple", size=0.3, cooking_time_mins=10)]
+    expression = Session(system, dishes, builder="expression")
+    event = Session(system, dishes, builder="event")
+    expression.solve()
+    event.solve()
+    assert event.get_objective_value() == pytest.approx(
+        expression.get_objective_value()
+    )
+    for name, df in expression.get_results().dish_results.items():
+        pd.testing.assert_frame_equal(df, event.get_results().dish_results[name])
+
+
+def test_matches_expression_objective():
+    expression = Session(system_conf, dish_conf, builder="state")
+    event = Session(system_conf, dish_conf, builder="event")
+    expression.solve()
+    event.solve()
+    assert event.get_objective_value() == pytest.approx(
+        expression.get_objective_value()
+    )
+    results = event.get_results()
+    assert (results.get_aggregated_results()["space_used"] <= 1).all()
+    for dish in dish_conf:
+        df = results.dish_results[dish.name]
+        assert df["time_cooked"].iloc[-1] == dish.cooking_time_mins
+
+
+def test_size_independent_of_time_increment():
+    coarse = EventModel(system_conf, dish_conf)
+    fine = EventModel(system_conf.model_copy(update={"time_increment": 1}), dish_conf)
+    assert len(fine.model.variables()) == len(coarse.model.variables())
+    assert fine.model.numConstraints() == coarse.model.numConstraints()
+
+
+def test_cold_dish():
+    dishes = [Dish(name="salad", cooking_time_mins=10, serve_hot_weight=-1)]
+    session = Session(system_conf, dishes, builder="event")
+    session.solve()
+    assert session.get_results().dish_results["salad"]["is_in"].iloc[-4:].sum() == 0
+
+
+def test_infeasible():
+    # three dishes of 40 minutes each cannot share one shelf in an hour
+    dishes = [Dish(name=f"pie_{i}", size=1, cooking_time_mins=30) for i in range(3)]
+    with pytest.raises(SolverError):
+        Session(system_conf, dishes, builder="event").solve()
+
+
+@pytest.mark.parametrize(
+    "dish", [Dish.get_preset("turkey"), Dish.get_preset("nut_roast")]
+)
+def test_does_not_fit(dish: Dish):
+    with pytest.raises(SolverError):
+        Session(system_conf, [dish], builder="event")
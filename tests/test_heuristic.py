@@ -0,0 +1,89 @@
+import pytest
+
+from roastmaster.dish import score_results
+from roastmaster.heuristic import GreedyScheduler
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.results import Results
+from roastmaster.session import Session
+from roastmaster.session import SolverError
+
+
+system_conf = System(
+    total_time=20,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+)
+
+dish_conf = [
+    Dish(name="pineapple", size=0.3, cooking_time_mins=10, serve_hot_weight=3),
+]
+
+preset_system = System(total_time=180, oven=Oven(name="oven"))
+
+preset_dishes = [
+    Dish.get_preset(name)
+    for name in ("turkey", "roast_potatoes", "carrots", "parsnips", "stuffing")
+]
+
+
+def test_matches_milp_on_simple_instance():
+    heuristic = GreedyScheduler(system_conf, dish_conf)
+    heuristic.solve()
+    session = Session(system_conf, dish_conf)
+    session.solve()
+    assert heuristic.get_objective_value() == pytest.approx(
+        session.get_objective_value()
+    )
+
+
+def test_schedule_is_feasible():
+    heuristic = GreedyScheduler(preset_system, preset_dishes)
+    heuristic.solve()
+    results = heuristic.get_results()
+    assert isinstance(results, Results)
+    aggregated = results.get_aggregated_results()
+    assert (aggregated["space_used"] <= preset_system.oven.num_shelves).all()
+    for dish in preset_dishes:
+        df = results.dish_results[dish.name]
+        assert df["time_cooked"].iloc[-1] == dish.cooking_time_mins
+        assert df["is_in"].iloc[-1] == 0
+
+
+def test_score_does_not_beat_milp():
+    heuristic = GreedyScheduler(preset_system, preset_dishes)
+    heuristic.solve()
+    session = Session(preset_system, preset_dishes, builder="matrix")
+    session.solve()
+    assert heuristic.get_objective_value() <= session.get_objective_value() + 1e-6
+
+
+def test_score_results_matches_objective():
+    session = Session(preset_system, preset_dishes, builder="matrix")
+    session.solve()
+    results = session.get_results().dish_results
+    score = sum(
+        score_results(preset_system, dish, results[dish.name]) for dish in preset_dishes
+    )
+    assert score == pytest.approx(session.get_objective_value())
+
+
+def test_print_instructions(capsys):
+    heuristic = GreedyScheduler(system_conf, dish_conf)
+    heuristic.solve()
+    heuristic.get_results().print_instructions()
+    assert "5.0 minutes: Put in the pineapple." in capsys.readouterr().out
+
+
+def test_no_room():
+    system = System(total_time=20, oven=Oven(name="oven", num_shelves=1))
+    dishes = [Dish(name=name, cooking_time_mins=10, size=1) for name in "ab"]
+    with pytest.raises(SolverError):
+        GreedyScheduler(system, dishes).solve()
+
+
+def test_unreachable_cooking_time():
+    dishes = [Dish(name="odd", cooking_time_mins=12)]
+    with pytest.raises(SolverError):
+        GreedyScheduler(system_conf, dishes).solve()
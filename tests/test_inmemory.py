@@ -0,0 +1,74 @@
+import numpy as np
+import pulp
+import pytest
+
+from roastmaster.errors import SolverError
+from roastmaster.inmemory import InMemoryHiGHS
+from roastmaster.inmemory import ModelArrays
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.session import Session
+
+
+dishes = [
+    Dish(name="potatoes", size=1, cooking_time_mins=20, serve_hot_weight=2),
+    Dish(name="carrots", size=0.5, cooking_time_mins=10, serve_hot_weight=1),
+    Dish(name="puddings", size=0.5, cooking_time_mins=15, serve_hot_weight=5),
+]
+
+system = System(
+    total_time=60,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1.5, oven_opening_penalty=1, warm_up_time=5),
+)
+
+
+def test_model_arrays():
+    x = pulp.LpVariable("x", 0, 3, cat="Integer")
+    y = pulp.LpVariable("y", lowBound=1)
+    model = pulp.LpProblem("test", pulp.LpMaximize)
+    model += x + 2 * y + 1
+    model += 2 * x + y <= 5
+    model += x - y == 0
+    model += y >= 0.5
+    arrays = ModelArrays(model)
+    assert [var.name for var in arrays.variables] == ["x", "y"]
+    np.testing.assert_array_equal(arrays.c, [-1, -2])
+    assert arrays.objective_constant == -1
+    np.testing.assert_array_equal(arrays.a.toarray(), [[2, 1], [1, -1], [0, 1]])
+    np.testing.assert_array_equal(arrays.lb, [-np.inf, 0, 0.5])
+    np.testing.assert_array_equal(arrays.ub, [5, 0, np.inf])
+    np.testing.assert_array_equal(arrays.bounds.lb, [0, 1])
+    np.testing.assert_array_equal(arrays.bounds.ub, [3, np.inf])
+    np.testing.assert_array_equal(arrays.integrality, [1, 0])
+
+
+@pytest.mark.parametrize("builder", ["expression", "state", "event"])
+def test_matches_cbc(builder: str):
+    cbc = Session(system, dishes, builder=builder)
+    cbc.solve(solver=pulp.PULP_CBC_CMD(msg=False))
+    session = Session(system, dishes, builder=builder)
+    session.solve(solver="inmemory", time_limit=10, gap_rel=0)
+    assert session.is_optimal
+    assert session.get_objective_value() == pytest.approx(cbc.get_objective_value())
+    put_in = session.get_results().values[:, :, 1]
+    assert set(np.unique(put_in)) <= {0, 1}
+
+
+def test_infeasible():
+    # the dishes cannot share the oven, nor both cook in turn
+    pies = [Dish(name=name, size=1, cooking_time_mins=30) for name in "ab"]
+    for solver in (InMemoryHiGHS(), None):
+        session = Session(system, pies)
+        with pytest.raises(SolverError):
+            session.solve(solver=solver)
+        assert session.status == "infeasible"
+
+
+def test_unsupported_options():
+    session = Session(system, dishes)
+    with pytest.raises(ValueError):
+        session.solve(solver="inmemory", threads=2)
+    with pytest.raises(ValueError):
+        session.solve(solver="inmemory", warm_start=True)
@@ -1,8 +1,16 @@
 """Test cases for the __main__ module."""
+import json
+import subprocess  # nosec
+import sys
+from pathlib import Path
+
 import pytest
 from click.testing import CliRunner
 
+import roastmaster
 from roastmaster import __main__
+from roastmaster.models import Oven
+from roastmaster.models import System
 
 
 @pytest.fixture
@@ -15,3 +23,102 @@ def test_main_succeeds(runner: CliRunner) -> None:
     """It exits with a status code of zero."""
     result = runner.invoke(__main__.main)
     assert result.exit_code == 0
+
+
+def _get_loaded(module: str) -> list[str]:
+    """Returns the heavy libraries loaded by importing a module afresh."""
+    script = (
+        f"import sys, {module}; "
+        "print(*[m for m in ('pandas', 'scipy', 'pulp') if m in sys.modules])"
+    )
+    output = subprocess.run(  # nosec
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return output.split()
+
+
+@pytest.mark.parametrize("module", ["roastmaster", "roastmaster.__main__"])
+def test_lazy_imports(module: str) -> None:
+    """It starts without loading the solver and numerical libraries."""
+    assert _get_loaded(module) == []
+
+
+def test_session_imports() -> None:
+    """It loads pandas and scipy only when they are needed."""
+    assert _get_loaded("roastmaster.session") == ["pulp"]
+
+
+def test_lazy_attributes() -> None:
+    """It still exposes the public names."""
+    from roastmaster.session import Session
+
+    assert roastmaster.Session is Session
+    assert "Dish" in dir(roastmaster)
+    with pytest.raises(AttributeError):
+        roastmaster.Missing  # noqa: B018
+
+
+def test_solve(runner: CliRunner) -> None:
+    """It writes a JSON line for each problem, including invalid ones."""
+    system = System(
+        total_time=30,
+        time_increment=5,
+        oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+    )
+    problem = {
+        "system": system.model_dump(mode="json"),
+        "dishes": [{"name": "potatoes", "cooking_time_mins": 10}],
+    }
+    lines = [
+        json.dumps(problem),
+        "{not json",
+        "",
+        json.dumps({**problem, "dishes": [{"name": "turkey"}]}),
+        json.dumps({**problem, "builder": "state"}),
+    ]
+    result = runner.invoke(
+        __main__.main, ["solve", "--workers", "2"], input="\n".join(lines)
+    )
+    assert result.exit_code == 0
+    records = {
+        record["line"]: record for record in map(json.loads, result.stdout.splitlines())
+    }
+    assert set(records) == {1, 2, 4, 5}
+    assert records[1]["status"] == records[5]["status"] == "optimal"
+    assert set(records[1]["results"]) == {"potatoes"}
+    assert "JSONDecodeError" in records[2]["error"]
+    assert "ValidationError" in records[4]["error"]
+
+
+def test_solve_with_template(runner: CliRunner, tmp_path: Path) -> None:
+    """It compiles a template, which the workers fill in for the matrix builder."""
+    result = runner.invoke(
+        __main__.main,
+        [
+            "template",
+            str(tmp_path / "template"),
+            "--dishes",
+            "1",
+            "--total-time",
+            "30",
+            "--warm-up-time",
+            "5",
+        ],
+    )
+    assert result.exit_code == 0
+    system = System(total_time=30, oven=Oven(name="oven", warm_up_time=5))
+    problem = {
+        "system": system.model_dump(mode="json"),
+        "dishes": [{"name": "potatoes", "cooking_time_mins": 10}],
+    }
+    result = runner.invoke(
+        __main__.main,
+        ["solve", "--builder", "matrix", "--template", str(tmp_path / "template")],
+        input=json.dumps(problem),
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["status"] == "optimal"
+    result = runner.invoke(
+        __main__.main, ["solve", "--template", str(tmp_path / "missing")], input=""
+    )
+    assert result.exit_code != 0
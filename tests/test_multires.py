@@ -0,0 +1,44 @@
+import pytest
+
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.multires import get_coarse_dish
+from roastmaster.multires import solve_coarse_to_fine
+from roastmaster.session import Session
+
+
+system_conf = System(
+    total_time=60, time_increment=5, oven=Oven(name="oven", num_shelves=1)
+)
+
+dish_conf = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+
+
+def test_coarse_dish():
+    coarse = get_coarse_dish(Dish.get_preset("carrots"), system_conf, 15)
+    # 25 minutes plus 10 warm-up rounds to 30 in the oven
+    assert coarse.cooking_time_mins == 20
+
+
+@pytest.mark.parametrize("builder", ["state", "matrix"])
+def test_matches_full_solve(builder: str):
+    fine = solve_coarse_to_fine(system_conf, dish_conf, builder=builder)
+    full = Session(system_conf, dish_conf, builder=builder)
+    full.solve()
+    assert fine.windows
+    assert fine.get_objective_value() == pytest.approx(full.get_objective_value())
+    for dish in dish_conf:
+        df = fine.get_results().dish_results[dish.name]
+        assert df["time_cooked"].iloc[-1] == dish.cooking_time_mins
+
+
+def test_fewer_variables():
+    fine = solve_coarse_to_fine(system_conf, dish_conf)
+    full = Session(system_conf, dish_conf, builder="state")
+    assert len(fine.model.variables()) < len(full.model.variables())
+
+
+def test_bad_increment():
+    with pytest.raises(ValueError):
+        solve_coarse_to_fine(system_conf, dish_conf, coarse_increment=7)
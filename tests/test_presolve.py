@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.presolve import get_put_in_window
+from roastmaster.presolve import get_symmetric_groups
+from roastmaster.presolve import get_take_out_window
+from roastmaster.session import Session
+
+
+system_conf = System(total_time=60, oven=Oven(name="oven", num_shelves=1))
+
+dish_conf = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+
+
+def test_windows():
+    carrots = Dish.get_preset("carrots")
+    # 25 minutes plus 10 warm-up, or reheated after an earlier spell
+    assert get_put_in_window(system_conf, carrots) == (0, 55)
+    assert get_take_out_window(system_conf, carrots) == (5, 60)
+    assert get_put_in_window(system_conf, carrots, single_spell=True) == (0, 25)
+    assert get_take_out_window(system_conf, carrots, single_spell=True) == (35, 60)
+
+
+@pytest.mark.parametrize("builder", ["expression", "state", "matrix"])
+def test_safe_presolve_matches_full_model(builder: str):
+    full = Session(system_conf, dish_conf, builder=builder)
+    presolved = Session(system_conf, dish_conf, builder=builder, presolve="safe")
+    full.solve()
+    presolved.solve()
+    assert presolved.get_objective_value() == pytest.approx(full.get_objective_value())
+    assert full.get_presolve_stats()["variables"] == 0
+    assert presolved.get_presolve_stats()["variables"] == 2 * len(dish_conf)
+
+
+def test_single_spell_presolve():
+    session = Session(system_conf, dish_conf, builder="state", presolve="single_spell")
+    full = Session(system_conf, dish_conf, builder="state")
+    assert len(session.model.variables()) < len(full.model.variables())
+    session.solve()
+    for dish in dish_conf:
+        df = session.get_results().dish_results[dish.name]
+        assert df["put_in"].sum() == 1
+        assert df["time_cooked"].iloc[-1] == dish.cooking_time_mins
+
+
+def test_unknown_presolve():
+    with pytest.raises(ValueError):
+        Session(system_conf, dish_conf, presolve="nonsense")
+
+
+def test_symmetric_groups():
+    dishes = dish_conf + [Dish.get_preset("stuffing"), Dish.get_preset("turkey")]
+    assert get_symmetric_groups(dishes) == [[1, 2, 3]]
+    assert get_symmetric_groups(dishes, {"parsnips": (0, 30)}) == [[1, 3]]
+
+
+@pytest.mark.parametrize("builder", ["state", "matrix", "event"])
+def test_symmetry_breaking_keeps_optimum(builder: str):
+    dishes = dish_conf + [Dish.get_preset("stuffing")]
+    system = System(total_time=60, oven=Oven(name="oven", num_shelves=1.5))
+    broken = Session(system, dishes, builder=builder, symmetry_breaking=True)
+    full = Session(system, dishes, builder=builder)
+    # the matrix builder has no warm starts
+    broken.solve(warm_start=builder != "matrix")
+    full.solve()
+    assert broken.get_objective_value() == pytest.approx(full.get_objective_value())
+    keys = []
+    for name in ("carrots", "parsnips", "stuffing"):
+        results = broken.get_results().dish_results[name]
+        put_in = results["put_in"].to_numpy() @ np.arange(1, len(results) + 1)
+        is_out = 0 if builder == "event" else 1 - results["is_in"].iloc[-2]
+        keys.append((is_out, put_in))
+    assert keys == sorted(keys)
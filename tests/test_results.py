@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from roastmaster.results import FIELDS
+from roastmaster.results import Results
+
+
+time_range = np.array([0.0, 5.0, 10.0])
+
+values = np.arange(2 * 3 * len(FIELDS), dtype=float).reshape(2, 3, len(FIELDS))
+
+
+def test_from_array():
+    results = Results.from_array(values, ["beef", "peas"], time_range)
+    assert list(results.dish_results) == ["beef", "peas"]
+    df = results.dish_results["peas"]
+    assert list(df.columns) == list(FIELDS)
+    np.testing.assert_array_equal(df.index, time_range)
+    np.testing.assert_array_equal(df.to_numpy(), values[1])
+    assert results.dish_results["peas"] is df
+
+
+def test_aggregated_results():
+    results = Results.from_array(values, ["beef", "peas"], time_range)
+    np.testing.assert_array_equal(
+        results.get_aggregated_results().to_numpy(), values.sum(axis=0)
+    )
+    assert Results().get_aggregated_results().empty
+
+
+def test_from_frames():
+    frames = {
+        name: pd.DataFrame(values[i], index=time_range, columns=list(FIELDS))
+        for i, name in enumerate(["beef", "peas"])
+    }
+    results = Results(frames)
+    np.testing.assert_array_equal(results.values, values)
+    np.testing.assert_array_equal(results.time_range, time_range)
+
+
+def test_dict_round_trip():
+    results = Results.from_array(values, ["beef", "peas"], time_range)
+    restored = Results.from_dict(results.to_dict())
+    assert restored.names == results.names
+    np.testing.assert_array_equal(restored.values, values)
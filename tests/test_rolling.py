@@ -0,0 +1,71 @@
+import numpy as np
+import pulp
+import pytest
+
+from roastmaster.dish import DishOpt
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.results import FIELDS
+from roastmaster.rolling import RollingHorizon
+
+
+dishes = [
+    Dish(name="joint", size=1, cooking_time_mins=80, serve_hot_weight=1),
+    Dish(name="potatoes", size=1, cooking_time_mins=30, serve_hot_weight=2),
+    Dish(name="carrots", size=0.5, cooking_time_mins=20, serve_hot_weight=1),
+]
+
+system = System(
+    total_time=150,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=2, oven_opening_penalty=1, warm_up_time=10),
+)
+
+
+def test_window_state():
+    # already in the oven for 20 minutes, so the timesteps at 120 and 125 cook it
+    model = pulp.LpProblem("test", pulp.LpMaximize)
+    dish = DishOpt(
+        model,
+        system,
+        Dish(name="pie", cooking_time_mins=30, serve_hot_weight=0),
+        start=120,
+        initial_state=(1, 20),
+    )
+    model += dish.get_score()
+    model.solve(pulp.PULP_CBC_CMD(msg=False))
+    assert dish.time_range[0] == 120
+    put_in, take_out = dish.get_decision_values()
+    assert put_in.sum() == 0
+    assert dish.time_range[take_out.argmax()] == 130
+    results = dish.get_results()
+    assert results["is_in"].tolist() == [1, 1, 0, 0, 0, 0, 0]
+    assert results["time_cooked"].tolist() == [25, 30, 30, 30, 30, 30, 30]
+    for time in dish.time_range:
+        assert results.loc[time, "time_cooked"] == pulp.value(dish.time_cooked[time])
+
+
+@pytest.mark.parametrize("builder", ["expression", "state"])
+def test_rolling_horizon(builder: str):
+    rolling = RollingHorizon(system, dishes, window=30, overlap=30, builder=builder)
+    rolling.solve(solver=pulp.PULP_CBC_CMD(msg=False))
+    assert rolling.status == "feasible"
+    assert len(rolling.window_stats) >= 4
+    values = rolling.get_results().values
+    time_cooked = values[:, -1, FIELDS.index("time_cooked")]
+    np.testing.assert_allclose(time_cooked, [dish.cooking_time_mins for dish in dishes])
+    assert values[:, -1, FIELDS.index("is_in")].sum() == 0
+    assert values[:, :, FIELDS.index("space_used")].sum(0).max() <= 2
+
+    comparison = rolling.compare_with_full(solver=pulp.PULP_CBC_CMD(msg=False))
+    assert comparison["objective"] == rolling.get_objective_value()
+    assert comparison["full_status"] == "optimal"
+    assert comparison["gap"] >= -1e-9
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        RollingHorizon(system, dishes, window=12)
+    with pytest.raises(ValueError):
+        RollingHorizon(system, dishes, builder="matrix")
@@ -0,0 +1,155 @@
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+
+import pytest
+
+from roastmaster.errors import QueueFullError
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.server import SchedulingServer
+from roastmaster.server import SchedulingService
+
+
+system = System(
+    total_time=30,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+)
+
+dishes = [
+    Dish(name="potatoes", size=0.5, cooking_time_mins=10, serve_hot_weight=2),
+    Dish(name="carrots", size=0.5, cooking_time_mins=5, serve_hot_weight=1),
+]
+
+problem = {
+    "system": system.model_dump(mode="json"),
+    "dishes": [dish.model_dump(mode="json") for dish in dishes],
+}
+
+# takes CBC well over a minute to prove optimal
+hard_system = System(
+    total_time=300,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=3, oven_opening_penalty=1, warm_up_time=5),
+)
+hard_dishes = [
+    Dish.get_preset(name).model_copy(update={"name": f"{name}_{i}"})
+    for i in range(2)
+    for name in ("turkey", "roast_potatoes", "carrots", "parsnips", "stuffing")
+]
+
+
+@pytest.fixture
+def server() -> Iterator[SchedulingServer]:
+    service = SchedulingService(workers=1, max_queue=0)
+    server = SchedulingServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def request(
+    server: SchedulingServer, path: str, body: bytes | None = None
+) -> tuple[int, dict]:
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    try:
+        with urllib.request.urlopen(url, data=body, timeout=60) as response:  # nosec
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_solve(server: SchedulingServer):
+    status, body = request(server, "/solve", json.dumps(problem).encode())
+    assert status == 200
+    assert body["status"] == "optimal"
+    assert set(body["results"]) == {"potatoes", "carrots"}
+    status, metrics = request(server, "/metrics")
+    assert status == 200
+    assert metrics["requests"] == metrics["solves"] == 1
+    assert metrics["queue_depth"] == metrics["in_flight"] == 0
+    assert metrics["latency"]["count"] == 1
+    assert metrics["latency"]["p95"] > 0
+
+
+@pytest.mark.parametrize(
+    "body, status",
+    [
+        (b"{not json", 400),
+        (json.dumps({**problem, "colour": "red"}).encode(), 400),
+        (json.dumps({**problem, "dishes": [{"name": "x"}]}).encode(), 400),
+        (
+            json.dumps(
+                {**problem, "dishes": [{"name": "turkey", "cooking_time_mins": 150}]}
+            ).encode(),
+            422,
+        ),
+    ],
+)
+def test_bad_problems(server: SchedulingServer, body: bytes, status: int):
+    assert request(server, "/solve", body)[0] == status
+
+
+def test_coalescing_and_backpressure(server: SchedulingServer):
+    service = server.service
+    future, coalesced = service.submit(hard_system, hard_dishes, time_limit=2)
+    assert not coalesced
+    # the same problem, listed in another order, joins the solve in flight
+    same_future, coalesced = service.submit(
+        hard_system, hard_dishes[::-1], time_limit=2
+    )
+    assert coalesced
+    assert same_future is future
+    # a different problem does not fit in the queue
+    with pytest.raises(QueueFullError):
+        service.submit(system, dishes)
+    status, body = request(server, "/solve", json.dumps(problem).encode())
+    assert status == 503
+    assert "full" in body["error"]
+
+    future.result()
+    metrics = service.get_metrics()
+    assert metrics["solves"] == 1
+    assert metrics["coalesced"] == 1
+    assert metrics["rejected"] == 2
+
+
+def test_worker_crash(server: SchedulingServer):
+    hard_problem = {
+        "system": hard_system.model_dump(mode="json"),
+        "dishes": [dish.model_dump(mode="json") for dish in hard_dishes],
+        "time_limit": 5,
+    }
+    responses = []
+    thread = threading.Thread(
+        target=lambda: responses.append(
+            request(server, "/solve", json.dumps(hard_problem).encode())
+        )
+    )
+    thread.start()
+    while not server.service.get_metrics()["in_flight"]:
+        time.sleep(0.1)
+    time.sleep(1)
+    # as the OOM killer would
+    for child in multiprocessing.active_children():
+        assert child.pid is not None
+        os.kill(child.pid, signal.SIGKILL)
+    thread.join()
+    status, body = responses[0]
+    assert status == 500
+    assert "BrokenProcessPool" in body["error"]
+    # the next request gets new workers
+    status, body = request(server, "/solve", json.dumps(problem).encode())
+    assert status == 200
+    assert server.service.get_metrics()["restarts"] == 1
@@ -1,11 +1,16 @@
+import numpy as np
 import pandas as pd
+import pulp
 import pytest
 
+from roastmaster.errors import InfeasibleError
 from roastmaster.models import Dish
 from roastmaster.models import Oven
 from roastmaster.models import System
 from roastmaster.results import Results
 from roastmaster.session import Session
+from roastmaster.session import SolverError
+from roastmaster.session import get_solver
 
 
 dish_conf: list[Dish] = [
@@ -24,6 +29,19 @@ def opt() -> Session:
     return Session(system_conf, dish_conf)
 
 
+def has_solver(name: str) -> bool:
+    try:
+        get_solver(name)
+    except ValueError:
+        return False
+    return True
+
+
+requires_highs = pytest.mark.skipif(
+    not has_solver("highs"), reason="No pulp HiGHS solver is available."
+)
+
+
 def test_init(opt: Session):
     assert isinstance(opt, Session)
 
@@ -44,3 +62,204 @@ def test_aggregated_results(opt: Session):
     opt.solve()
     results = opt.get_results().get_aggregated_results()
     assert isinstance(results, pd.DataFrame)
+
+
+def test_unknown_builder():
+    with pytest.raises(ValueError):
+        Session(system_conf, dish_conf, builder="nonsense")
+
+
+def test_state_builder_matches_expression_builder():
+    expression = Session(system_conf, dish_conf, builder="expression")
+    state = Session(system_conf, dish_conf, builder="state")
+    expression.solve()
+    state.solve()
+    for name, df in expression.get_results().dish_results.items():
+        pd.testing.assert_frame_equal(df, state.get_results().dish_results[name])
+
+
+def test_state_builder_matches_expression_objective():
+    system = System(total_time=60, oven=Oven(name="oven", num_shelves=1))
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+    expression = Session(system, dishes, builder="expression")
+    state = Session(system, dishes, builder="state")
+    expression.solve()
+    state.solve()
+    assert pulp.value(state.model.objective) == pytest.approx(
+        pulp.value(expression.model.objective)
+    )
+
+
+def test_matrix_builder_matches_expression_builder():
+    expression = Session(system_conf, dish_conf, builder="expression")
+    matrix = Session(system_conf, dish_conf, builder="matrix")
+    expression.solve()
+    matrix.solve()
+    assert matrix.get_objective_value() == pytest.approx(
+        expression.get_objective_value()
+    )
+    for name, df in expression.get_results().dish_results.items():
+        pd.testing.assert_frame_equal(df, matrix.get_results().dish_results[name])
+
+
+def test_matrix_builder_matches_expression_objective():
+    system = System(total_time=60, oven=Oven(name="oven", num_shelves=1))
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+    expression = Session(system, dishes, builder="expression")
+    matrix = Session(system, dishes, builder="matrix")
+    expression.solve()
+    matrix.solve()
+    assert matrix.get_objective_value() == pytest.approx(
+        expression.get_objective_value()
+    )
+
+
+@pytest.mark.parametrize("builder", ["expression", "state", "matrix", "event"])
+def test_cooking_time_tolerance(builder: str):
+    # 12 minutes plus warm-up is off the grid, so only the tolerance allows it
+    dish = Dish(name="odd", cooking_time_mins=12, cooking_time_tolerance_mins=3)
+    system = system_conf.model_copy(update={"total_time": 30})
+    session = Session(system, [dish], builder=builder)
+    session.solve()
+    time_cooked = session.get_results().dish_results["odd"]["time_cooked"]
+    assert 9 - 1e-6 <= time_cooked.iloc[-1] <= 15 + 1e-6
+
+
+def test_matrix_results_have_no_negative_zeros():
+    session = Session(system_conf, dish_conf, builder="matrix")
+    session.solve()
+    # HiGHS may return binaries a hair below zero
+    session.matrix.solution = session.matrix.solution - 1e-12
+    assert not np.signbit(session.get_results().values).any()
+
+
+@pytest.mark.parametrize("solver", ["cbc", pytest.param("highs", marks=requires_highs)])
+def test_solve_with_options(opt: Session, solver: str):
+    opt.solve(solver=solver, time_limit=10, gap_rel=0.01, threads=1)
+    assert opt.status == "optimal"
+    assert opt.is_optimal
+
+
+@pytest.mark.skipif(
+    not hasattr(pulp, "HiGHS") or not pulp.HiGHS().available(),
+    reason="pulp.HiGHS needs pulp 2.8 or later and highspy.",
+)
+def test_solve_with_pulp_solver(opt: Session):
+    opt.solve(solver=pulp.HiGHS(msg=False))
+    assert opt.is_optimal
+
+
+def test_solve_unknown_solver(opt: Session):
+    with pytest.raises(ValueError):
+        opt.solve(solver="nonsense")
+
+
+def test_matrix_solve_with_options():
+    session = Session(system_conf, dish_conf, builder="matrix")
+    session.solve(time_limit=10, gap_rel=0.01)
+    assert session.is_optimal
+    with pytest.raises(ValueError):
+        session.solve(threads=2)
+
+
+def test_solve_infeasible():
+    # passes the pre-checks, but the dishes can neither share nor take turns
+    system = System(total_time=60, oven=Oven(name="oven", num_shelves=1.5))
+    session = Session(
+        system, [Dish(name=n, size=1, cooking_time_mins=30) for n in "ab"]
+    )
+    with pytest.raises(SolverError):
+        session.solve()
+    assert session.status == "infeasible"
+
+
+def test_precheck_infeasible():
+    system = System(total_time=10, oven=Oven(name="oven"))
+    with pytest.raises(InfeasibleError) as excinfo:
+        Session(system, [Dish.get_preset("turkey")])
+    assert excinfo.value.reason == "too_long"
+    session = Session(system, [])
+    with pytest.raises(InfeasibleError):
+        session.add_dish(Dish.get_preset("turkey"))
+    assert session.dishes == []
+
+
+@pytest.mark.parametrize("builder", ["expression", "state", "event"])
+def test_warm_start(builder: str):
+    system = System(total_time=60, oven=Oven(name="oven", num_shelves=1))
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+    cold = Session(system, dishes, builder=builder)
+    warm = Session(system, dishes, builder=builder)
+    cold.solve()
+    warm.solve(warm_start=True)
+    assert warm.get_objective_value() == pytest.approx(cold.get_objective_value())
+
+
+def test_warm_start_unsupported(opt: Session):
+    # available wherever scipy is, but cannot warm start
+    with pytest.raises(ValueError, match="does not support warm starts"):
+        opt.solve(solver="inmemory", warm_start=True)
+
+
+edit_system = System(total_time=60, oven=Oven(name="oven", num_shelves=1))
+
+
+def solved_objective(dishes: list[Dish]) -> float:
+    session = Session(edit_system, dishes)
+    session.solve()
+    return session.get_objective_value()
+
+
+@pytest.mark.parametrize("builder", ["expression", "state"])
+def test_add_dish(builder: str):
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+    session = Session(edit_system, dishes[:2], builder=builder)
+    session.solve()
+    session.add_dish(dishes[2])
+    assert session.is_optimal
+    assert session.get_objective_value() == pytest.approx(solved_objective(dishes))
+    assert set(session.get_results().dish_results) == {d.name for d in dishes}
+
+
+@pytest.mark.parametrize("builder", ["expression", "state"])
+def test_remove_dish(builder: str):
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots", "parsnips")]
+    session = Session(edit_system, dishes, builder=builder)
+    session.solve()
+    session.remove_dish("carrots")
+    remaining = [dishes[0], dishes[2]]
+    assert session.get_objective_value() == pytest.approx(solved_objective(remaining))
+    assert session.model is not None
+    assert not any("carrots" in var.name for var in session.model.variables())
+
+
+def test_update_dish():
+    dishes = [Dish.get_preset(name) for name in ("chicken", "carrots")]
+    session = Session(edit_system, dishes)
+    session.solve()
+    longer = dishes[1].model_copy(update={"cooking_time_mins": 30})
+    session.update_dish(longer)
+    assert session.get_objective_value() == pytest.approx(
+        solved_objective([dishes[0], longer])
+    )
+    results = session.get_results().dish_results["carrots"]
+    assert results["time_cooked"].iloc[-1] == 30
+
+
+def test_edit_without_resolve():
+    session = Session(edit_system, [Dish.get_preset("chicken")])
+    session.solve()
+    session.add_dish(Dish.get_preset("carrots"), resolve=False)
+    assert session.status == "not_solved"
+    with pytest.raises(SolverError):
+        session.get_results()
+
+
+def test_edit_errors():
+    session = Session(edit_system, [Dish.get_preset("chicken")])
+    with pytest.raises(ValueError):
+        session.add_dish(Dish.get_preset("chicken"))
+    with pytest.raises(KeyError):
+        session.remove_dish("carrots")
+    with pytest.raises(ValueError):
+        Session(edit_system, [], builder="matrix").add_dish(Dish.get_preset("chicken"))
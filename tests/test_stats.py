@@ -0,0 +1,78 @@
+import pulp
+import pytest
+
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.session import Session
+from roastmaster.stats import SessionStats
+from roastmaster.stats import StatsRecorder
+
+
+dishes = [
+    Dish(name="potatoes", size=0.5, cooking_time_mins=10, serve_hot_weight=2),
+    Dish(name="carrots", size=0.5, cooking_time_mins=5, serve_hot_weight=1),
+]
+
+system = System(
+    total_time=30,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1, oven_opening_penalty=1, warm_up_time=5),
+)
+
+
+def test_nested_phases():
+    recorder = StatsRecorder(track_memory=True)
+    with recorder.phase("outer"):
+        with recorder.phase("inner"):
+            data = [0] * 100_000
+        del data
+    phases = recorder.stats.phases
+    assert set(phases) == {"outer", "inner"}
+    assert phases["inner"].peak_memory >= 100_000 * 8
+    assert phases["outer"].peak_memory >= phases["inner"].peak_memory
+
+
+def test_session_stats():
+    calls = []
+    session = Session(
+        system, dishes, stats_callback=lambda name, stats: calls.append(name)
+    )
+    session.solve(solver=pulp.PULP_CBC_CMD(msg=False))
+    session.get_results()
+    stats = session.stats
+    assert isinstance(stats, SessionStats)
+    assert list(stats.phases) == [
+        "build_dishes",
+        "add_shared_constraints",
+        "write_model",
+        "solve",
+        "get_results",
+    ]
+    assert calls == list(stats.phases)
+    assert all(phase.peak_memory is None for phase in stats.phases.values())
+    assert stats.num_variables == len(session.model.variables())
+    assert stats.num_constraints == session.model.numConstraints()
+    assert stats.num_nonzeros > stats.num_constraints
+    assert stats.status == "optimal"
+    assert stats.to_dict()["phases"]["solve"]["wall_time"] >= 0
+
+
+@pytest.mark.parametrize("builder", ["matrix", "event"])
+def test_builder_stats(builder: str):
+    session = Session(system, dishes, builder=builder, track_memory=True)
+    session.solve()
+    stats = session.stats
+    assert "build_model" in stats.phases
+    peak_memory = stats.phases["solve"].peak_memory
+    assert peak_memory is not None and peak_memory > 0
+    assert stats.num_variables is not None and stats.num_variables > 0
+    assert stats.status == "optimal"
+
+
+def test_edit_updates_size():
+    session = Session(system, dishes[:1])
+    num_variables = session.stats.num_variables
+    session.add_dish(dishes[1])
+    assert session.stats.num_variables > num_variables
+    assert session.stats.status == "not_solved"
@@ -0,0 +1,79 @@
+import pulp
+import pytest
+
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.session import Session
+from roastmaster.sweep import SweepPoint
+from roastmaster.sweep import get_grid
+from roastmaster.sweep import sweep
+
+
+dishes = [
+    Dish(name="potatoes", size=1, cooking_time_mins=20, serve_hot_weight=2),
+    Dish(name="carrots", size=0.5, cooking_time_mins=10, serve_hot_weight=1),
+    Dish(name="carrots_2", size=0.5, cooking_time_mins=10, serve_hot_weight=1),
+]
+
+system = System(
+    total_time=60,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=1.5, oven_opening_penalty=1, warm_up_time=5),
+)
+
+points = get_grid((0, 1, 5), ({}, {"carrots": 4}))
+
+
+def solve_point(point: SweepPoint) -> float:
+    oven = system.oven.model_copy(
+        update={"oven_opening_penalty": point.oven_opening_penalty}
+    )
+    menu = [
+        dish.model_copy(
+            update={
+                "serve_hot_weight": point.serve_hot_weights.get(
+                    dish.name, dish.serve_hot_weight
+                )
+            }
+        )
+        for dish in dishes
+    ]
+    session = Session(system.model_copy(update={"oven": oven}), menu)
+    session.solve(solver=pulp.PULP_CBC_CMD(msg=False))
+    return session.get_objective_value()
+
+
+def test_get_grid():
+    assert len(points) == 6
+    assert points[1] == SweepPoint(0, {"carrots": 4})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_matches_fresh_sessions(workers: int):
+    table = sweep(system, dishes, points, workers=workers)
+    assert table["point"].tolist() == list(range(len(points)))
+    assert (table["status"] == "optimal").all()
+    assert table["serve_hot_weight[carrots]"].tolist() == [1, 4] * 3
+    for point, objective in zip(points, table["objective"], strict=True):
+        assert objective == pytest.approx(solve_point(point))
+    # higher penalties never mean more oven openings
+    openings = table[table["serve_hot_weight[carrots]"] == 1]["oven_openings"]
+    assert openings.is_monotonic_decreasing
+
+
+def test_sweep_rejects_matrix():
+    with pytest.raises(ValueError):
+        sweep(system, dishes, points, builder="matrix")
+
+
+def test_set_objective_parameters():
+    session = Session(system, dishes)
+    session.solve()
+    session.set_objective_parameters(serve_hot_weights={"carrots": 4})
+    assert session.is_optimal
+    assert session.get_objective_value() == pytest.approx(
+        solve_point(SweepPoint(1, {"carrots": 4}))
+    )
+    with pytest.raises(KeyError):
+        session.set_objective_parameters(serve_hot_weights={"nonsense": 1})
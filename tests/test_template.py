@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from roastmaster.matrix import MatrixModel
+from roastmaster.models import Dish
+from roastmaster.models import Oven
+from roastmaster.models import System
+from roastmaster.session import Session
+from roastmaster.template import ModelTemplate
+
+
+system = System(
+    total_time=60,
+    time_increment=5,
+    oven=Oven(name="oven", num_shelves=2, oven_opening_penalty=1, warm_up_time=5),
+)
+
+dishes = [
+    Dish(name="potatoes", size=0.7, cooking_time_mins=25, serve_hot_weight=2),
+    Dish(name="carrots", size=0.4, cooking_time_mins=15),
+    Dish(name="carrots_2", size=0.4, cooking_time_mins=15),
+]
+
+
+def assert_same_constraints(actual: MatrixModel, expected: MatrixModel):
+    assert (actual.a != expected.a).nnz == 0
+    np.testing.assert_array_equal(actual.lb, expected.lb)
+    np.testing.assert_array_equal(actual.ub, expected.ub)
+
+
+@pytest.mark.parametrize("symmetry_breaking", [False, True])
+def test_fill_matches_build(symmetry_breaking: bool):
+    template = ModelTemplate.compile(system, len(dishes))
+    # any number of shelves and oven opening penalty fit the same template
+    oven = system.oven.model_copy(update={"num_shelves": 3, "oven_opening_penalty": 2})
+    other = system.model_copy(update={"oven": oven})
+    for problem in (system, other):
+        assert_same_constraints(
+            MatrixModel(
+                problem,
+                dishes,
+                symmetry_breaking=symmetry_breaking,
+                template=template,
+            ),
+            MatrixModel(problem, dishes, symmetry_breaking=symmetry_breaking),
+        )
+
+
+def test_save_and_load(tmp_path: Path):
+    template = ModelTemplate.compile(system, len(dishes))
+    template.save(tmp_path / "template")
+    assert {path.name for path in tmp_path.iterdir()} == {
+        "template.mps",
+        "template.json",
+    }
+    loaded = ModelTemplate.load(tmp_path / "template.json")
+    assert loaded.shape == template.shape
+    assert_same_constraints(
+        MatrixModel(system, dishes, template=loaded), MatrixModel(system, dishes)
+    )
+
+
+def test_shape_mismatch():
+    template = ModelTemplate.compile(system, len(dishes))
+    with pytest.raises(ValueError):
+        MatrixModel(system, dishes[:2], template=template)
+    longer = system.model_copy(update={"total_time": 90})
+    with pytest.raises(ValueError):
+        MatrixModel(longer, dishes, template=template)
+
+
+def test_session_with_template():
+    template = ModelTemplate.compile(system, len(dishes))
+    expected = Session(system, dishes, builder="matrix")
+    expected.solve()
+    session = Session(system, dishes, builder="matrix", template=template)
+    session.solve()
+    assert session.get_objective_value() == pytest.approx(
+        expected.get_objective_value()
+    )